@@ -1,4 +1,7 @@
+from wordapp.startup_profile import page_profile
+_profile = page_profile("home")  # cold-start import/render time
 import streamlit as st
+_profile.imported()
 
 st.markdown("### Welcome to Ms.Choi's English Classroom")
 st.caption("Since Aug 15, 2025")
@@ -15,3 +18,4 @@ with col1:
 with col3:
     st.image(qr_image_url, width=50, caption="QR")  # Expand button appears
 
+_profile.rendered()
@@ -0,0 +1,255 @@
+"""Classroom load test for the Streamlit pages.
+
+Drives HOME.py and the pages headlessly with Streamlit's AppTest, using the
+local CSV and a stub TTS backend (no network), and reports rerun latency
+percentiles, CPU time per rerun and per-session memory.
+
+    python bench/classroom.py                      # one class (29 sessions)
+    python bench/classroom.py --classes 13         # a full school day
+    python bench/classroom.py --record trace.json  # save the generated clicks
+    python bench/classroom.py --replay trace.json  # replay recorded clicks
+
+A trace is a JSON list of sessions; each session is
+{"page": ..., "seed": ..., "steps": [...]} (the seed fixes which questions the
+page draws) and each step is one of:
+    {"op": "run"}                                   first load
+    {"op": "click", "key": "start_q1"}              button
+    {"op": "radio", "key": "mcq_choice_q1", "value": "agree"}
+    {"op": "text", "key": "spelling_input", "value": "agree"}
+    {"op": "select", "key": "set_select", "value": "set2"}
+    {"op": "check", "key": "set0_word_1"}           checkbox
+    {"op": "submit"}                                form submit button
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("WORDAPP_CSV_URL", "")  # local CSV only
+# Keep benchmark progress and research events out of the real state/ dir
+_STATE_DIR = tempfile.mkdtemp(prefix="wordapp-bench-state-")
+os.environ.setdefault("WORDAPP_PROGRESS_DB", os.path.join(_STATE_DIR, "progress.sqlite3"))
+os.environ.setdefault("WORDAPP_EVENT_DIR", os.path.join(_STATE_DIR, "events"))
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from wordapp import audio_store  # noqa: E402
+from wordapp.decks import get_deck  # noqa: E402
+from wordapp.tts_backends import StubBackend  # noqa: E402
+from wordapp.vocab_index import get_index  # noqa: E402
+
+PAGES = {
+    "home": "HOME.py",
+    "class_apps": "pages/00🔎_Class_apps.py",
+    "wordlist": "pages/01📚_Wordlist.py",
+    "learning": "pages/03🐥_Word_Learning_APP.py",
+    "practice": "pages/04🐥_Word_Practice_App.py",
+}
+SESSIONS_PER_CLASS = 29
+DECK_MODES = {"q1": "context", "q2": "spelling", "q3": "meaning"}
+
+
+# -------------------------------------------------
+# Click scripts
+# -------------------------------------------------
+def practice_script(rng: random.Random, questions: int = 5) -> List[dict]:
+    """Set choice, then a few questions in each of the three modes.
+
+    Answers are resolved at run time ("correct"/"wrong"), so the script does
+    not depend on which word the page draws.
+    """
+    index = get_index()
+    steps = [{"op": "run"}, {"op": "select", "key": "set_select", "value": rng.choice(index.set_names)}]
+    for mode in ("q3", "q1"):
+        for _ in range(questions):
+            steps.append({"op": "click", "key": f"start_{mode}"})
+            steps.append({"op": "radio", "key": f"mcq_choice_{mode}", "value": "correct" if rng.random() < 0.7 else "wrong"})
+            steps.append({"op": "click", "key": f"check_{mode}"})
+    for _ in range(questions):
+        steps.append({"op": "click", "key": "start_q2"})
+        steps.append({"op": "text", "key": "spelling_input", "value": "correct" if rng.random() < 0.6 else "wrong"})
+        steps.append({"op": "click", "key": "check_q2"})
+    return steps
+
+
+def learning_script(rng: random.Random) -> List[dict]:
+    index = get_index()
+    n = len(index.set_ids[index.set_names[0]])
+    picks = sorted(rng.sample(range(n), k=rng.randint(3, min(10, n))))
+    return [{"op": "run"}] + [{"op": "check", "key": f"set0_word_{i}"} for i in picks] + [{"op": "submit"}]
+
+
+def class_sessions(rng: random.Random) -> List[dict]:
+    """One class: everyone opens HOME, most practice, some use the Learning page."""
+    sessions = []
+    for _ in range(SESSIONS_PER_CLASS):
+        sessions.append({"page": "home", "steps": [{"op": "run"}]})
+        if rng.random() < 0.3:
+            sessions.append({"page": "learning", "steps": learning_script(rng)})
+        sessions.append({"page": "practice", "steps": practice_script(rng)})
+    sessions.append({"page": "wordlist", "steps": [{"op": "run"}]})
+    sessions.append({"page": "class_apps", "steps": [{"op": "run"}]})
+    return sessions
+
+
+# -------------------------------------------------
+# Runner
+# -------------------------------------------------
+def _resolve(at: AppTest, step: dict):
+    """Turn "correct"/"wrong" into a concrete answer (None: no open question)."""
+    value = step["value"]
+    if value not in ("correct", "wrong"):
+        return value
+    index = get_index()
+    mode = step["key"][-2:] if step["op"] == "radio" else "q2"
+    current = at.session_state.get(f"current_{mode}")
+    if current is None:
+        return None
+    set_name = at.session_state["selected_set"]
+    word = index[get_deck(set_name, DECK_MODES[mode], at.session_state[f"seed_{mode}"])[current].word_id].word
+    if step["op"] == "text":
+        return word if value == "correct" else word[::-1]
+    options = at.radio(key=step["key"]).options
+    if value == "correct":
+        return word
+    wrong = [o for o in options if o != word]
+    return wrong[0] if wrong else word
+
+
+def _has(at: AppTest, kind: str, key: str) -> bool:
+    try:
+        getattr(at, kind)(key=key)
+        return True
+    except KeyError:
+        return False
+
+
+def deep_size(obj, seen: set) -> int:
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_size(k, seen) + deep_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_size(x, seen) for x in obj)
+    return size
+
+
+def session_bytes(at: AppTest) -> int:
+    """Deep size of session state, not counting objects shared with the index."""
+    shared = {id(x) for e in get_index().entries for x in e}
+    shared |= {id(True), id(False), id(None), id("")} | {id(i) for i in range(-5, 257)}
+    state = at.session_state.to_dict()
+    return deep_size(state, shared) - sys.getsizeof(state)
+
+
+def run_session(session: dict, samples: Dict[str, list], record: List[dict], seed: int) -> int:
+    random.seed(seed)  # the pages draw questions from the global RNG
+    at = AppTest.from_file(os.path.join(ROOT, PAGES[session["page"]]), default_timeout=60)
+    resolved = []
+    for step in session["steps"]:
+        op = step["op"]
+        if op == "run":
+            target = at
+        elif op == "click":
+            if not _has(at, "button", step["key"]):
+                continue
+            target = at.button(key=step["key"]).click()
+        elif op == "radio":
+            if not _has(at, "radio", step["key"]):
+                continue
+            step = dict(step, value=_resolve(at, step))
+            if step["value"] is None:
+                continue
+            target = at.radio(key=step["key"]).set_value(step["value"])
+        elif op == "text":
+            if not _has(at, "text_input", step["key"]):
+                continue
+            step = dict(step, value=_resolve(at, step))
+            if step["value"] is None:
+                continue
+            target = at.text_input(key=step["key"]).input(step["value"])
+        elif op == "select":
+            target = at.selectbox(key=step["key"]).select(step["value"])
+        elif op == "check":
+            target = at.checkbox(key=step["key"]).check()
+        elif op == "submit":
+            target = at.button[0].click()
+        else:
+            raise ValueError(f"Unknown step op: {op}")
+
+        wall, cpu = time.perf_counter(), time.process_time()
+        target.run()
+        wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+        if at.exception:
+            raise RuntimeError(f"{session['page']} {step}: {at.exception[0].value}")
+        samples[f"{session['page']}:{op}"].append((wall, cpu))
+        resolved.append(step)
+    record.append({"page": session["page"], "seed": seed, "steps": resolved})
+    return session_bytes(at)
+
+
+def pct(values: List[float], p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))]
+
+
+def report(samples: Dict[str, list], memory: Dict[str, list], elapsed: float) -> None:
+    print(f"\n{'step':24s} {'n':>6s} {'p50 ms':>8s} {'p95 ms':>8s} {'p99 ms':>8s} {'cpu ms':>8s}")
+    all_wall = []
+    for name in sorted(samples):
+        wall = [w * 1000 for w, _ in samples[name]]
+        cpu = [c * 1000 for _, c in samples[name]]
+        all_wall += wall
+        print(f"{name:24s} {len(wall):6d} {pct(wall, 50):8.1f} {pct(wall, 95):8.1f} {pct(wall, 99):8.1f} "
+              f"{statistics.mean(cpu):8.1f}")
+    print(f"{'ALL':24s} {len(all_wall):6d} {pct(all_wall, 50):8.1f} {pct(all_wall, 95):8.1f} {pct(all_wall, 99):8.1f}")
+    print(f"\n{'page':24s} {'sessions':>8s} {'mean B':>8s} {'max B':>8s}   (session state per session)")
+    for page in sorted(memory):
+        print(f"{page:24s} {len(memory[page]):8d} {statistics.mean(memory[page]):8.0f} {max(memory[page]):8d}")
+    print(f"\n{len(all_wall)} reruns in {elapsed:.1f}s")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Classroom load test for the WordApp pages.")
+    parser.add_argument("--classes", type=int, default=1, help="classes to simulate (13 = full day)")
+    parser.add_argument("--seed", type=int, default=2025)
+    parser.add_argument("--record", help="write the resolved click trace to this JSON file")
+    parser.add_argument("--replay", help="replay sessions from a recorded JSON trace")
+    args = parser.parse_args(argv)
+
+    audio_store._store = audio_store.AudioStore(tempfile.mkdtemp(prefix="wordapp-bench-"), synthesize=StubBackend().synthesize)
+    rng = random.Random(args.seed)
+    if args.replay:
+        with open(args.replay, encoding="utf-8") as f:
+            sessions = json.load(f)
+    else:
+        sessions = [s for _ in range(args.classes) for s in class_sessions(rng)]
+
+    samples: Dict[str, list] = defaultdict(list)
+    memory: Dict[str, list] = defaultdict(list)
+    record: List[dict] = []
+    start = time.perf_counter()
+    for i, session in enumerate(sessions):
+        seed = session.get("seed", args.seed + i)
+        memory[session["page"]].append(run_session(session, samples, record, seed))
+    report(samples, memory, time.perf_counter() - start)
+
+    if args.record:
+        with open(args.record, "w", encoding="utf-8") as f:
+            json.dump(record, f, ensure_ascii=False, indent=1)
+        print(f"Trace written to {args.record}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+"""Cold-start profile of every page.
+
+Runs each page once in a fresh Python process (so nothing is imported or
+cached yet) with Streamlit's AppTest and prints what the page's own
+profiler recorded (see wordapp/startup_profile.py): import time, time to
+the end of the first render, and which heavy libraries the page loaded.
+
+    python bench/startup.py
+    python bench/startup.py --repeat 3     # median of 3 cold starts
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "bench"))
+
+from classroom import PAGES  # noqa: E402
+
+PAGES = dict(PAGES, dashboard="pages/05📊_Class_Dashboard.py", qna="pages/06🐧_Q&As.py", vocab_test="pages/07📝_Vocab_Test.py",
+             metrics="pages/08📈_Metrics.py")
+
+CHILD = """
+import json, os, sys, time
+t = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+streamlit_ms = (time.perf_counter() - t) * 1000
+from wordapp import audio_store, startup_profile
+from wordapp.tts_backends import StubBackend
+audio_store._store = audio_store.AudioStore(sys.argv[2], synthesize=StubBackend().synthesize)
+at = AppTest.from_file(sys.argv[1], default_timeout=120).run()
+recs = startup_profile.records()
+print(json.dumps({"streamlit_ms": streamlit_ms, "record": recs[0] if recs else None,
+                  "error": str(at.exception[0].value) if at.exception else None}))
+"""
+
+
+def cold_start(page: str) -> dict:
+    with tempfile.TemporaryDirectory(prefix="wordapp-startup-") as tmp:
+        env = dict(
+            os.environ,
+            PYTHONPATH=ROOT,
+            WORDAPP_CSV_URL="",
+            WORDAPP_STARTUP_PROFILE=os.path.join(tmp, "startup.jsonl"),
+            WORDAPP_PROGRESS_DB=os.path.join(tmp, "progress.sqlite3"),
+            WORDAPP_EVENT_DIR=os.path.join(tmp, "events"),
+        )
+        out = subprocess.run(
+            [sys.executable, "-c", CHILD, os.path.join(ROOT, page), os.path.join(tmp, "audio")],
+            capture_output=True, text=True, env=env, cwd=ROOT, check=True,
+        ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Cold-start import/render time per page.")
+    parser.add_argument("--repeat", type=int, default=1, help="cold starts per page (median is shown)")
+    args = parser.parse_args(argv)
+
+    print(f"{'page':12s} {'import ms':>10s} {'render ms':>10s}   heavy modules loaded")
+    for name, page in PAGES.items():
+        runs = [cold_start(page) for _ in range(args.repeat)]
+        failed = [r["error"] for r in runs if r["error"] or not r["record"]]
+        if failed:
+            print(f"{name:12s} failed: {failed[0]}")
+            continue
+        imp = statistics.median(r["record"]["import_ms"] for r in runs)
+        ren = statistics.median(r["record"]["render_ms"] for r in runs)
+        print(f"{name:12s} {imp:10.0f} {ren:10.0f}   {', '.join(runs[-1]['record']['loaded']) or '-'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
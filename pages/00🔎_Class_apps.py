@@ -1,20 +1,15 @@
+from wordapp.startup_profile import page_profile
+_profile = page_profile("class_apps")  # cold-start import/render time
 import streamlit as st
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import qrcode
-from PIL import Image
-from wordcloud import WordCloud
 import streamlit.components.v1 as components  # For embedding YouTube videos
-from gtts import gTTS
-import io
+from wordapp.audio_store import split_sentences, stitch_mp3, tts_many
+# qrcode/PIL (QR) and wordcloud (Word Cloud) are imported when their button
+# is pressed, so a student who only opens the Timer tab loads neither. What
+# a button drew only lasts for that run, so the downloads under it use
+# on_click="ignore" (no rerun) to stay on the page
+_profile.imported()
 
 
-# Function to create word cloud
-def create_wordcloud(text):
-    wordcloud = WordCloud(width=800, height=400, background_color='white').generate(text)
-    return wordcloud
-
 # Streamlit tabs
 tabs = st.tabs(["📈 QR", "⏳ Timer", "🔊 Text-to-Speech", "⛅ Word Cloud"])
 
@@ -33,25 +28,46 @@ with tabs[0]:
         st.write("")  # Add spacing for alignment
         generate_qr_button = st.button("🔆 Click to Generate QR", key="generate_qr")
 
-    if generate_qr_button and qr_link:
-        # ✅ Generate the QR code
-        qr = qrcode.QRCode(
-            version=1,
-            error_correction=qrcode.constants.ERROR_CORRECT_L,
-            box_size=10,
-            border=4,
-        )
-        qr.add_data(qr_link)
-        qr.make(fit=True)
+    ec_level = st.selectbox(
+        "Error correction (higher = still scans when printed small or damaged):",
+        ["L", "M", "Q", "H"],
+        key="qr_ec",
+    )
 
-        qr_img = qr.make_image(fill='black', back_color='white')
+    if generate_qr_button and qr_link:
+        from wordapp.qr import qr_png, qr_svg
 
-        # ✅ Convert the QR code image to RGB format and resize
-        qr_img = qr_img.convert('RGB')
-        qr_img = qr_img.resize((600, 600))
+        # ✅ Drawn once at 600px with whole-pixel modules (sharp edges), cached per link
+        png = qr_png(qr_link, 600, ec_level)
 
         # ✅ Display the QR code with caption
-        st.image(qr_img, caption=caption if caption else "Generate", use_container_width=False, width=400)
+        st.image(png, caption=caption if caption else "Generate", width=400)
+        d1, d2 = st.columns(2)
+        d1.download_button("⬇️ PNG", png, file_name="qr.png", mime="image/png", on_click="ignore")
+        d2.download_button("⬇️ SVG", qr_svg(qr_link, 600, ec_level), file_name="qr.svg", mime="image/svg+xml",
+                           on_click="ignore")
+
+    # ✅ Many links at once (e.g. one per class) -> one printable A4 PDF
+    with st.expander("🖨️ QR sheet for many links"):
+        links_text = st.text_area(
+            "One link per line, optionally with a label first: `2-1, https://...`",
+            key="qr_batch",
+            height=200,
+        )
+        # Up to wordapp.qr.MAX_SHEET_COLS (not imported before the button), so codes stay scannable
+        cols = st.slider("Codes per row", 2, 4, 3, key="qr_batch_cols")
+        if st.button("🖨️ Make printable sheet", key="qr_batch_button"):
+            from wordapp.qr import pages_pdf, parse_links, qr_sheet_pages
+
+            items = parse_links(links_text)
+            if not items:
+                st.warning("Please enter at least one link.")
+            else:
+                pages = qr_sheet_pages(items, cols, ec_level)
+                st.image(pages[0], caption=f"{len(items)} codes, {len(pages)} page(s)", width=400)
+                st.download_button(
+                    "⬇️ PDF", pages_pdf(pages), file_name="qr_sheet.pdf", mime="application/pdf", on_click="ignore",
+                )
 
 
 # Timer tab
@@ -86,19 +102,36 @@ with tabs[2]:
         }
         language_code, tld = lang_codes[language]
 
-        # Assuming you have a version of gTTS that supports tld or you have modified it:
-        # This check ensures that the tld parameter is only used when not None.
-        if tld:
-            tts = gTTS(text=text_input, lang=language_code, tld=tld, slow=False)
+        # Sentence-sized chunks synthesized concurrently; each chunk is its own
+        # cached clip, so editing one sentence only re-synthesizes that sentence
+        chunks = split_sentences(text_input)
+        first_slot = st.empty()
+        progress = st.progress(0.0, text=f"0/{len(chunks)} sentences")
+        parts = [None] * len(chunks)
+        failed = []
+        for done, (i, result) in enumerate(tts_many(chunks, lang=language_code, tld=tld or "com"), start=1):
+            if isinstance(result, Exception):
+                failed.append(i)
+            else:
+                parts[i] = result
+                if i == 0 and len(chunks) > 1:
+                    # Playable while the rest of the passage is still being synthesized;
+                    # it stays on the page, so playback is not cut off when the passage is ready
+                    with first_slot.container():
+                        st.caption("▶️ First sentence")
+                        st.audio(result, format='audio/mp3')
+            progress.progress(done / len(chunks), text=f"{done}/{len(chunks)} sentences")
+        progress.empty()
+
+        if failed:
+            st.error(f"Could not convert sentence(s) {', '.join(str(i + 1) for i in sorted(failed))}. Please try again.")
         else:
-            tts = gTTS(text=text_input, lang=language_code, slow=False)
-        
-        speech = io.BytesIO()
-        tts.write_to_fp(speech)
-        speech.seek(0)
-
-        # Display the audio file
-        st.audio(speech.getvalue(), format='audio/mp3')
+            # Display the whole passage as one MP3
+            speech = stitch_mp3(parts)
+            if len(chunks) > 1:
+                st.caption("▶️ Whole passage")
+            st.audio(speech, format='audio/mp3')
+            st.download_button("⬇️ Download MP3", speech, file_name="speech.mp3", mime="audio/mpeg", on_click="ignore")
     st.markdown("---")
     st.caption("🇺🇸 English text: Teacher-designed coding applications create tailored learning experiences, making complex concepts easier to understand through interactive and adaptive tools. They enhance engagement, provide immediate feedback, and support active learning.")
     st.caption("🇰🇷 Korean text: 교사가 직접 만든 코딩 기반 애플리케이션은 학습자의 필요에 맞춘 학습 경험을 제공하고, 복잡한 개념을 쉽게 이해하도록 돕습니다. 또한 학습 몰입도를 높이고 즉각적인 피드백을 제공하며, 능동적인 학습을 지원합니다.")
@@ -114,16 +147,24 @@ with tabs[3]:
 
     # Input text for generating the word cloud
     user_input = st.text_area("Enter text to generate a word cloud:")
+    cloud_mode = st.radio(
+        "Mode:",
+        ["text", "vocab"],
+        format_func=lambda m: {"text": "All words", "vocab": "Highlight our vocabulary words"}[m],
+        horizontal=True,
+        key="cloud_mode",
+    )
 
     # Button to generate the word cloud
     if st.button("Generate Word Cloud"):
         if user_input.strip():
-            # Generate word cloud only when there is valid input
-            wordcloud = create_wordcloud(user_input)
-            fig, ax = plt.subplots()
-            ax.imshow(wordcloud, interpolation='bilinear')
-            ax.axis("off")
-            st.pyplot(fig)
-            plt.close(fig)  # Close the figure to prevent memory issues
+            from wordapp.word_cloud import wordcloud_png
+
+            # Rendered once per passage and mode (cached PNG, shared by all classes)
+            png = wordcloud_png(user_input, mode=cloud_mode)
+            st.image(png)
+            st.download_button("⬇️ Download PNG", png, file_name="wordcloud.png", mime="image/png", on_click="ignore")
         else:
             st.warning("Please enter some text to generate a word cloud.")
+
+_profile.rendered()
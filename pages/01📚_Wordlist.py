@@ -1,13 +1,20 @@
+from wordapp.startup_profile import page_profile
+_profile = page_profile("wordlist")  # cold-start import/render time
 import streamlit as st
-import pandas as pd
+
+from wordapp.banks import pick_bank
+from wordapp.data import load_vocab
+from wordapp.search import get_search_index
+from wordapp.worksheets import KINDS, hangul_font_available, pack_bytes, worksheet_bytes
+_profile.imported()
 
 # Set up page
 st.set_page_config(page_title="Test App")
 st.markdown("### 🍰 맛있는 단어장")
 
-# Load the CSV from GitHub
-CSV_URL = "https://raw.githubusercontent.com/jihyeon0531/WordApp/refs/heads/main/data/2025_Ch6_8_0819.csv"
-df = pd.read_csv(CSV_URL)
+# Load the shared word list of the chosen bank (local copy, revalidated against GitHub)
+bank = pick_bank()
+df = load_vocab(bank)
 
 
 # Create tabs
@@ -26,9 +33,70 @@ with tab1:
 # Tab 2: Word List
 with tab2:
     st.markdown("### 📋 Word list (전체 단어 목록)")
-    # Display without index
-    st.dataframe(df, hide_index=True)
 
-    PDF_URL = "https://github.com/jihyeon0531/WordApp/raw/main/data/wordlist-0821.pdf"
-    st.markdown(f"[💾 Download]({PDF_URL}) Word list PDF file: 6 pages", unsafe_allow_html=True)
+    # Search by English word, Korean meaning (초성 OK: ㅁㅈ -> 만족), or sentence text
+    query = st.text_input(
+        "🔍 검색 (단어, 뜻, 초성, 예문)",
+        key="wordlist_query",
+        placeholder="예: good, 만족, ㅁㅈ, plastic",
+        on_change=lambda: st.session_state.pop("wordlist_page", None),  # back to page 1
+    )
+    if query.strip():
+        search = get_search_index(bank)
+        per_page = 10
+        # One search gives the page and the total; the page number widget is
+        # drawn after it from its value in session state
+        page = st.session_state.get("wordlist_page", 1)
+        hits, total = search.search(query, page=page - 1, per_page=per_page)
+        if total and not hits:  # stale page number (the word list reloaded)
+            st.session_state.pop("wordlist_page", None)
+            page = 1
+            hits, total = search.search(query, page=0, per_page=per_page)
+        if total == 0:
+            st.info("검색 결과가 없습니다.")
+        else:
+            pages = (total + per_page - 1) // per_page
+            if pages > 1:
+                st.number_input(f"페이지 (총 {pages})", min_value=1, max_value=pages, value=1, key="wordlist_page")
+            st.caption(f"{total}개 결과")
+            rows = [search.index[h.word_id] for h in hits]
+            st.dataframe(
+                {
+                    "Set": [e.set_name for e in rows],
+                    "Word": [e.word for e in rows],
+                    "Meaning": [e.meaning for e in rows],
+                    "Sentence": [e.sentence for e in rows],
+                    "Translation": [e.translation for e in rows],
+                },
+                hide_index=True,
+            )
+    else:
+        # Display without index
+        st.dataframe(df, hide_index=True)
+
+    # Printable PDFs made from the current word list; each is rendered once
+    # and later downloads are read from .cache/pdf
+    with st.expander("🖨️ PDF 만들기 (단어장 · 빈칸 학습지 · 정답지)"):
+        set_names = list(get_search_index(bank).index.set_names)
+        col1, col2 = st.columns(2)
+        pdf_set = col1.selectbox("세트", ["전체"] + set_names, key="pdf_set")
+        pdf_kinds = col2.multiselect("종류", list(KINDS), default=["wordlist"], format_func=KINDS.get, key="pdf_kinds")
+        pdf_seed = st.number_input("문항 순서 번호 (같은 번호 = 같은 순서, 학습지와 정답지가 일치)", min_value=1,
+                                   max_value=999, value=1, key="pdf_seed")
+        pdf_hints = st.checkbox("빈칸 학습지에 해석 넣기", key="pdf_hints")
+        if not hangul_font_available():
+            st.error("PDF에 한글을 쓸 글꼴이 없습니다. 서버에 fonts-nanum을 설치하거나 WORDAPP_CLOUD_FONT를 설정하세요. "
+                     "(No Hangul font: install fonts-nanum or set WORDAPP_CLOUD_FONT.)")
+        elif pdf_kinds:
+            if pdf_set != "전체" and len(pdf_kinds) == 1:
+                kind = pdf_kinds[0]
+                data = lambda: worksheet_bytes(kind, pdf_set, pdf_seed, pdf_hints, bank)  # noqa: E731
+                file_name, mime = f"{pdf_set}-{kind}.pdf", "application/pdf"
+            else:
+                sets = None if pdf_set == "전체" else [pdf_set]
+                data = lambda: pack_bytes(pdf_kinds, sets, pdf_seed, pdf_hints, bank)  # noqa: E731
+                file_name, mime = f"wordlist-{pdf_set if sets else 'all'}.zip", "application/zip"
+            # Rendered when the button is clicked, off the page script
+            st.download_button("💾 Download", data=data, file_name=file_name, mime=mime, key="pdf_download")
 
+_profile.rendered()
@@ -1,15 +1,12 @@
-import math
-import os
-import random
-import re
-import tempfile
-
-import pandas as pd
+from wordapp.startup_profile import page_profile
+_profile = page_profile("learning")  # cold-start import/render time
 import streamlit as st
-from gtts import gTTS
-from datetime import datetime
-import os
-import io
+from wordapp.audio_store import audio_html, audio_url_many
+from wordapp.banks import bank_set_key, pick_bank
+from wordapp.events import log_event
+from wordapp.identity import student_token
+from wordapp.vocab_index import get_index
+_profile.imported()
 
 
 # ----- Page setup (force sidebar visible) -----
@@ -20,34 +17,18 @@ st.set_page_config(
 )
 st.markdown("### 🐥 단어 학습 어플리케이션 (Word learning App)")
 # ---------------- Data ----------------
-CSV_URL = "https://raw.githubusercontent.com/jihyeon0531/WordApp/refs/heads/main/data/2025_Ch6_8_0819.csv"
-df = pd.read_csv(CSV_URL)
-
-# Safety: ensure required columns exist (now includes 'Set')
-required_cols = {"Word", "Meaning", "Sentence", "Translation", "Set"}
-missing = required_cols - set(df.columns)
-if missing:
-    st.error(f"CSV is missing columns: {', '.join(missing)}")
+# Shared, precompiled index (sets in order set1..set6, highlighted HTML per word)
+bank = pick_bank()
+try:
+    index = get_index(bank)
+except ValueError as e:
+    st.error(str(e))
     st.stop()
 
-# --- Build sets by 'Set' column (e.g., set1 ~ set6) ---
-# Normalize/ensure order: sort by the numeric part if present
-def _set_sort_key(val):
-    m = re.search(r"\d+", str(val))
-    return int(m.group()) if m else float("inf")
-
-# Keep only relevant columns (optional, for cleanliness)
-df = df[["Set", "Word", "Meaning", "Sentence", "Translation"]].copy()
-
-# Group by Set and order groups set1..set6
-grouped = sorted(df.groupby("Set"), key=lambda kv: _set_sort_key(kv[0]))
-sets = [g.reset_index(drop=True) for _, g in grouped]  # list of DataFrames in order
-
+set_names = index.set_names
+student = student_token()  # sidebar code, only used for the research log
 # Labels for the dropdown (show all 10 words in each option)
-set_labels = []
-for set_name, g in grouped:
-    words = ", ".join(g["Word"].astype(str).tolist())
-    set_labels.append(f"{set_name}: {words}")
+set_labels = list(index.set_labels)
 
 # ---------------- Session state ----------------
 if "selected_words" not in st.session_state:
@@ -57,72 +38,13 @@ if "submitted" not in st.session_state:
 if "selected_set_idx" not in st.session_state:
     st.session_state.selected_set_idx = 0  # default to first set
 
-# Quiz state
-if "quiz_qid" not in st.session_state:
-    st.session_state.quiz_qid = 0
-if "quiz" not in st.session_state:
-    st.session_state.quiz = None
-if "answer_shown" not in st.session_state:
-    st.session_state.answer_shown = False
-
-# ---------------- be verb handling ------------------------------
-import re
-
-def make_highlight_pattern(phrase: str) -> re.Pattern:
-    """
-    Build a regex that matches the phrase in the sentence,
-    handling common inflections if it starts with 'be '.
-    """
-    ph = phrase.strip()
-    # Special-case leading 'be ' → any be-form
-    if ph.lower().startswith("be "):
-        rest = re.escape(ph[3:].strip())            # 'good at' -> 'good\ at'
-        be_forms = r"(?:am|is|are|was|were|be|being|been)"
-        pattern = rf"\b{be_forms}\s+{rest}\b"
-    else:
-        # Default: exact phrase match with word boundaries
-        pattern = rf"\b{re.escape(ph)}\b"
-    return re.compile(pattern, flags=re.IGNORECASE)
-
-def highlight_phrase(sentence: str, phrase: str, color="orange") -> str:
-    pat = make_highlight_pattern(phrase)
-    return pat.sub(lambda m: f"<span style='color:{color}; font-weight:bold'>{m.group(0)}</span>",
-                   sentence)
-
-# ---------------- Helper: make a new quiz question ----------------
-def make_quiz_question():
-    chunk = sets[st.session_state.selected_set_idx]
-    # Pick a random row from this set
-    row = chunk.sample(1, random_state=random.randrange(0, 10_000)).iloc[0]
-    ans_word = str(row["Word"])
-    sentence = str(row["Sentence"])
-    translation = str(row["Translation"])
-
-    # Cloze the answer word once (underline blank)
-    pattern = r"\b" + re.escape(ans_word) + r"\b"
-    cloze_sentence = re.sub(
-        pattern, "<u>&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;</u>", sentence, count=1, flags=re.IGNORECASE
-    )
-
-    # Build options: 1 correct + 3 distractors from the same set, then "None of the above"
-    words_pool = [str(w) for w in chunk["Word"].tolist()]
-    distractors = [w for w in words_pool if w.lower() != ans_word.lower()]
-    random.shuffle(distractors)
-    distractors = distractors[:3] if len(distractors) >= 3 else distractors
-
-    options = distractors + [ans_word]
-    random.shuffle(options)
-    options.append("None of the above")  # always last
-
-    st.session_state.quiz = {
-        "word": ans_word,
-        "sentence": sentence,
-        "sentence_cloze": cloze_sentence,
-        "translation": translation,
-        "options": options,
-    }
-    st.session_state.quiz_qid += 1
-    st.session_state.answer_shown = False
+# Another word bank was picked: start over on its first set
+if st.session_state.setdefault("bank", bank) != bank:
+    st.session_state.bank = bank
+    st.session_state.selected_set_idx = 0
+    st.session_state.selected_words = []
+    st.session_state.submitted = False
+    st.session_state.pop("word_set_select", None)
 
 # ---------------- Tabs ----------------
 tab1, tab2 = st.tabs(["1️⃣ Select Words", "2️⃣ Learning"])
@@ -150,26 +72,30 @@ with tab1:
         st.session_state.selected_set_idx = new_index
         st.session_state.selected_words = []
         st.session_state.submitted = False
-        st.session_state.quiz = None  # reset quiz when set changes
 
-    # The slice for this set
-    practice_df = sets[st.session_state.selected_set_idx]
+    # The entries for this set
+    practice_entries = index.set_entries(set_names[st.session_state.selected_set_idx])
 
     st.caption("아래에서 연습할 단어를 체크하세요. **Tab 2**에서 뜻/예문/음성을 제공합니다.")
 
     # Use a form to group the checkboxes & submit
     with st.form("word_select_form"):
         selected = []
-        for i, row in practice_df.iterrows():
+        for i, entry in enumerate(practice_entries):
             cb_key = f"set{st.session_state.selected_set_idx}_word_{i}"
-            checked = st.checkbox(f"{row['Word']} ({row['Meaning']})", key=cb_key)
+            checked = st.checkbox(f"{entry.word} ({entry.meaning})", key=cb_key)
             if checked:
-                selected.append(row["Word"])
+                selected.append(entry.word)
         submitted = st.form_submit_button("✨ 선택완료 버튼!")
 
     if submitted:
         st.session_state.selected_words = selected
         st.session_state.submitted = True
+        # Research log: each chosen word, and its sentence clip shown in Tab 2
+        set_name = set_names[st.session_state.selected_set_idx]
+        for word in selected:
+            log_event(student, "learning", "cards", bank_set_key(bank, set_name), word, "select")
+            log_event(student, "learning", "cards", bank_set_key(bank, set_name), word, "audio")
 
     # Feedback
     if st.session_state.submitted:
@@ -189,19 +115,16 @@ with tab2:
     else:
         st.write(f"연습할 단어는 {len(st.session_state.selected_words)} 개입니다:")
 
+        # Render every card first; audio slots are filled as clips arrive
+        sentences = []
+        audio_slots = []
         for idx, word in enumerate(st.session_state.selected_words, start=1):
-            # Find the row for this word within the selected set (fallback to full df)
-            current_chunk = sets[st.session_state.selected_set_idx]
-            row = current_chunk[current_chunk["Word"] == word]
-            if row.empty:
-                row = df[df["Word"] == word]
-            row = row.iloc[0]
-
-            sentence = str(row["Sentence"])
-            meaning = str(row["Meaning"])
-            translation = str(row["Translation"])
-
-            highlighted_sentence = highlight_phrase(sentence, word)
+            # Look up this word within the selected set (fallback to any set)
+            entry = index.lookup(word, set_names[st.session_state.selected_set_idx])
+            sentence = entry.sentence
+            meaning = entry.meaning
+            translation = entry.translation
+            highlighted_sentence = entry.highlighted_html
 
             st.markdown(f"### {idx}. {word}")
             st.markdown(
@@ -214,21 +137,21 @@ with tab2:
                 unsafe_allow_html=True,
             )
 
-            # Generate and play audio using gTTS
-            # ---- FIX FOR iPHONE: use audio bytes instead of temp file ----
-            # Generate and play audio using gTTS  (iPhone-friendly version)
-            try:
-                tts = gTTS(sentence)
-                buf = io.BytesIO()
-                tts.write_to_fp(buf)
-                buf.seek(0)
-                audio_bytes = buf.read()
-            
-                # Important for iOS: use audio/mpeg
-                st.audio(audio_bytes, format="audio/mpeg")
-            except Exception as e:
-                st.warning(f"Audio unavailable for this sentence. ({e})")
-            
-
+            slot = st.empty()
+            slot.caption("🔊 Loading audio...")
+            sentences.append(sentence)
+            audio_slots.append(slot)
 
             st.write("---")
+
+        # Synthesize all sentences concurrently (shared store, gTTS only on a miss)
+        # and point each player at the clip's content-hashed URL, so a rerun
+        # sends a short URL instead of re-uploading the bytes
+        for i, result in audio_url_many(sentences):
+            if isinstance(result, Exception):
+                audio_slots[i].warning(f"Audio unavailable for this sentence. ({result})")
+            else:
+                # Important for iOS: use audio/mpeg
+                audio_slots[i].markdown(audio_html(result), unsafe_allow_html=True)
+
+_profile.rendered()
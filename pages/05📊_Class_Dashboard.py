@@ -0,0 +1,116 @@
+from wordapp.startup_profile import page_profile
+_profile = page_profile("dashboard")  # cold-start import/render time
+import pandas as pd
+import streamlit as st
+
+from wordapp.events import AGG_FIELDS, get_event_log
+from wordapp.identity import teacher_unlocked
+from wordapp.spelling import ERROR_TYPES, PARTIAL_THRESHOLD, regrade_events
+_profile.imported()
+
+st.set_page_config(page_title="Class Dashboard", layout="wide")
+st.markdown("### 📊 학급별 학습 현황 (Class Dashboard)")
+st.caption("연습 앱과 학습 앱의 답안·재시도·음성·학습 시간 기록을 학급/단어/모드별로 모아 보여줍니다.")
+
+if not teacher_unlocked():
+    _profile.rendered()
+    st.stop()
+
+# -------------------------------------------------
+# Aggregates are kept up to date as events are written; a rerun only folds
+# segments that are new since the last one (see wordapp/events.py)
+# -------------------------------------------------
+log = get_event_log()
+if st.button("🔄 새로고침 (Refresh)", key="refresh_dashboard"):
+    log.flush()  # include events still in the buffer
+log.refresh()
+agg = log.aggregates()
+
+if agg.empty:
+    st.info("아직 기록된 활동이 없습니다.")
+    _profile.rendered()
+    st.stop()
+
+agg["class_name"] = agg["class_name"].replace("", "(코드 없음)")
+classes = sorted(agg["class_name"].unique())
+choice = st.selectbox("학급 선택", ["전체"] + classes, key="dashboard_class")
+if choice != "전체":
+    agg = agg[agg["class_name"] == choice]
+
+
+def summarize(df: pd.DataFrame, by: str) -> pd.DataFrame:
+    """Sum the counters by one column and add rates."""
+    out = df.groupby(by)[list(AGG_FIELDS)].sum()
+    answers = out["answers"].where(out["answers"] > 0)
+    out["accuracy"] = (out["correct"] / answers).round(3)
+    out["score"] = (out["credit"] / answers).round(3)  # with spelling partial credit
+    out["retry_rate"] = (out["retries"] / answers).round(3)
+    out["avg_sec"] = (out["ms"] / answers / 1000).round(1)
+    return out.drop(columns=["ms", "credit"]).sort_values("answers", ascending=False)
+
+
+totals = agg[list(AGG_FIELDS)].sum()
+m1, m2, m3, m4, m5 = st.columns(5)
+m1.metric("답안 수", int(totals["answers"]))
+m2.metric("정답률", f"{totals['correct'] / totals['answers']:.0%}" if totals["answers"] else "-")
+m3.metric("평균 점수 (부분 점수 포함)", f"{totals['credit'] / totals['answers']:.0%}" if totals["answers"] else "-")
+m4.metric("재시도", int(totals["retries"]))
+m5.metric("음성 제공", int(totals["audio"]))
+
+tab1, tab2, tab3 = st.tabs(["학급별", "단어별", "모드별"])
+with tab1:
+    st.dataframe(summarize(agg, "class_name"), width="stretch")
+with tab2:
+    st.dataframe(summarize(agg, "word"), width="stretch")
+with tab3:
+    st.dataframe(summarize(agg, "mode"), width="stretch")
+
+st.download_button(
+    "⬇️ 집계 CSV 다운로드",
+    agg.to_csv(index=False).encode("utf-8-sig"),
+    file_name="class_dashboard.csv",
+    mime="text/csv",
+)
+
+# -------------------------------------------------
+# Spelling re-grade: every logged Practice 3 answer graded again in one
+# vectorized pass (see wordapp/spelling.py), e.g. with a different threshold.
+# It scans the whole log, so it runs on the button only and the result is
+# kept for the session
+# -------------------------------------------------
+with st.expander("✏️ 스펠링 재채점 (Spelling re-grade)"):
+    threshold = st.slider("부분 점수 기준 (정규화 편집 거리)", 0.0, 0.5, PARTIAL_THRESHOLD, 0.05,
+                          key="regrade_threshold")
+    if st.button("재채점 실행", key="regrade_run"):
+        log.flush()
+        st.session_state.regrade = (threshold, regrade_events(log.read_all(), threshold))
+    regraded = st.session_state.get("regrade")
+    if regraded is not None and regraded[0] != threshold:
+        st.caption(f"기준 {regraded[0]:.2f}로 채점한 결과입니다. 새 기준을 적용하려면 ‘재채점 실행’을 누르세요.")
+    graded = None if regraded is None else regraded[1]
+    if graded is not None and choice != "전체":
+        graded = graded[graded["class_name"] == choice]
+    if graded is None:
+        st.caption("‘재채점 실행’을 누르면 기록된 모든 스펠링 답안을 다시 채점합니다.")
+    elif graded.empty:
+        st.info("재채점할 스펠링 답안이 없습니다.")
+    else:
+        graded["class_name"] = graded["class_name"].replace("", "(코드 없음)")
+        s1, s2, s3 = st.columns(3)
+        s1.metric("스펠링 답안", len(graded))
+        s2.metric("정답", int(graded["correct"].sum()))
+        s3.metric("평균 점수", f"{graded['credit'].mean():.0%}")
+        errors = pd.crosstab(graded["class_name"], graded["error"])
+        st.dataframe(errors.reindex(columns=[e for e in ERROR_TYPES if e in errors.columns]), width="stretch")
+        by_word = graded.groupby("word").agg(answers=("credit", "size"), credit=("credit", "mean"),
+                                             top_error=("error", lambda e: e.mode().iat[0]))
+        st.dataframe(by_word.sort_values("credit").round(3), width="stretch")
+        st.download_button(
+            "⬇️ 재채점 CSV 다운로드",
+            graded.to_csv(index=False).encode("utf-8-sig"),
+            file_name="spelling_regrade.csv",
+            mime="text/csv",
+            key="regrade_download",
+        )
+
+_profile.rendered()
@@ -1,5 +1,10 @@
+from wordapp.startup_profile import page_profile
+_profile = page_profile("qna")  # cold-start import/render time
 import streamlit as st
+_profile.imported()
 
 st.header("🐾 Q & As: on Padlet")
 st.write("This Padlet serves as a dynamic hub for Q & As regarding this app page.")
 st.components.v1.iframe("https://padlet.com/satang0531/2-q-a-fxt7nbn57od1vawc", width=700, height=600)
+
+_profile.rendered()
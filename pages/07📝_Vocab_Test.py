@@ -0,0 +1,117 @@
+from wordapp.startup_profile import page_profile
+_profile = page_profile("vocab_test")  # cold-start import/render time
+import pandas as pd
+import streamlit as st
+
+from wordapp.banks import pick_bank
+from wordapp.identity import teacher_unlocked
+from wordapp.pretest import (DEFAULT_ROSTER, PHASES, answer_keys, build_blueprint, forms_pack_path, grade_responses,
+                             item_table, parse_roster, response_template, roster_tokens)
+from wordapp.vocab_index import get_index
+from wordapp.worksheets import dataset_digest, hangul_font_available, read_cached
+_profile.imported()
+
+st.set_page_config(page_title="Vocabulary Test", layout="wide")
+st.markdown("### 📝 사전·사후 어휘 평가 (Pre/Post Vocabulary Test)")
+st.caption("배운 단어(A) 20개와 배울 단어(B) 20개로 40문항(단어→뜻, 뜻→단어, 빈칸) 시험지를 학생마다 다른 순서로 만들고, "
+           "답안 CSV를 올리면 한 번에 채점합니다.")
+
+if not teacher_unlocked():
+    _profile.rendered()
+    st.stop()
+
+bank = pick_bank()
+index = get_index(bank)
+set_names = list(index.set_names)
+
+# -------------------------------------------------
+# Test blueprint: same items for pre and post (same seed)
+# -------------------------------------------------
+col1, col2 = st.columns(2)
+a_sets = col1.multiselect("A: 배운 단어 세트", set_names, default=set_names[:2], key="test_a_sets")
+b_sets = col2.multiselect("B: 배울 단어 세트", set_names, default=set_names[2:4], key="test_b_sets")
+col3, col4 = st.columns(2)
+seed = col3.number_input("시험 번호 (사전·사후 평가에 같은 번호 = 같은 문항)", min_value=1, max_value=999, value=1,
+                         key="test_seed")
+phase = col4.radio("평가", PHASES, format_func={"pre": "사전 (Pre)", "post": "사후 (Post)"}.get, horizontal=True,
+                   key="test_phase")
+
+try:
+    bp = build_blueprint(index, tuple(a_sets), tuple(b_sets), int(seed))
+except ValueError as e:
+    st.warning(f"문항을 만들 수 없습니다: {e}")
+    _profile.rendered()
+    st.stop()
+
+with st.expander("문항 구성 (40문항)"):
+    st.dataframe(item_table(index, bp), hide_index=True, width="stretch")
+
+roster_text = st.text_area("반별 인원 (한 줄에 '반: 인원')",
+                           "\n".join(f"{c}: {n}" for c, n in DEFAULT_ROSTER.items()), height=150, key="test_roster")
+roster = parse_roster(roster_text)
+tokens = roster_tokens(roster)
+st.caption(f"{len(roster)}개 반, {len(tokens)}명")
+
+# -------------------------------------------------
+# Forms (PDF per class, rendered on click) and answer sheets
+# -------------------------------------------------
+d1, d2, d3 = st.columns(3)
+if hangul_font_available():
+    d1.download_button(
+        "🖨️ 시험지 PDF (반별 zip)",
+        data=lambda: read_cached(forms_pack_path(index, bp, roster, phase, dataset_digest(index))),
+        file_name=f"vocab-{phase}-test.zip",
+        mime="application/zip",
+        key="test_forms_download",
+    )
+else:
+    d1.error("PDF에 한글을 쓸 글꼴이 없습니다. 서버에 fonts-nanum을 설치하거나 WORDAPP_CLOUD_FONT를 설정하세요. "
+             "(No Hangul font: install fonts-nanum or set WORDAPP_CLOUD_FONT.)")
+d2.download_button(
+    "🔑 학생별 정답 CSV",
+    answer_keys(bp, tokens, phase).to_csv(index=False).encode("utf-8-sig"),
+    file_name=f"vocab-{phase}-keys.csv",
+    mime="text/csv",
+    key="test_keys_download",
+)
+d3.download_button(
+    "📄 답안 입력용 CSV",
+    response_template(tokens, len(bp)).to_csv(index=False).encode("utf-8-sig"),
+    file_name=f"vocab-{phase}-responses.csv",
+    mime="text/csv",
+    key="test_template_download",
+)
+
+# -------------------------------------------------
+# Grading: the whole cohort in one pass (see wordapp/pretest.py)
+# -------------------------------------------------
+st.markdown("#### 채점")
+uploaded = st.file_uploader("답안 CSV (student, 1 … 40 열에 A–D)", type="csv", key="test_responses")
+if uploaded is not None:
+    try:
+        results = grade_responses(bp, pd.read_csv(uploaded, dtype=str, encoding="utf-8-sig"), phase, index)
+    except (ValueError, pd.errors.ParserError) as e:
+        st.error(f"답안 파일을 읽을 수 없습니다: {e}")
+        _profile.rendered()
+        st.stop()
+    students = results.students
+    m1, m2, m3, m4 = st.columns(4)
+    m1.metric("학생 수", len(students))
+    m2.metric("평균 (40점)", f"{students['score'].mean():.1f}" if len(students) else "-")
+    m3.metric("A 평균 (20점)", f"{students['A'].mean():.1f}" if len(students) else "-")
+    m4.metric("B 평균 (20점)", f"{students['B'].mean():.1f}" if len(students) else "-")
+
+    tab1, tab2, tab3 = st.tabs(["학생별", "문항별", "학급별"])
+    for tab, name, table in ((tab1, "students", students), (tab2, "items", results.items),
+                             (tab3, "classes", results.classes)):
+        with tab:
+            st.dataframe(table, hide_index=name != "classes", width="stretch")
+            st.download_button(
+                "⬇️ CSV 다운로드",
+                table.to_csv(index=name == "classes").encode("utf-8-sig"),
+                file_name=f"vocab-{phase}-{name}.csv",
+                mime="text/csv",
+                key=f"test_{name}_download",
+            )
+
+_profile.rendered()
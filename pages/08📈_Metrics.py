@@ -0,0 +1,68 @@
+from wordapp.startup_profile import page_profile
+_profile = page_profile("metrics")  # cold-start import/render time
+import pandas as pd
+import streamlit as st
+
+from wordapp.identity import admin_unlocked
+from wordapp.metrics import ENABLED, METRICS_PATH, WRITE_SECONDS, prometheus_text, reset, snapshot
+_profile.imported()
+
+st.set_page_config(page_title="Metrics", layout="wide")
+st.markdown("### 📈 응답 시간 (Metrics)")
+st.caption("이 서버 프로세스가 시작된 뒤 페이지 실행, 단어 데이터, 문항 만들기, 음성(TTS) 등에 걸린 시간입니다.")
+
+if not admin_unlocked():
+    _profile.rendered()
+    st.stop()
+
+if not ENABLED:
+    st.info("측정이 꺼져 있습니다 (WORDAPP_METRICS=0).")
+    _profile.rendered()
+    st.stop()
+
+c1, c2 = st.columns([1, 5])
+c1.button("🔄 새로고침 (Refresh)", key="refresh_metrics")
+if c2.button("🧹 초기화 (Reset)", key="reset_metrics"):
+    reset()
+
+# -------------------------------------------------
+# Span histograms (see wordapp/metrics.py)
+# -------------------------------------------------
+records = snapshot()
+if not records:
+    st.info("아직 측정된 구간이 없습니다.")
+    _profile.rendered()
+    st.stop()
+
+table = pd.DataFrame({
+    "span": [r["name"] for r in records],
+    "labels": [", ".join(f"{k}={v}" for k, v in r["labels"].items()) for r in records],
+    "count": [r["count"] for r in records],
+    "mean_ms": [r["sum_ms"] / r["count"] for r in records],
+    "p50_ms": [r["p50_ms"] for r in records],
+    "p95_ms": [r["p95_ms"] for r in records],
+    "max_ms": [r["max_ms"] for r in records],
+    "total_s": [r["sum_ms"] / 1000 for r in records],
+}).round(2)
+
+tts = table[table["span"] == "tts"]
+backend = table[table["span"] == "tts_backend"]
+m1, m2, m3 = st.columns(3)
+m1.metric("페이지 실행 p95 (ms)", f"{table.loc[table['span'] == 'render', 'p95_ms'].max():.0f}"
+          if (table["span"] == "render").any() else "-")
+misses = int(tts.loc[tts["labels"].str.contains("cache=miss"), "count"].sum())
+m2.metric("TTS 캐시 적중률", f"{1 - misses / tts['count'].sum():.0%}" if len(tts) else "-")
+m3.metric("음성 합성 시간 합계 (s)", f"{backend['total_s'].sum():.1f}" if len(backend) else "-")
+
+st.dataframe(table.sort_values("total_s", ascending=False), hide_index=True, width="stretch")
+
+st.download_button(
+    "⬇️ Prometheus text",
+    prometheus_text(),
+    file_name="metrics.prom",
+    mime="text/plain",
+    key="metrics_download",
+)
+st.caption(f"`{METRICS_PATH}` 파일에도 {WRITE_SECONDS:.0f}초마다 저장됩니다 (node_exporter textfile collector).")
+
+_profile.rendered()
@@ -0,0 +1,14 @@
+import os
+
+import pandas as pd
+import pytest
+
+from wordapp.banks import DATA_DIR, DEFAULT_BANK, normalize
+from wordapp.vocab_index import build_index
+
+
+@pytest.fixture(scope="session")
+def default_index():
+    """VocabIndex of the shipped default bank, built straight from its CSV (no registry, no network)."""
+    path = os.path.join(DATA_DIR, DEFAULT_BANK)
+    return build_index(normalize(pd.read_csv(path, encoding="utf-8-sig"), DEFAULT_BANK), "tests:" + DEFAULT_BANK)
@@ -0,0 +1,34 @@
+"""While gTTS is out, a word's fallback clip is made once, not on every request."""
+import time
+
+from wordapp.audio_store import DEGRADED_SUFFIX, AudioStore, audio_key
+from wordapp.tts_backends import FailoverTTS, StubBackend, TTSError
+
+
+class Flaky:
+    name = "flaky"
+
+    def __init__(self):
+        self.up = False
+
+    def synthesize(self, text, lang="en", tld="com", slow=False):
+        if not self.up:
+            raise TTSError("offline")
+        return b"ID3good" + text.encode()
+
+
+def test_open_breaker_reuses_the_fallback_clip(tmp_path):
+    primary = Flaky()
+    tts = FailoverTTS(primary, StubBackend(), timeout=1)
+    store = AudioStore(root=str(tmp_path), synthesize=tts)
+
+    tts._opened_at = time.monotonic()  # breaker open
+    first = store.fetch("agree")
+    assert store.fetch("agree") == first
+    assert tts.fallback_calls == 1
+    assert store.publish("agree") == audio_key("agree") + DEGRADED_SUFFIX
+
+    tts._opened_at = None  # recovered: the good voice replaces the fallback clip
+    primary.up = True
+    assert store.fetch("agree") == b"ID3goodagree"
+    assert tts.fallback_calls == 1
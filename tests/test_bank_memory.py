@@ -0,0 +1,66 @@
+"""Evicting a bank from the registry must release everything derived from it."""
+import gc
+import os
+import weakref
+
+import pandas as pd
+import pytest
+
+from wordapp import banks, decks, distractors, pretest, search, vocab_index, worksheets
+
+
+def _write_bank(path: str, tag: str, n: int = 60) -> None:
+    words = [f"{tag}word{i}" for i in range(n)]
+    pd.DataFrame({
+        "Word": words,
+        "Meaning": [f"뜻{tag}{i}" for i in range(n)],
+        "Sentence": [f"I like the {w} here." for w in words],
+        "Translation": ["..."] * n,
+    }).to_csv(path, index=False)
+
+
+@pytest.fixture
+def tiny_registry(tmp_path, monkeypatch):
+    data = tmp_path / "data"
+    data.mkdir()
+    for tag in ("a", "b", "c"):
+        _write_bank(os.path.join(data, f"{tag}.csv"), tag)
+    monkeypatch.setattr(banks, "SNAPSHOT_DIR", str(tmp_path / "snapshots"))
+    monkeypatch.setattr(banks, "_registry", banks.BankRegistry(max_bytes=1, data_dir=str(data)))  # one bank fits
+    return banks.get_registry()
+
+
+def _use(bank: str):
+    """Everything a Practice/Test page derives from a bank; returns weak refs to it."""
+    index = vocab_index.get_index(bank)
+    engine = distractors.get_engine(index)
+    decks.get_deck("set1", "meaning", 0, bank)
+    pretest.build_blueprint(index, ("set1", "set2"), ("set3", "set4"), 1)
+    worksheets.dataset_digest(index)
+    search.get_search_index(bank)
+    return weakref.ref(index), weakref.ref(engine)
+
+
+def test_evicted_bank_releases_index_engine_and_decks(tiny_registry):
+    index_ref, engine_ref = _use("a.csv")
+    assert tiny_registry.resident() == ["a.csv"]
+
+    _use("b.csv")  # over the cap: a.csv is evicted
+    assert tiny_registry.resident() == ["b.csv"]
+    gc.collect()
+
+    assert "a.csv" not in decks._decks
+    assert "a.csv" not in distractors._engines
+    assert "a.csv" not in pretest._blueprints
+    assert "a.csv" not in worksheets._digests
+    assert "a.csv" not in search._searches
+    assert "a.csv" not in vocab_index._indexes
+    assert engine_ref() is None
+    assert index_ref() is None
+
+
+def test_resident_bank_keeps_its_caches(tiny_registry):
+    _, engine_ref = _use("c.csv")
+    index = vocab_index.get_index("c.csv")
+    assert distractors.get_engine(index) is engine_ref()
+    assert decks.get_deck("set1", "meaning", 0, "c.csv") is decks.get_deck("set1", "meaning", 0, "c.csv")
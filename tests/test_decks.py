@@ -0,0 +1,43 @@
+"""Decks are a pure function of (set, mode, seed, scope), and the cursor walks the unsolved questions."""
+from wordapp.decks import _make_deck, next_unsolved
+from wordapp.practice_state import NONE_OF_THE_ABOVE, with_bit
+
+
+def _first_set(index):
+    return index.set_names[0]
+
+
+def test_same_seed_same_deck_and_seeds_differ(default_index):
+    name = _first_set(default_index)
+    for mode in ("meaning", "context", "spelling"):
+        deck = _make_deck(default_index, name, mode, 3, "set")
+        assert _make_deck(default_index, name, mode, 3, "set") == deck
+    orders = {tuple(q.pos for q in _make_deck(default_index, name, "spelling", s, "set")) for s in range(8)}
+    assert len(orders) > 1
+
+
+def test_every_word_once_and_the_answer_among_the_options(default_index):
+    name = _first_set(default_index)
+    ids = default_index.set_ids[name]
+    meaning = _make_deck(default_index, name, "meaning", 0, "set")
+    assert sorted(q.pos for q in meaning) == list(range(len(ids)))
+    for q in meaning:
+        assert q.word_id == ids[q.pos]
+        assert len(q.options) == 5 == len(set(q.options))
+        assert q.word_id in q.options
+    for q in _make_deck(default_index, name, "context", 0, "bank"):
+        assert len(q.options) == 5 and q.options[-1] == NONE_OF_THE_ABOVE
+        assert q.word_id in q.options[:4]
+
+
+def test_next_unsolved_wraps_and_ends(default_index):
+    deck = _make_deck(default_index, _first_set(default_index), "spelling", 0, "set")
+    solved = 0
+    for q in deck[2:]:
+        solved = with_bit(solved, q.pos)
+    assert next_unsolved(deck, solved, 0) == 0
+    assert next_unsolved(deck, solved, 2) == 0  # wraps past the end
+    assert next_unsolved(deck, with_bit(solved, deck[0].pos), 1) == 1
+    for q in deck[:2]:
+        solved = with_bit(solved, q.pos)
+    assert next_unsolved(deck, solved, 0) is None
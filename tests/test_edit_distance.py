@@ -0,0 +1,36 @@
+"""The vectorized edit distance agrees with the textbook one-pair-at-a-time DP."""
+import random
+
+import pytest
+
+from wordapp import edit_distance
+from wordapp.edit_distance import levenshtein, normalized
+
+
+def _reference(a, b, transpositions):
+    d = [[i + j if i * j == 0 else 0 for j in range(len(b) + 1)] for i in range(len(a) + 1)]
+    for i in range(1, len(a) + 1):
+        for j in range(1, len(b) + 1):
+            d[i][j] = min(d[i - 1][j] + 1, d[i][j - 1] + 1, d[i - 1][j - 1] + (a[i - 1] != b[j - 1]))
+            if transpositions and i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                d[i][j] = min(d[i][j], d[i - 2][j - 2] + 1)
+    return d[len(a)][len(b)]
+
+
+@pytest.mark.parametrize("transpositions", [False, True])
+def test_matches_the_reference_on_random_pairs(transpositions, monkeypatch):
+    monkeypatch.setattr(edit_distance, "CHUNK", 97)  # several blocks of ragged widths
+    rng = random.Random(7)
+    alphabet = "abc가나"
+    a = ["".join(rng.choice(alphabet) for _ in range(rng.randrange(8))) for _ in range(500)]
+    b = [s if rng.random() < 0.1 else "".join(rng.choice(alphabet) for _ in range(rng.randrange(8))) for s in a]
+    got = levenshtein(a, b, transpositions)
+    assert got.tolist() == [_reference(x, y, transpositions) for x, y in zip(a, b)]
+
+
+def test_examples():
+    assert levenshtein(["recieve", "recive", "", "abc"], ["receive", "receive", "abc", ""]).tolist() == [2, 1, 3, 3]
+    assert levenshtein(["recieve"], ["receive"], transpositions=True).tolist() == [1]
+    assert normalized(["", "abcd"], ["", "abcf"]).tolist() == [0.0, 0.25]
+    with pytest.raises(ValueError):
+        levenshtein(["a"], [])
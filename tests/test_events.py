@@ -0,0 +1,58 @@
+"""A segment that cannot be read yet must be retried, not dropped from the aggregates."""
+import os
+import shutil
+import subprocess
+import sys
+import time
+
+from wordapp.events import GRACE_SECONDS, EventLog
+
+
+def test_unreadable_segment_is_retried_until_the_grace_period(tmp_path):
+    writer = EventLog(str(tmp_path / "writer"), flush_seconds=3600)
+    writer.record("2-3-15", "practice", "spelling", "set1", "agree", "answer", correct=1, attempt=1, ms=900)
+    writer.flush()
+    writer.close()
+    (segment,) = [p for p in os.listdir(tmp_path / "writer") if p.endswith(".parquet")]
+
+    root = tmp_path / "events"
+    root.mkdir()
+    log = EventLog(str(root), flush_seconds=3600)
+    arriving = root / segment
+    arriving.write_bytes(b"PAR1")  # another process is still copying it in
+    log.refresh()
+    assert str(arriving) not in log._folded
+
+    shutil.copy(tmp_path / "writer" / segment, arriving)
+    log.refresh()
+    assert int(log.aggregates()["answers"].sum()) == 1
+
+    broken = root / "events-broken.parquet"
+    broken.write_bytes(b"not parquet")
+    old = time.time() - GRACE_SECONDS - 1
+    os.utime(broken, (old, old))
+    log.refresh()
+    assert str(broken) in log._folded
+    log.close()
+
+
+def test_history_is_folded_by_the_dashboard_not_the_constructor(tmp_path):
+    writer = EventLog(str(tmp_path), flush_seconds=3600)
+    writer.record("2-3-15", "practice", "meaning", "set1", "agree", "answer", correct=0, attempt=1, ms=500)
+    writer.close()
+
+    log = EventLog(str(tmp_path), flush_seconds=3600)
+    assert not log._folded  # nothing read on construction
+    assert int(log.aggregates()["answers"].sum()) == 1
+    log.close()
+
+
+def test_recording_an_event_does_not_load_pyarrow(tmp_path):
+    script = ("import sys\n"
+              "from wordapp.events import log_event\n"
+              "log_event('2-3-15', 'practice', 'meaning', 'set1', 'agree', 'answer', 1, 1, 500)\n"
+              "print('pyarrow' in sys.modules, 'pandas' in sys.modules)\n")
+    env = dict(os.environ, WORDAPP_EVENT_DIR=str(tmp_path), WORDAPP_EVENT_FLUSH_SECONDS="3600")
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    out = subprocess.run([sys.executable, "-c", script], env=env, cwd=root, capture_output=True, text=True, check=True)
+    assert out.stdout.split() == ["False", "False"]
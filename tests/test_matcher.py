@@ -0,0 +1,32 @@
+"""Phrase matcher: inflected and multi-word forms, and full coverage of the shipped bank."""
+from wordapp.matcher import PhraseMatcher, expand_phrase, inflections, pick_spans, replace_spans
+
+
+def test_every_word_of_the_default_bank_is_found_in_its_sentence(default_index):
+    assert default_index.unmatched == ()
+
+
+def test_inflections():
+    assert {"stops", "stopped", "stopping"} <= inflections("stop")
+    assert {"carries", "carried", "carrying"} <= inflections("carry")
+    assert {"leaves", "left", "leaving"} <= inflections("leave")
+    assert {"took", "taken", "takes"} <= inflections("take")
+
+
+def test_expand_phrase_alternatives_and_optional_letters():
+    assert expand_phrase("be, become(s)") == [["be"], ["become"], ["becomes"]]
+
+
+def test_multi_word_phrase_with_aux_and_pronoun_forms():
+    m = PhraseMatcher(["be good at", "enjoy oneself"])
+    text = "She was good at chess and enjoyed herself."
+    found = {(text[x.start:x.end], x.exact) for x in m.find_all(text)}
+    assert found == {("was good at", True), ("enjoyed herself", False)}
+
+
+def test_pick_spans_prefers_the_exact_form():
+    m = PhraseMatcher(["walk"])
+    text = "They walked home, then walk again."
+    spans = pick_spans(m.find_all(text), 0)
+    assert text[slice(*spans[0])] == "walk"
+    assert replace_spans(text, spans[:1], lambda s: "___") == "They walked home, then ___ again."
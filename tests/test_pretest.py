@@ -0,0 +1,57 @@
+"""Pre/post test: forms are reproducible from the student code and grading reads them back."""
+import pandas as pd
+import pytest
+
+from wordapp.pretest import (LETTERS, WORDS_PER_GROUP, answer_keys, build_blueprint, forms, grade_responses,
+                             response_template)
+
+STUDENTS = ["2-3-1", "2-3-2", "2-4-1"]
+
+
+@pytest.fixture(scope="module")
+def blueprint(default_index):
+    names = list(default_index.set_names)
+    half = len(names) // 2
+    return build_blueprint(default_index, tuple(names[:half]), tuple(names[half:]), seed=5)
+
+
+def test_blueprint(blueprint, default_index):
+    assert len(blueprint) == 2 * WORDS_PER_GROUP == 40
+    assert len({default_index[i].answer for i in blueprint.words}) == 40
+    assert all(opts[0] == w and len(set(opts)) == 4 for w, opts in zip(blueprint.words, blueprint.options))
+
+
+def test_forms_are_seeded_per_student_and_phase(blueprint):
+    order, perm = forms(blueprint, STUDENTS, "pre")
+    again, _ = forms(blueprint, STUDENTS[::-1], "pre")
+    assert (again[::-1] == order).all()
+    assert (order[0] != order[1]).any()
+    assert (forms(blueprint, STUDENTS, "post")[0] != order).any()
+    assert all(sorted(row) == list(range(40)) for row in order)
+
+
+def test_grading_a_small_cohort(blueprint, default_index):
+    keys = answer_keys(blueprint, STUDENTS, "pre")
+    sheet = response_template(STUDENTS, len(blueprint))
+    cols = [str(i) for i in range(1, 41)]
+    sheet.loc[0, cols] = keys.loc[0, cols]  # every answer right
+    wrong = keys.loc[1, cols].map(lambda c: LETTERS[(LETTERS.index(c) + 1) % 4])
+    sheet.loc[1, cols] = list(keys.loc[1, cols[:10]]) + list(wrong[10:])  # 10 right, 30 wrong
+    sheet.loc[2, cols[:5]] = keys.loc[2, cols[:5]].map(lambda c: str(LETTERS.index(c) + 1))  # 1-4, rest blank
+    sheet = sheet.rename(columns={c: "q" + c for c in cols}).assign(student=[" 2-3 1", "2-3-2", "2-4-1"])
+
+    res = grade_responses(blueprint, sheet, "pre", default_index)
+    students = res.students.set_index("student")
+    assert students["score"].tolist() == [40, 10, 5]
+    assert students["answered"].tolist() == [40, 40, 5]
+    assert students.loc["2-3-1", ["A", "B"]].tolist() == [20, 20]
+    assert (students["A"] + students["B"] == students["score"]).all()
+    assert res.classes.loc["2-3", "students"] == 2
+    assert len(res.items) == 40 and res.items["p"].between(0, 1).all()
+
+
+def test_missing_columns_are_reported(blueprint, default_index):
+    with pytest.raises(ValueError, match="student"):
+        grade_responses(blueprint, pd.DataFrame({"1": ["A"]}), "pre", default_index)
+    with pytest.raises(ValueError, match="question"):
+        grade_responses(blueprint, response_template(STUDENTS, 39), "pre", default_index)
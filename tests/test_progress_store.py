@@ -0,0 +1,44 @@
+"""Progress saves are write-behind: a burst of answers is one transaction, and nothing is lost on close."""
+import time
+
+from wordapp.progress_store import ProgressStore, class_of, normalize_token
+
+
+def test_repeated_saves_coalesce_into_one_flush(tmp_path):
+    store = ProgressStore(str(tmp_path / "progress.sqlite3"), flush_seconds=3600)
+    for i in range(20):
+        store.save("2-3-15", "set1", "meaning", (1 << (i + 1)) - 1)
+    store.save("2-3-16", "set1", "meaning", 1)
+    assert store.load("2-3-15") == {("set1", "meaning"): (1 << 20) - 1}  # pending saves are visible
+    assert store.flushes == 0
+
+    assert store.flush() == 2
+    assert (store.writes, store.flushes) == (2, 1)
+    assert store.flush() == 0
+    store.close()
+
+    reopened = ProgressStore(str(tmp_path / "progress.sqlite3"), flush_seconds=3600)
+    assert reopened.load("2-3-15") == {("set1", "meaning"): (1 << 20) - 1}
+    reopened.close()
+
+
+def test_background_writer_and_close(tmp_path):
+    store = ProgressStore(str(tmp_path / "progress.sqlite3"), flush_seconds=0.05)
+    store.save("2-3-15", "set1", "spelling", 7)
+    deadline = time.time() + 5
+    while store.flushes == 0 and time.time() < deadline:
+        time.sleep(0.01)
+    assert store.flushes == 1
+    store.save("2-3-15", "set2", "spelling", 3)
+    store.close()  # writes what is still pending
+
+    reopened = ProgressStore(str(tmp_path / "progress.sqlite3"), flush_seconds=3600)
+    assert reopened.load("2-3-15") == {("set1", "spelling"): 7, ("set2", "spelling"): 3}
+    reopened.close()
+
+
+def test_tokens():
+    assert normalize_token(" 2-3 15 ") == "2-3-15"
+    assert normalize_token("") == ""
+    assert class_of("2-3-15") == "2-3"
+    assert class_of("kim") == "kim"
@@ -0,0 +1,32 @@
+"""Printable QR sheets: codes stay inside their cells at every grid width."""
+import pytest
+
+from wordapp.qr import LABEL_H, MAX_SHEET_COLS, MIN_SHEET_CODE, SHEET_SIZE, qr_sheet_pages, sheet_layout
+
+
+def _overlaps(a, b, size):
+    (ax, ay), (bx, by) = a, b
+    return ax < bx + size and bx < ax + size and ay < by + size + LABEL_H and by < ay + size + LABEL_H
+
+
+@pytest.mark.parametrize("cols", range(2, 6))
+@pytest.mark.parametrize("n_items", [1, 7, 40, 200])
+def test_codes_do_not_overlap(cols, n_items):
+    code, slots = sheet_layout(n_items, cols)
+    for i, a in enumerate(slots):
+        assert a[0] >= 0 and a[1] >= 0
+        assert a[0] + code <= SHEET_SIZE[0] and a[1] + code + LABEL_H <= SHEET_SIZE[1]
+        for b in slots[i + 1:]:
+            assert not _overlaps(a, b, code)
+
+
+def test_page_slider_range_keeps_the_minimum_code_size():
+    assert MAX_SHEET_COLS >= 4  # the Class apps slider goes up to 4
+    for cols in range(2, MAX_SHEET_COLS + 1):
+        assert sheet_layout(200, cols)[0] >= MIN_SHEET_CODE
+
+
+def test_sheet_pages_hold_every_item():
+    items = [(f"2-{i}", f"https://example.com/{i}") for i in range(30)]
+    code, slots = sheet_layout(len(items), 4)
+    assert len(qr_sheet_pages(items, 4)) == -(-len(items) // len(slots))
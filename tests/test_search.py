@@ -0,0 +1,55 @@
+"""Wordlist search agrees with a plain scan of the bank, ranks Word hits first and pages the results."""
+from wordapp.search import FIELDS, SearchIndex, to_chosung, to_jamo, tokens
+
+
+def _scan(index, term):
+    """Ids of the entries with a token that has term as prefix/substring, or chosung prefix."""
+    key = to_jamo(term)
+    chosung = all("ㄱ" <= c <= "ㅎ" for c in term)
+    found = set()
+    for e in index.entries:
+        for field in FIELDS:
+            for t in tokens(getattr(e, field)):
+                jamo, cho = to_jamo(t), to_chosung(t)
+                if (key in jamo if len(key) >= 3 else jamo.startswith(key)) \
+                        or (chosung and cho != t and cho.startswith(term)):
+                    found.add(e.id)
+    return found
+
+
+def test_jamo_and_chosung():
+    assert to_jamo("문제") == "ㅁㅜㄴㅈㅔ"
+    assert to_chosung("문제") == "ㅁㅈ"
+
+
+def test_hits_match_a_scan_of_the_bank(default_index):
+    search = SearchIndex(default_index)
+    words = [e.word for e in default_index.entries[:10]]
+    meaning = tokens(default_index.entries[0].meaning)[0]
+    terms = [w.split()[0][:2] for w in words] + [w.split()[0][1:5] for w in words] \
+        + [meaning, meaning[:1], to_chosung(meaning)]
+    for term in terms:
+        hits, total = search.search(term, per_page=1000)
+        assert {h.word_id for h in hits} == _scan(default_index, term), term
+        assert total == len(hits)
+
+
+def test_word_match_outranks_sentence_and_terms_are_anded(default_index):
+    search = SearchIndex(default_index)
+    e = default_index.entries[0]
+    word = tokens(e.word)[0]
+    hits, _ = search.search(word)
+    assert hits[0].word_id == e.id
+    assert hits == sorted(hits, key=lambda h: -h.score)
+    both, _ = search.search(f"{word} {tokens(e.meaning)[0]}", per_page=1000)
+    assert e.id in {h.word_id for h in both}
+    assert search.search(f"{word} zzzqx") == ([], 0)
+
+
+def test_pages(default_index):
+    search = SearchIndex(default_index)
+    everything, total = search.search("the", per_page=1000)
+    assert total > 10
+    pages = [search.search("the", page=p, per_page=10) for p in range((total + 9) // 10)]
+    assert all(t == total for _, t in pages)
+    assert [h for hits, _ in pages for h in hits] == everything
@@ -0,0 +1,51 @@
+"""Spelling grades: full, partial and no credit, and the error class of each near miss."""
+import pandas as pd
+import pytest
+
+from wordapp.spelling import ERROR_TYPES, grade, grade_batch, regrade_events
+
+
+@pytest.mark.parametrize("answer, target, error", [
+    ("Receive.", "receive", "exact"),
+    ("throw away", "throwaway", "word_boundary"),
+    ("ocasion", "occasion", "doubling"),
+    ("untill", "until", "doubling"),
+    ("recieve", "receive", "transposition"),
+    ("recive", "receive", "omission"),
+    ("gooad", "good", "insertion"),
+    ("agrea", "agree", "substitution"),
+    ("", "agree", "blank"),
+    ("xyz", "agree", "other"),
+])
+def test_error_classes(answer, target, error):
+    assert error in ERROR_TYPES
+    assert grade(answer, target).error == error
+
+
+def test_credit():
+    assert grade("Receive.", "receive") == (True, 1.0, 0.0, "exact")
+    near = grade("recieve", "receive")
+    assert not near.correct and near.credit == pytest.approx(1 - 1 / 7, abs=1e-3)
+    assert grade("recieve", "receive", threshold=0.1).credit == 0.0
+    assert grade("", "receive").credit == 0.0
+    assert grade("xyz", "agree").credit == 0.0
+
+
+def test_batch_matches_one_at_a_time():
+    answers, targets = ["recieve", "agrea", None, "occasion"], ["receive", "agree", "until", "occasion"]
+    batch = grade_batch(answers, targets)
+    for row, a, t in zip(batch.itertuples(), answers, targets):
+        one = grade(a or "", t)
+        assert (row.correct, row.credit, row.distance, row.error) == (one.correct, one.credit, one.distance, one.error)
+
+
+def test_regrade_events_keeps_spelling_answers_with_a_response():
+    events = pd.DataFrame({
+        "class_name": ["2-3"] * 3, "token": ["2-3-15"] * 3, "event": ["answer", "answer", "answer"],
+        "mode": ["spelling", "spelling", "meaning"], "word": ["agree", "until", "agree"],
+        "response": ["agrea", None, "agree"],
+    })
+    out = regrade_events(events)
+    assert out["word"].tolist() == ["agree"]
+    assert out["error"].tolist() == ["substitution"]
+    assert regrade_events(events.drop(columns="response")).empty
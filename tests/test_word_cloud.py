@@ -0,0 +1,55 @@
+"""Word cloud cache: one render per picture, different pictures in parallel, bounded on disk."""
+import os
+import threading
+import time
+
+import pytest
+
+from wordapp import disk_cache, word_cloud
+
+
+@pytest.fixture
+def slow_render(tmp_path, monkeypatch):
+    monkeypatch.setattr(word_cloud, "CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(word_cloud, "_memory", word_cloud.OrderedDict())
+    calls = []
+
+    def render(text, *args):
+        calls.append(text)
+        time.sleep(0.3)
+        return text.encode()
+
+    monkeypatch.setattr(word_cloud, "_render", render)
+    return calls
+
+
+def _in_threads(texts):
+    threads = [threading.Thread(target=word_cloud.wordcloud_png, args=(t,)) for t in texts]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - start
+
+
+def test_same_passage_renders_once(slow_render):
+    _in_threads(["apple banana"] * 4)
+    assert slow_render == ["apple banana"]
+
+
+def test_different_passages_do_not_wait_for_each_other(slow_render):
+    elapsed = _in_threads([f"passage {i}" for i in range(4)])
+    assert len(slow_render) == 4
+    assert elapsed < 0.9  # four 0.3 s renders, not one after another
+
+
+def test_prune_keeps_the_budget_and_recent_files(tmp_path):
+    old = time.time() - 3600
+    for i in range(5):
+        path = tmp_path / f"{i}.png"
+        path.write_bytes(bytes(100))
+        os.utime(path, (old + i, old + i))
+    (tmp_path / "fresh.png").write_bytes(bytes(100))
+    disk_cache.prune(str(tmp_path), 250, (".png",))
+    assert sorted(os.listdir(tmp_path)) == ["4.png", "fresh.png"]
@@ -0,0 +1,21 @@
+"""PDF worksheets refuse to render without a Hangul font instead of printing blanks."""
+import pytest
+
+from wordapp import fonts, worksheets
+
+
+def test_missing_hangul_font_is_an_error(monkeypatch):
+    monkeypatch.setattr(fonts, "font_path", lambda: None)
+    assert not worksheets.hangul_font_available()
+    with pytest.raises(worksheets.MissingFontError):
+        worksheets._font()
+
+
+def test_font_candidates_are_checked_by_signature(tmp_path):
+    fake = tmp_path / "fake.ttf"
+    fake.write_bytes(b"<html>not a font</html>")
+    real = tmp_path / "real.ttf"
+    real.write_bytes(b"\x00\x01\x00\x00" + bytes(60))
+    assert not fonts._is_font(str(fake))
+    assert fonts._is_font(str(real))
+    assert not fonts._is_font(str(tmp_path / "missing.ttf"))
@@ -0,0 +1 @@
+"""Shared helpers for the WordApp pages (audio, data, quiz utilities)."""
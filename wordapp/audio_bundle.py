@@ -0,0 +1,197 @@
+"""Packed, memory-mapped audio bundle for the word bank.
+
+Build it once before class:
+
+    python -m wordapp.audio_bundle data/2025_Ch6_8_0819.csv -o data/audio.bundle
+
+Layout: 8-byte magic, 8-byte little-endian index length, a JSON index
+``{key: [offset, length]}`` (offsets relative to the blob area), then the MP3
+blobs back to back. Keys are ``audio_store.audio_key`` hashes, so a bundle hit
+and a store hit are interchangeable.
+"""
+import argparse
+import csv
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from wordapp.audio_store import ROOT_DIR, audio_key, synthesize_gtts
+
+MAGIC = b"WABNDL01"
+HEADER = struct.Struct("<8sQ")
+DEFAULT_BUNDLE_PATH = os.environ.get("WORDAPP_AUDIO_BUNDLE", os.path.join(ROOT_DIR, "data", "audio.bundle"))
+
+
+class AudioBundle:
+    """Read-only view over a bundle file; lookups are a dict hit plus a slice."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, index_len = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Not an audio bundle: {path}")
+        start = HEADER.size
+        self._index: Dict[str, List[int]] = json.loads(self._mm[start:start + index_len].decode("utf-8"))
+        self._base = start + index_len
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def close(self) -> None:
+        self._mm.close()
+
+    def get(self, key: str) -> Optional[bytes]:
+        entry = self._index.get(key)
+        if entry is None:
+            return None
+        offset, length = entry
+        begin = self._base + offset
+        return self._mm[begin:begin + length]
+
+
+def open_bundle(path: str = DEFAULT_BUNDLE_PATH) -> Optional[AudioBundle]:
+    """Open the bundle if it exists and is valid, else None."""
+    if not os.path.exists(path):
+        return None
+    try:
+        return AudioBundle(path)
+    except (OSError, ValueError, struct.error):
+        return None
+
+
+def write_bundle(path: str, clips: Dict[str, bytes]) -> None:
+    """Write clips into a new bundle file atomically."""
+    index = {}
+    offset = 0
+    for key in sorted(clips):
+        index[key] = [offset, len(clips[key])]
+        offset += len(clips[key])
+    index_bytes = json.dumps(index, separators=(",", ":")).encode("utf-8")
+
+    folder = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(dir=folder, suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        f.write(HEADER.pack(MAGIC, len(index_bytes)))
+        f.write(index_bytes)
+        for key in sorted(clips):
+            f.write(clips[key])
+    os.replace(tmp, path)
+
+
+# -------------------------------------------------
+# Pre-render pipeline
+# -------------------------------------------------
+class RateLimiter:
+    """Allow at most `rate` calls per second across all worker threads."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def read_texts(csv_path: str, columns: Iterable[str] = ("Word", "Sentence")) -> List[str]:
+    """Unique non-empty texts from the given CSV columns, in file order."""
+    texts = {}
+    with open(csv_path, encoding="utf-8-sig", newline="") as f:
+        for row in csv.DictReader(f):
+            for col in columns:
+                val = (row.get(col) or "").strip()
+                if val:
+                    texts[val] = None
+    return list(texts)
+
+
+def prerender(
+    texts: List[str],
+    lang: str = "en",
+    tld: str = "com",
+    workers: int = 4,
+    rate: float = 5.0,
+    retries: int = 3,
+    synthesize: Callable[..., bytes] = synthesize_gtts,
+    existing: Optional[AudioBundle] = None,
+) -> Tuple[Dict[str, bytes], List[str]]:
+    """Synthesize texts on a bounded pool. Returns (clips by key, failed texts)."""
+    limiter = RateLimiter(rate)
+    clips: Dict[str, bytes] = {}
+    todo = []
+    for text in texts:
+        key = audio_key(text, lang, tld)
+        cached = existing.get(key) if existing is not None else None
+        if cached is not None:
+            clips[key] = bytes(cached)
+        else:
+            todo.append(text)
+
+    def _one(text: str) -> bytes:
+        for attempt in range(retries):
+            limiter.wait()
+            try:
+                return synthesize(text, lang, tld, False)
+            except Exception:
+                if attempt == retries - 1:
+                    raise
+                time.sleep(2 ** attempt)
+
+    failed = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(_one, text): text for text in todo}
+        for fut in as_completed(futures):
+            text = futures[fut]
+            try:
+                clips[audio_key(text, lang, tld)] = fut.result()
+            except Exception as e:
+                print(f"  ! failed: {text!r} ({e})", file=sys.stderr)
+                failed.append(text)
+    return clips, failed
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Pre-render word bank audio into a packed bundle.")
+    parser.add_argument("csv", nargs="?", default=os.path.join(ROOT_DIR, "data", "2025_Ch6_8_0819.csv"))
+    parser.add_argument("-o", "--output", default=DEFAULT_BUNDLE_PATH)
+    parser.add_argument("--workers", type=int, default=4, help="concurrent gTTS calls")
+    parser.add_argument("--rate", type=float, default=5.0, help="max gTTS calls per second")
+    parser.add_argument("--lang", default="en")
+    parser.add_argument("--tld", default="com")
+    args = parser.parse_args(argv)
+
+    texts = read_texts(args.csv)
+    existing = open_bundle(args.output)
+    print(f"{len(texts)} texts from {args.csv}")
+    start = time.perf_counter()
+    clips, failed = prerender(texts, args.lang, args.tld, args.workers, args.rate, existing=existing)
+    if existing is not None:
+        existing.close()
+    write_bundle(args.output, clips)
+    size = os.path.getsize(args.output)
+    print(f"Wrote {len(clips)} clips ({size / 1024:.0f} KB) to {args.output} in {time.perf_counter() - start:.1f}s")
+    if failed:
+        print(f"{len(failed)} text(s) failed; run again to retry them.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,301 @@
+"""Content-addressed TTS audio store shared by every page.
+
+Clips are keyed by (text, lang, tld, speed) and written to local disk so they
+survive app restarts. The store is bounded by total bytes and evicts the least
+recently used clips first. A pre-built bundle (see ``audio_bundle``) is checked
+before the disk store, so word-bank audio never needs a gTTS call. Misses are
+synthesized by the backend from ``tts_backends.default_tts`` (gTTS behind a
+timeout and circuit breaker, with an offline fallback).
+
+The store lives under ``static/audio`` so Streamlit's static file serving
+(``.streamlit/config.toml``) can hand clips to the browser by a stable,
+content-hashed URL (``audio_url``) with range support, instead of resending
+the bytes on every rerun. Streamlit's static route sends no Cache-Control and
+gives the app no way to add one, so how long a browser keeps a clip is up to
+its own heuristics; a long-lived cache needs a reverse proxy in front of the
+app (a URL's clip never changes, so ``immutable`` is safe there).
+"""
+import hashlib
+import os
+import re
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from wordapp.metrics import span
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_AUDIO_DIR = os.environ.get("WORDAPP_AUDIO_DIR", os.path.join(ROOT_DIR, "static", "audio"))
+# Where DEFAULT_AUDIO_DIR is reachable from a page (relative to the app URL)
+AUDIO_URL_PREFIX = os.environ.get("WORDAPP_AUDIO_URL_PREFIX", "app/static/audio")
+DEFAULT_MAX_BYTES = int(os.environ.get("WORDAPP_AUDIO_MAX_BYTES", 200 * 1024 * 1024))
+TTS_WORKERS = int(os.environ.get("WORDAPP_TTS_WORKERS", 6))
+DEGRADED_SUFFIX = "-local"  # key suffix for clips from the offline fallback engine
+MAX_CHUNK_CHARS = 200  # longer sentences are split again at commas/spaces
+
+
+def audio_key(text: str, lang: str = "en", tld: str = "com", slow: bool = False) -> str:
+    """Stable content hash for one clip."""
+    speed = "slow" if slow else "normal"
+    raw = "\x1f".join([text.strip(), lang, tld or "com", speed])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def synthesize_gtts(text: str, lang: str = "en", tld: str = "com", slow: bool = False) -> bytes:
+    """Call Google TTS and return MP3 bytes (no failover; used by the bundle builder)."""
+    from wordapp.tts_backends import GTTSBackend
+
+    return GTTSBackend().synthesize(text, lang, tld, slow)
+
+
+class AudioStore:
+    """Disk-backed MP3 store with LRU eviction by total size."""
+
+    def __init__(
+        self,
+        root: str = DEFAULT_AUDIO_DIR,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        synthesize: Callable[..., bytes] = synthesize_gtts,
+        bundle=None,
+    ):
+        self.root = root
+        self.bundle = bundle
+        self.max_bytes = max_bytes
+        self.synthesize = synthesize
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, threading.Lock] = {}
+        self._entries: "OrderedDict[str, int]" = OrderedDict()  # key -> size, oldest first
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(root, exist_ok=True)
+        self._scan()
+
+    # ---------------- index ----------------
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, f"{key}.mp3")
+
+    def _scan(self) -> None:
+        """Rebuild the LRU order from file mtimes left by a previous run."""
+        found = []
+        for name in os.listdir(self.root):
+            if not name.endswith(".mp3"):
+                continue
+            st_ = os.stat(os.path.join(self.root, name))
+            found.append((st_.st_mtime, name[:-4], st_.st_size))
+        for _, key, size in sorted(found):
+            self._entries[key] = size
+            self.total_bytes += size
+        self._evict()
+
+    def _evict(self) -> None:
+        while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+            key, size = self._entries.popitem(last=False)
+            self.total_bytes -= size
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+
+    # ---------------- public API ----------------
+    def get(self, key: str) -> Optional[bytes]:
+        """Return cached bytes for key, or None."""
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)  # keep LRU order across restarts
+        except FileNotFoundError:
+            with self._lock:
+                size = self._entries.pop(key, 0)
+                self.total_bytes -= size
+            return None
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        """Write bytes atomically and evict old clips if over budget."""
+        fd, tmp = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, self._path(key))
+        with self._lock:
+            self.total_bytes -= self._entries.pop(key, 0)
+            self._entries[key] = len(data)
+            self.total_bytes += len(data)
+            self._evict()
+
+    def fetch(self, text: str, lang: str = "en", tld: str = "com", slow: bool = False) -> bytes:
+        """Return audio for text, synthesizing it once on a miss.
+
+        Concurrent misses for the same clip wait on a single synthesis call.
+        """
+        with span("tts") as s:
+            _, data, source = self._fetch(text, lang, tld, slow)
+            s.label(cache=source)
+        return data
+
+    def _fetch(self, text: str, lang: str, tld: str, slow: bool) -> Tuple[str, bytes, str]:
+        """(key the clip is stored under, bytes, where it came from: bundle, disk or miss)."""
+        key = audio_key(text, lang, tld, slow)
+        if self.bundle is not None:
+            data = self.bundle.get(key)
+            if data is not None:
+                self.hits += 1
+                return key, data, "bundle"
+        hit = self._get_stored(key)
+        if hit is not None:
+            return hit
+        with self._lock:
+            gate = self._inflight.setdefault(key, threading.Lock())
+        with gate:
+            hit = self._get_stored(key)  # synthesized by a concurrent caller
+            if hit is not None:
+                return hit
+            self.misses += 1
+            try:
+                data = self.synthesize(text, lang, tld, slow)
+                # A fallback-engine clip is kept under its own key, so the
+                # primary voice is tried again on the next miss
+                stored = key + DEGRADED_SUFFIX if getattr(data, "degraded", False) else key
+                self.put(stored, data)
+            finally:
+                with self._lock:
+                    self._inflight.pop(key, None)
+        return stored, data, "miss"
+
+    def _get_stored(self, key: str) -> Optional[Tuple[str, bytes, str]]:
+        """Disk hit for key; while the backend's breaker is open, its fallback clip counts too."""
+        data = self.get(key)
+        if data is not None:
+            self.hits += 1
+            return key, data, "disk"
+        # The breaker sends every miss to the local engine anyway, so reuse
+        # the clip it made last time instead of running it again
+        if getattr(self.synthesize, "state", None) == "open":
+            data = self.get(key + DEGRADED_SUFFIX)
+            if data is not None:
+                self.hits += 1
+                return key + DEGRADED_SUFFIX, data, "disk"
+        return None
+
+    def publish(self, text: str, lang: str = "en", tld: str = "com", slow: bool = False) -> str:
+        """Make sure the clip exists as a file in the store and return its key."""
+        with span("tts") as s:
+            key = audio_key(text, lang, tld, slow)
+            with self._lock:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    s.label(cache="disk")
+                    return key
+            stored, data, source = self._fetch(text, lang, tld, slow)
+            s.label(cache=source)
+            with self._lock:
+                on_disk = stored in self._entries
+            if not on_disk:  # bundle hit: materialize the slice as a servable file
+                self.put(stored, bytes(data))
+            return stored
+
+
+_store: Optional[AudioStore] = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> AudioStore:
+    """Process-wide store shared by every session."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                from wordapp.audio_bundle import open_bundle
+                from wordapp.tts_backends import default_tts
+
+                _store = AudioStore(synthesize=default_tts(), bundle=open_bundle())
+    return _store
+
+
+def tts_bytes(text: str, lang: str = "en", tld: str = "com", slow: bool = False) -> bytes:
+    """MP3 bytes for text from the shared store."""
+    return get_store().fetch(text, lang, tld, slow)
+
+
+def audio_url(text: str, lang: str = "en", tld: str = "com", slow: bool = False) -> str:
+    """Stable, content-hashed URL for text's clip (synthesized on first use)."""
+    return f"{AUDIO_URL_PREFIX}/{get_store().publish(text, lang, tld, slow)}.mp3"
+
+
+def audio_html(url: str, mime: str = "audio/mpeg") -> str:
+    """iOS-friendly <audio> tag pointing at a served clip."""
+    return f"""
+    <audio controls preload="none">
+        <source src="{url}" type="{mime}">
+        Your browser does not support the audio element.
+    </audio>
+    """
+
+
+_pool = ThreadPoolExecutor(max_workers=TTS_WORKERS, thread_name_prefix="tts")
+
+
+def tts_many(
+    texts: List[str], lang: str = "en", tld: str = "com", slow: bool = False
+) -> Iterator[Tuple[int, Union[bytes, Exception]]]:
+    """Fetch several clips on the shared bounded pool.
+
+    Yields (position in texts, bytes or the raised exception) in completion
+    order, so callers can render each clip as soon as it is ready.
+    """
+    return _fan_out(get_store().fetch, texts, lang, tld, slow)
+
+
+# -------------------------------------------------
+# Long text: one cached clip per sentence
+# -------------------------------------------------
+SENTENCE_END_RE = re.compile(r"(?<=[.!?。！？…])\s+|(?<=[.!?。！？…][\"'”’)\]])\s+|(?<=[。！？])(?=\S)|\n+")
+
+
+def split_sentences(text: str, max_chars: int = MAX_CHUNK_CHARS) -> List[str]:
+    """Sentence-sized chunks of text, each at most max_chars long.
+
+    Each chunk is its own clip in the store, so editing one sentence of a
+    passage only re-synthesizes that sentence.
+    """
+    chunks = []
+    for sentence in SENTENCE_END_RE.split(text):
+        sentence = sentence.strip()
+        while len(sentence) > max_chars:
+            cut = max(sentence.rfind(",", 0, max_chars), sentence.rfind(" ", 0, max_chars))
+            cut = cut + 1 if cut > 0 else max_chars
+            chunks.append(sentence[:cut].strip())
+            sentence = sentence[cut:].strip()
+        if sentence:
+            chunks.append(sentence)
+    return chunks
+
+
+def stitch_mp3(parts: List[bytes]) -> bytes:
+    """One MP3 from clips in order (gTTS output is bare MPEG frames, so
+    concatenation is a valid stream -- gTTS joins its own parts the same way)."""
+    return b"".join(parts)
+
+
+def audio_url_many(
+    texts: List[str], lang: str = "en", tld: str = "com", slow: bool = False
+) -> Iterator[Tuple[int, Union[str, Exception]]]:
+    """Like tts_many, but yields audio_url results."""
+    return _fan_out(audio_url, texts, lang, tld, slow)
+
+
+def _fan_out(fn, texts, lang, tld, slow):
+    futures = {_pool.submit(fn, text, lang, tld, slow): i for i, text in enumerate(texts)}
+    for fut in as_completed(futures):
+        try:
+            yield futures[fut], fut.result()
+        except Exception as e:
+            yield futures[fut], e
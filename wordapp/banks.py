@@ -0,0 +1,267 @@
+"""Registry of the vocabulary banks in ``data/``.
+
+Every ``*.csv`` and every sheet of every ``*.xlsx`` in ``data/`` is a bank,
+named by its file name (plus ``:sheet`` when a workbook has several
+sheets), e.g. ``2025_Ch6_8_0819.csv`` or ``2025_Ch6_8_0819.xlsx:extended``.
+Discovery only lists file names and workbook sheet names, so adding banks
+does not slow startup.
+
+On first use a bank's source is parsed once, normalized to the app's
+columns (ID, Set, Hint, Word, Meaning, Sentence, Translation) and saved as
+a Parquet snapshot under ``.cache/banks``, keyed by the source's size and
+mtime; later loads (and other processes) read the snapshot instead of
+parsing the CSV/xlsx again. Sources without a ``Set`` column are split into
+sets of ``SET_SIZE`` in file order; a missing ``Hint`` is derived from the
+word ("idiom" for phrases). Korean headers (단어, 단어 뜻, 예시 문장,
+예시 문장 해석) are accepted.
+
+Loaded banks are kept in memory up to ``WORDAPP_BANK_MEMORY_MB`` and the
+least recently used one is dropped beyond that. Treat a returned DataFrame
+as read-only; it is shared by every session.
+"""
+import logging
+import os
+import re
+import tempfile
+import threading
+import zipfile
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import pandas as pd
+
+from wordapp.audio_store import ROOT_DIR
+
+log = logging.getLogger(__name__)
+DATA_DIR = os.path.join(ROOT_DIR, "data")
+SNAPSHOT_DIR = os.path.join(ROOT_DIR, ".cache", "banks")
+DEFAULT_BANK = os.environ.get("WORDAPP_BANK", "2025_Ch6_8_0819.csv")
+MAX_MEMORY_BYTES = int(float(os.environ.get("WORDAPP_BANK_MEMORY_MB", 64)) * 1024 * 1024)
+SET_SIZE = 15
+
+COLUMNS = ["ID", "Set", "Hint", "Word", "Meaning", "Sentence", "Translation"]
+REQUIRED_COLUMNS = ["Word", "Meaning", "Sentence", "Translation"]
+HEADER_ALIASES = {
+    "단어": "Word", "단어 뜻": "Meaning", "뜻": "Meaning", "예시 문장": "Sentence", "예문": "Sentence",
+    "예시 문장 해석": "Translation", "해석": "Translation", "세트": "Set",
+}
+_SHEET_RE = re.compile(r'<sheet\b[^>]*\bname="([^"]*)"')
+
+
+class BankSource(NamedTuple):
+    name: str
+    path: str
+    sheet: Optional[str] = None  # xlsx sheet; None for CSV
+
+
+# -------------------------------------------------
+# Discovery
+# -------------------------------------------------
+def _sheet_names(path: str) -> List[str]:
+    """Sheet names from the workbook's XML, without parsing any cells."""
+    import html
+
+    try:
+        with zipfile.ZipFile(path) as zf:
+            xml = zf.read("xl/workbook.xml").decode("utf-8")
+    except (OSError, KeyError, zipfile.BadZipFile) as e:
+        log.warning("skipping %s: %s", os.path.basename(path), e)
+        return []
+    return [html.unescape(s) for s in _SHEET_RE.findall(xml)]
+
+
+_discovered: Dict[str, tuple] = {}
+_discover_lock = threading.Lock()
+
+
+def discover(data_dir: str = DATA_DIR) -> Dict[str, BankSource]:
+    """Banks in data_dir by name; re-listed only when the directory changes."""
+    stamp = os.stat(data_dir).st_mtime_ns
+    with _discover_lock:
+        cached = _discovered.get(data_dir)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+    banks: Dict[str, BankSource] = {}
+    for entry in sorted(os.scandir(data_dir), key=lambda e: e.name):
+        if entry.name.startswith(("~$", ".")) or not entry.is_file():
+            continue
+        ext = os.path.splitext(entry.name)[1].lower()
+        if ext == ".csv":
+            banks[entry.name] = BankSource(entry.name, entry.path)
+        elif ext == ".xlsx":
+            sheets = _sheet_names(entry.path)
+            for sheet in sheets:
+                name = entry.name if len(sheets) == 1 else f"{entry.name}:{sheet}"
+                banks[name] = BankSource(name, entry.path, sheet)
+    with _discover_lock:
+        _discovered[data_dir] = (stamp, banks)
+    return banks
+
+
+def bank_names() -> List[str]:
+    """Bank names, the default bank first."""
+    names = list(discover())
+    if DEFAULT_BANK in names:
+        names.remove(DEFAULT_BANK)
+        names.insert(0, DEFAULT_BANK)
+    return names
+
+
+# -------------------------------------------------
+# Source -> validated snapshot
+# -------------------------------------------------
+def normalize(df: pd.DataFrame, name: str = "bank") -> pd.DataFrame:
+    """Map a raw sheet onto COLUMNS; raises ValueError if required columns are missing."""
+    df = df.rename(columns=lambda c: HEADER_ALIASES.get(str(c).strip(), str(c).strip()))
+    df = df.dropna(how="all").reset_index(drop=True)  # trailing ",,,,,," rows
+    missing = [c for c in REQUIRED_COLUMNS if c not in df.columns]
+    if missing:
+        raise ValueError(f"{name} is missing required column(s): {', '.join(missing)}")
+    df = df[df["Word"].notna()].reset_index(drop=True)
+    for col in ("Word", "Meaning", "Sentence", "Translation"):
+        df[col] = df[col].fillna("").astype(str).str.strip()
+    if "Set" not in df.columns:
+        df["Set"] = [f"set{i // SET_SIZE + 1}" for i in range(len(df))]
+    df["Set"] = df["Set"].astype(str).str.strip()
+    if "Hint" not in df.columns:
+        df["Hint"] = None
+    derived = df["Word"].map(lambda w: "idiom" if " " in w else "single word")
+    df["Hint"] = df["Hint"].where(df["Hint"].notna(), derived).astype(str)
+    ids = pd.to_numeric(df["ID"], errors="coerce") if "ID" in df.columns else None
+    df["ID"] = ids.astype("int64") if ids is not None and ids.notna().all() else range(1, len(df) + 1)
+    return df[COLUMNS]
+
+
+def read_source(src: BankSource, path: Optional[str] = None) -> pd.DataFrame:
+    """Parse and validate one bank straight from its CSV/xlsx (slow for xlsx)."""
+    path = path or src.path
+    if src.sheet is None:
+        raw = pd.read_csv(path, encoding="utf-8-sig")
+    else:
+        raw = pd.read_excel(path, sheet_name=src.sheet)
+    return normalize(raw, src.name)
+
+
+def _snapshot_path(src: BankSource, path: str) -> str:
+    st = os.stat(path)
+    safe = re.sub(r"[^0-9A-Za-z_.-]+", "_", src.name)
+    return os.path.join(SNAPSHOT_DIR, f"{safe}-{st.st_size}-{st.st_mtime_ns}.parquet")
+
+
+def _snapshot(src: BankSource, path: str) -> pd.DataFrame:
+    """Snapshot for the current version of the source, converting it if needed."""
+    snap = _snapshot_path(src, path)
+    if os.path.exists(snap):
+        return pd.read_parquet(snap)
+    df = read_source(src, path)
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=SNAPSHOT_DIR, suffix=".tmp")
+    os.close(fd)
+    try:
+        df.to_parquet(tmp, index=False)
+        os.replace(tmp, snap)
+        prefix = os.path.basename(snap).rsplit("-", 2)[0] + "-"
+        for old in os.listdir(SNAPSHOT_DIR):  # snapshots of older versions of this bank
+            if old.startswith(prefix) and old.endswith(".parquet") and old != os.path.basename(snap):
+                os.remove(os.path.join(SNAPSHOT_DIR, old))
+    except (ImportError, OSError) as e:  # no pyarrow or read-only disk: serve the parse
+        log.warning("could not write snapshot for %s: %s", src.name, e)
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return df
+
+
+# -------------------------------------------------
+# Lazy, memory-capped registry
+# -------------------------------------------------
+class BankRegistry:
+    """Loads banks on first use and keeps the most recently used in memory."""
+
+    def __init__(self, max_bytes: int = MAX_MEMORY_BYTES, data_dir: str = DATA_DIR):
+        self.max_bytes = max_bytes
+        self.data_dir = data_dir
+        self._loaded: "OrderedDict[str, Tuple[tuple, pd.DataFrame, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.loads = 0
+        self.evictions = 0
+
+    def source(self, name: str) -> BankSource:
+        try:
+            return discover(self.data_dir)[name]
+        except KeyError:
+            raise KeyError(f"Unknown vocabulary bank: {name}") from None
+
+    def load(self, name: str, path: Optional[str] = None) -> pd.DataFrame:
+        """DataFrame for bank `name`; path overrides the source file (e.g. a revalidated copy)."""
+        src = self.source(name)
+        path = path or src.path
+        st = os.stat(path)
+        version = (path, st.st_size, st.st_mtime_ns)
+        with self._lock:
+            cached = self._loaded.get(name)
+            if cached is not None and cached[0] == version:
+                self._loaded.move_to_end(name)
+                return cached[1]
+        df = _snapshot(src, path)
+        nbytes = int(df.memory_usage(deep=True).sum())
+        with self._lock:
+            self.loads += 1
+            self._loaded[name] = (version, df, nbytes)
+            self._loaded.move_to_end(name)
+            # Drop least recently used banks, never the one just loaded
+            while len(self._loaded) > 1 and self.memory_bytes() > self.max_bytes:
+                evicted, _ = self._loaded.popitem(last=False)
+                self.evictions += 1
+                log.info("evicted %s (bank memory over %.1f MB)", evicted, self.max_bytes / 2**20)
+        return df
+
+    def memory_bytes(self) -> int:
+        return sum(nbytes for _, _, nbytes in self._loaded.values())
+
+    def resident(self) -> List[str]:
+        with self._lock:
+            return list(self._loaded)
+
+
+_registry: Optional[BankRegistry] = None
+_lock = threading.Lock()
+
+
+def get_registry() -> BankRegistry:
+    global _registry
+    with _lock:
+        if _registry is None:
+            _registry = BankRegistry()
+        return _registry
+
+
+def load_bank(name: Optional[str] = None) -> pd.DataFrame:
+    """Shared DataFrame of one bank (the default bank when name is None)."""
+    from wordapp.data import load_vocab  # keeps the default CSV's remote revalidation
+
+    return load_vocab(name or DEFAULT_BANK)
+
+
+# -------------------------------------------------
+# Page helper
+# -------------------------------------------------
+def pick_bank() -> str:
+    """Bank chosen in the sidebar, kept in the URL (?bank=...)."""
+    import streamlit as st
+
+    names = bank_names()
+    url_bank = st.query_params.get("bank")
+    if url_bank not in names:
+        url_bank = DEFAULT_BANK if DEFAULT_BANK in names else names[0]
+    bank = st.sidebar.selectbox("단어 묶음 (Word bank)", names, index=names.index(url_bank), key="bank_select")
+    if bank != st.query_params.get("bank"):
+        if bank == DEFAULT_BANK:
+            st.query_params.pop("bank", None)
+        else:
+            st.query_params["bank"] = bank
+    return bank
+
+
+def bank_set_key(bank: str, set_name: str) -> str:
+    """Set name for progress/event records; the default bank keeps plain names."""
+    return set_name if bank == DEFAULT_BANK else f"{bank}/{set_name}"
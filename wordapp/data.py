@@ -0,0 +1,133 @@
+"""Vocabulary loader shared by every page.
+
+The repo's own ``data/`` copy is read first, so the app starts without
+network. If a remote URL is configured the copy is revalidated in the
+background with a conditional GET (ETag / Last-Modified) at most every
+``REVALIDATE_SECONDS``; a changed file is saved under ``.cache/data`` and
+re-parsed once. All sessions share the same parsed DataFrame, so treat it as
+read-only.
+
+Any other bank in ``data/`` (see ``wordapp.banks``) loads through the same
+function by name; parsing, snapshots and the memory cap live there.
+"""
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from typing import Dict, Optional
+
+import pandas as pd
+
+from wordapp.audio_store import ROOT_DIR
+from wordapp.banks import DEFAULT_BANK, get_registry
+from wordapp.metrics import span
+
+log = logging.getLogger(__name__)
+DATA_DIR = os.path.join(ROOT_DIR, "data")
+CACHE_DIR = os.path.join(ROOT_DIR, ".cache", "data")
+DEFAULT_CSV = "2025_Ch6_8_0819.csv"
+DEFAULT_CSV_URL = "https://raw.githubusercontent.com/jihyeon0531/WordApp/refs/heads/main/data/2025_Ch6_8_0819.csv"
+# Set WORDAPP_CSV_URL="" to run purely from the local copy
+REMOTE_CSV_URL = os.environ.get("WORDAPP_CSV_URL", DEFAULT_CSV_URL)
+REVALIDATE_SECONDS = int(os.environ.get("WORDAPP_REVALIDATE_SECONDS", 300))
+
+
+class _Entry:
+    __slots__ = ("checked_at", "checking")
+
+    def __init__(self):
+        self.checked_at = float("-inf")
+        self.checking = False
+
+
+_entries: Dict[str, _Entry] = {}
+_lock = threading.Lock()
+
+
+def _cached_path(name: str) -> str:
+    return os.path.join(CACHE_DIR, name)
+
+
+def _source_path(name: str) -> str:
+    """Newest local copy: a revalidated download if newer, else the repo file."""
+    cached = _cached_path(name)
+    local = os.path.join(DATA_DIR, name)
+    if os.path.exists(cached) and os.path.getmtime(cached) >= os.path.getmtime(local):
+        return cached
+    return local
+
+
+def _revalidate(name: str, url: str) -> None:
+    """Conditional GET; on 200 replace the cached copy, on 304 do nothing."""
+    meta_path = _cached_path(name) + ".json"
+    meta = {}
+    if os.path.exists(meta_path):
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+
+    req = urllib.request.Request(url)
+    if meta.get("etag"):
+        req.add_header("If-None-Match", meta["etag"])
+    if meta.get("last_modified"):
+        req.add_header("If-Modified-Since", meta["last_modified"])
+    try:
+        with span("csv_fetch"), urllib.request.urlopen(req, timeout=5) as resp:
+            body = resp.read()
+            headers = resp.headers
+    except urllib.error.HTTPError as e:
+        if e.code != 304:
+            log.warning("revalidate %s: HTTP %s", url, e.code)
+        return
+    except (urllib.error.URLError, OSError) as e:
+        log.warning("revalidate %s: %s", url, e)
+        return
+
+    # Skip the write if the body is identical to what we already serve
+    current = _source_path(name)
+    with open(current, "rb") as f:
+        if f.read() == body:
+            body = None
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    if body is not None:
+        fd, tmp = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(body)
+        os.replace(tmp, _cached_path(name))
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump({"etag": headers.get("ETag"), "last_modified": headers.get("Last-Modified")}, f)
+
+
+def _revalidate_in_background(entry: _Entry, name: str, url: str) -> None:
+    def _run():
+        try:
+            _revalidate(name, url)
+        finally:
+            with _lock:
+                entry.checking = False
+                entry.checked_at = time.monotonic()
+
+    threading.Thread(target=_run, name=f"revalidate-{name}", daemon=True).start()
+
+
+def load_vocab(name: Optional[str] = None, url: Optional[str] = None) -> pd.DataFrame:
+    """Shared parsed vocabulary for bank `name` in data/ (a CSV, or ``book.xlsx:sheet``).
+
+    Defaults to ``WORDAPP_BANK`` (the 2025 Ch6-8 CSV).
+
+    Never blocks on the network: revalidation runs in a background thread and
+    the next call after it finishes picks up a changed file.
+    """
+    name = name or DEFAULT_BANK
+    url = REMOTE_CSV_URL if url is None and name == DEFAULT_CSV else url
+    with _lock:
+        entry = _entries.setdefault(name, _Entry())
+        if url and not entry.checking and time.monotonic() - entry.checked_at > REVALIDATE_SECONDS:
+            entry.checking = True
+            _revalidate_in_background(entry, name, url)
+    with span("data_load", bank=name):
+        path = _source_path(name) if url else None
+        return get_registry().load(name, path)
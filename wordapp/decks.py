@@ -0,0 +1,125 @@
+"""Pre-generated question decks for the practice modes.
+
+A deck is every word of a set as a ready-to-render question (options
+already drawn), shuffled with a seed. Decks are built once per
+(set, mode, seed, scope) and shared by every session that draws that seed;
+a session only keeps a cursor and a solved bitmask, so next-question,
+mark-solved and requeue-on-wrong are int operations.
+
+Distractors are drawn from the most plausible candidates of the
+similarity engine (``wordapp.distractors``): the best ``k + SPREAD`` for
+the word, so different seeds still vary the options. ``scope`` says where
+they come from: the word's own set, or the whole bank.
+
+Modes:
+    "meaning"  -- meaning -> word, 5 options (Practice 1)
+    "context"  -- cloze sentence, 3 distractors + "None of the above" (Practice 2)
+    "spelling" -- listen and spell, no options (Practice 3)
+"""
+import random
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from wordapp.distractors import get_engine
+from wordapp.metrics import span
+from wordapp.practice_state import NONE_OF_THE_ABOVE, is_set
+from wordapp.vocab_index import VocabIndex, bank_cache, get_index
+
+DECK_VARIANTS = 8  # distinct shuffles per (set, mode); sessions share them
+SPREAD = 2  # extra top candidates to pick distractors from
+
+
+class Question(NamedTuple):
+    pos: int  # position of the answer in the set
+    word_id: int
+    options: Tuple[int, ...]  # word ids; NONE_OF_THE_ABOVE = -1
+
+
+def make_mcq_options(correct: int, pool: Sequence[int], k_distractors: int = 3,
+                     rng: random.Random = random) -> Tuple[int, ...]:
+    """4 options (1 correct + 3 distractors) + 'None of the above' last."""
+    distractors = [w for w in pool if w != correct]
+    rng.shuffle(distractors)
+    distractors = distractors[:k_distractors]
+    opts = distractors + [correct]
+    rng.shuffle(opts)
+    opts.append(NONE_OF_THE_ABOVE)
+    return tuple(opts)
+
+
+def make_k_options_including_correct(correct: int, pool: Sequence[int], k: int = 5,
+                                     rng: random.Random = random) -> Tuple[int, ...]:
+    """Build exactly k options including the correct answer (no 'None of the above')."""
+    pool_unique = list(dict.fromkeys(pool))  # de-dup
+    distractors = [w for w in pool_unique if w != correct]
+    rng.shuffle(distractors)
+    need = max(0, k - 1)
+    chosen = distractors[:need]
+    opts = chosen + [correct]
+    rng.shuffle(opts)
+    return tuple(opts[:k])
+
+
+_decks: Dict[str, tuple] = {}
+
+
+def _build_deck(index: VocabIndex, set_name: str, mode: str, seed: int, scope: str = "set") -> Tuple[Question, ...]:
+    """Deck cached per bank: at most sets x modes x DECK_VARIANTS x scopes of them."""
+    cache = bank_cache(_decks, index)
+    key = (set_name, mode, seed, scope)
+    deck = cache.get(key)
+    if deck is None:
+        deck = cache.setdefault(key, _make_deck(index, set_name, mode, seed, scope))
+    return deck
+
+
+def _make_deck(index: VocabIndex, set_name: str, mode: str, seed: int, scope: str) -> Tuple[Question, ...]:
+    rng = random.Random(f"{set_name}|{mode}|{seed}")
+    ids = index.set_ids[set_name]
+    positions = list(range(len(ids)))
+    rng.shuffle(positions)
+    engine = get_engine(index)
+    deck: List[Question] = []
+    for pos in positions:
+        word_id = ids[pos]
+        if mode == "meaning":
+            pool = engine.top(word_id, 4 + SPREAD, scope)
+            options = make_k_options_including_correct(word_id, pool, k=5, rng=rng)
+        elif mode == "context":
+            pool = engine.top(word_id, 3 + SPREAD, scope)
+            options = make_mcq_options(word_id, pool, k_distractors=3, rng=rng)
+        elif mode == "spelling":
+            options = ()
+        else:
+            raise ValueError(f"Unknown deck mode: {mode}")
+        deck.append(Question(pos, word_id, options))
+    return tuple(deck)
+
+
+def get_deck(set_name: str, mode: str, seed: int, bank: Optional[str] = None,
+             scope: str = "set") -> Tuple[Question, ...]:
+    """Shared deck for (set, mode, seed) over the bank's vocabulary index.
+
+    scope "bank" draws distractors from every set of the bank.
+    """
+    with span("question_build", mode=mode):
+        return _build_deck(get_index(bank), set_name, mode, seed % DECK_VARIANTS, scope)
+
+
+def new_seed() -> int:
+    return random.randrange(DECK_VARIANTS)
+
+
+def next_unsolved(deck: Sequence[Question], solved: int, cursor: int) -> Optional[int]:
+    """Deck index of the first unsolved question at or after cursor (wrapping).
+
+    A linear scan: O(n) per draw in the worst case (a mostly solved deck),
+    which is nothing at set sizes of a few dozen words. A question answered
+    wrong stays unsolved and comes back when the cursor wraps
+    (requeue-on-wrong).
+    """
+    n = len(deck)
+    for step in range(n):
+        i = (cursor + step) % n
+        if not is_set(solved, deck[i].pos):
+            return i
+    return None
@@ -0,0 +1,46 @@
+"""Size-bounded file caches under ``.cache/`` (PDFs, word clouds).
+
+Files are evicted least recently used first, by mtime: readers ``touch`` a
+file on every hit. Files used in the last ``MIN_AGE_SECONDS`` are never
+deleted, so a file that is being read or zipped right now stays put even
+when the directory is over budget.
+"""
+import os
+import time
+from typing import Sequence
+
+MIN_AGE_SECONDS = 60
+
+
+def touch(path: str) -> bool:
+    """Mark a cached file as used; False if it is not there."""
+    try:
+        os.utime(path)
+        return True
+    except FileNotFoundError:
+        return False
+
+
+def prune(root: str, max_bytes: int, suffixes: Sequence[str], min_age: float = MIN_AGE_SECONDS) -> None:
+    """Delete least recently used files with these suffixes until root fits in max_bytes."""
+    try:
+        names = [n for n in os.listdir(root) if n.endswith(tuple(suffixes))]
+    except FileNotFoundError:
+        return
+    found = []
+    for name in names:
+        try:
+            st_ = os.stat(os.path.join(root, name))
+        except FileNotFoundError:
+            continue
+        found.append((st_.st_mtime, name, st_.st_size))
+    total = sum(size for _, _, size in found)
+    cutoff = time.time() - min_age
+    for mtime, name, size in sorted(found):
+        if total <= max_bytes or mtime > cutoff:
+            break
+        try:
+            os.remove(os.path.join(root, name))
+        except FileNotFoundError:
+            pass
+        total -= size
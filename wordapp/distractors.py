@@ -0,0 +1,154 @@
+"""Similarity-ranked distractors, precomputed once per vocabulary bank.
+
+For every pair of words in a bank a plausibility score is computed in one
+vectorized pass from:
+
+    ngram    -- shared letter trigrams of the words (Dice), "satisfied" ~ "satisfactory"
+    edit     -- 1 - normalized edit distance of the words
+    hint     -- same Hint ("idiom" next to idioms, single words next to single words)
+    meaning  -- shared Hangul bigrams of the Korean meanings (same topic: 만족하다 / 만족스러운)
+
+Pairs that would make a question ambiguous are never offered: the same word
+(it repeats across sets) and meanings so close that both options would be
+right (``MAX_MEANING_OVERLAP``). For each word the best ``TOP_K`` candidates
+from its own set and from the whole bank are stored as tuples, so a
+question's distractors are a slice, not a search.
+"""
+import re
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from wordapp.edit_distance import normalized
+from wordapp.vocab_index import VocabIndex, bank_cache
+
+WEIGHTS = {"ngram": 0.35, "edit": 0.25, "hint": 0.15, "meaning": 0.25}
+TOP_K = 8
+MAX_MEANING_OVERLAP = 0.6
+SCOPES = ("set", "bank")
+_HANGUL = re.compile(r"[가-힣]+")
+
+
+# -------------------------------------------------
+# Feature matrices (n x n, float32)
+# -------------------------------------------------
+def _incidence(features: Sequence[set]) -> np.ndarray:
+    vocab: Dict[str, int] = {}
+    for fs in features:
+        for f in fs:
+            vocab.setdefault(f, len(vocab))
+    m = np.zeros((len(features), max(len(vocab), 1)), dtype=np.float32)
+    for i, fs in enumerate(features):
+        m[i, [vocab[f] for f in fs]] = 1.0
+    return m
+
+
+def _dice(features: Sequence[set]) -> np.ndarray:
+    m = _incidence(features)
+    shared = m @ m.T
+    sizes = m.sum(axis=1)
+    total = sizes[:, None] + sizes[None, :]
+    return np.divide(2 * shared, total, out=np.zeros_like(shared), where=total > 0)
+
+
+def _jaccard(features: Sequence[set]) -> np.ndarray:
+    m = _incidence(features)
+    shared = m @ m.T
+    sizes = m.sum(axis=1)
+    union = sizes[:, None] + sizes[None, :] - shared
+    return np.divide(shared, union, out=np.zeros_like(shared), where=union > 0)
+
+
+def ngram_similarity(words: Sequence[str], n: int = 3) -> np.ndarray:
+    padded = [f"^{w.lower()}$" for w in words]
+    return _dice([{p[i:i + n] for i in range(len(p) - n + 1)} for p in padded])
+
+
+def edit_similarity(words: Sequence[str]) -> np.ndarray:
+    lower = [w.lower() for w in words]
+    n = len(lower)
+    ii, jj = np.triu_indices(n, k=1)
+    sim = np.ones((n, n), dtype=np.float32)
+    dist = normalized([lower[i] for i in ii], [lower[j] for j in jj])
+    sim[ii, jj] = sim[jj, ii] = 1.0 - dist
+    return sim
+
+
+def hint_match(hints: Sequence[str]) -> np.ndarray:
+    codes = np.unique(np.asarray(hints, dtype=object), return_inverse=True)[1]
+    return (codes[:, None] == codes[None, :]).astype(np.float32)
+
+
+def meaning_overlap(meanings: Sequence[str]) -> np.ndarray:
+    """Jaccard over Hangul syllable bigrams (and single syllables of 1-syllable runs)."""
+    features = []
+    for m in meanings:
+        fs = set()
+        for run in _HANGUL.findall(m):
+            if len(run) == 1:
+                fs.add(run)
+            else:
+                fs.update(run[i:i + 2] for i in range(len(run) - 1))
+        features.append(fs)
+    return _jaccard(features)
+
+
+# -------------------------------------------------
+# Engine
+# -------------------------------------------------
+class DistractorEngine:
+    """Top-k plausible distractors per word, from its set or from the whole bank."""
+
+    def __init__(self, index: VocabIndex, weights: Dict[str, float] = WEIGHTS, top_k: int = TOP_K):
+        entries = index.entries
+        words = [e.word for e in entries]
+        meaning = meaning_overlap([e.meaning for e in entries])
+        score = (
+            weights["ngram"] * ngram_similarity(words)
+            + weights["edit"] * edit_similarity(words)
+            + weights["hint"] * hint_match([e.hint for e in entries])
+            + weights["meaning"] * np.minimum(meaning, MAX_MEANING_OVERLAP)
+        )
+        answers = np.unique(np.asarray([e.answer for e in entries], dtype=object), return_inverse=True)[1]
+        banned = (answers[:, None] == answers[None, :]) | (meaning > MAX_MEANING_OVERLAP)
+        score[banned] = -np.inf
+        self.score = score
+        self.top_k = top_k
+        self._top: Dict[str, Tuple[Tuple[int, ...], ...]] = {
+            "bank": self._ranked(score, np.arange(len(entries))),
+            "set": self._per_set(index, score),
+        }
+
+    def _ranked(self, score: np.ndarray, columns: np.ndarray) -> Tuple[Tuple[int, ...], ...]:
+        sub = score[:, columns]
+        # stable sort on -score: ties keep bank order, so decks are reproducible
+        order = np.argsort(-sub, axis=1, kind="stable")[:, :self.top_k]
+        return tuple(
+            tuple(int(columns[j]) for j in row if np.isfinite(sub[i, j]))
+            for i, row in enumerate(order)
+        )
+
+    def _per_set(self, index: VocabIndex, score: np.ndarray) -> Tuple[Tuple[int, ...], ...]:
+        top: List[Tuple[int, ...]] = [()] * len(index.entries)
+        for ids in index.set_ids.values():
+            cols = np.asarray(ids)
+            ranked = self._ranked(score[cols], cols)
+            for word_id, row in zip(ids, ranked):
+                top[word_id] = row
+        return tuple(top)
+
+    def top(self, word_id: int, k: int = 3, scope: str = "set") -> Tuple[int, ...]:
+        """Best k distractor word ids for word_id (k <= top_k)."""
+        return self._top[scope][word_id][:k]
+
+
+_engines: Dict[str, tuple] = {}
+
+
+def get_engine(index: VocabIndex) -> DistractorEngine:
+    """Engine for one loaded index; built on first use, shared by every session."""
+    cache = bank_cache(_engines, index)
+    engine = cache.get("engine")
+    if engine is None:
+        engine = cache.setdefault("engine", DistractorEngine(index))
+    return engine
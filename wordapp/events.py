@@ -0,0 +1,235 @@
+"""Append-only research event log with incremental aggregates.
+
+Pages call ``log_event(...)``, which appends one tuple to an in-memory
+buffer (a few microseconds, no I/O). A background thread writes the buffer
+every ``FLUSH_SECONDS`` as one Parquet segment under ``state/events/``;
+segments are never rewritten, so the log is append-only and each column
+(event, word, correct, ms, ...) can be read on its own.
+
+Every written batch is also folded into running counters keyed by
+(class, word, mode), so the dashboard reads a small table instead of
+rescanning the log. Segments already on disk are folded by the first
+``refresh()``/``aggregates()`` call (the dashboard), not when the log is
+created, so the student whose event starts the log after a restart never
+pays for scanning the history; after that only new segments are read.
+
+Event kinds:
+    "answer"  -- a checked answer; correct 0/1, attempt = try number for the
+                 item (attempt > 1 is a retry), ms = time on item,
+                 response = what was typed (spelling only, for re-grading),
+                 credit = score 0..1 (spelling partial credit; else = correct)
+    "audio"   -- a clip was put on screen (playback itself happens in the
+                 browser and is not visible to the server)
+    "select"  -- a word picked for study on the Learning page
+"""
+import atexit
+import glob
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from wordapp.audio_store import ROOT_DIR
+from wordapp.progress_store import class_of
+
+log = logging.getLogger(__name__)
+DEFAULT_EVENT_DIR = os.environ.get("WORDAPP_EVENT_DIR", os.path.join(ROOT_DIR, "state", "events"))
+FLUSH_SECONDS = float(os.environ.get("WORDAPP_EVENT_FLUSH_SECONDS", 5))
+MAX_BUFFER = 5000  # flush early when a burst fills the buffer
+GRACE_SECONDS = 60  # an unreadable segment younger than this is retried (may still be arriving)
+
+# Column -> Arrow type name; pyarrow is only imported by the writer thread
+# and the dashboard's refresh/read_all (the log no longer folds the history
+# when it is created), so the request that records an event never loads it
+COLUMNS = {
+    "ts": "float64",
+    "token": "string",
+    "class_name": "string",
+    "page": "string",
+    "mode": "string",
+    "set_name": "string",
+    "word": "string",
+    "event": "string",
+    "correct": "int8",  # -1 when not an answer
+    "attempt": "int16",
+    "ms": "int32",
+    "response": "string",  # added later: older segments read it as null
+    "credit": "float32",  # added later: null in older segments (= correct)
+}
+
+
+def _schema():
+    import pyarrow as pa
+
+    return pa.schema([(name, getattr(pa, type_name)()) for name, type_name in COLUMNS.items()])
+
+# Counters per (class, word, mode)
+AGG_FIELDS = ("answers", "correct", "retries", "audio", "selected", "ms", "credit")
+AggKey = Tuple[str, str, str]
+
+
+class EventLog:
+    """Buffered writer of Parquet segments plus running aggregates."""
+
+    def __init__(self, root: str = DEFAULT_EVENT_DIR, flush_seconds: float = FLUSH_SECONDS):
+        os.makedirs(root, exist_ok=True)
+        self.root = root
+        self.flush_seconds = flush_seconds
+        self._buffer: List[tuple] = []
+        self._lock = threading.Lock()  # guards the buffer
+        self._agg_lock = threading.Lock()  # guards the aggregates
+        self._flush_lock = threading.Lock()
+        self._agg: Dict[AggKey, List[int]] = {}
+        self._folded: set = set()  # segment files already in the aggregates
+        self._seq = 0
+        self._wake = threading.Event()
+        self._closed = False
+        self._scanned = False  # segments on disk folded in (first refresh)
+        self._writer = threading.Thread(target=self._run, name="wordapp-events", daemon=True)
+        self._writer.start()
+
+    # ---------------- Recording ----------------
+    def record(self, token: str, page: str, mode: str, set_name: str, word: str, event: str,
+               correct: int = -1, attempt: int = 0, ms: int = 0, response: Optional[str] = None,
+               credit: Optional[float] = None) -> None:
+        row = (time.time(), token, class_of(token), page, mode, set_name, word, event, correct, attempt, ms, response,
+               credit)
+        with self._lock:
+            self._buffer.append(row)
+            full = len(self._buffer) >= MAX_BUFFER
+        if full:
+            self._wake.set()
+
+    def flush(self) -> int:
+        """Write the buffer as one segment and fold it in; returns events written."""
+        with self._flush_lock:
+            with self._lock:
+                rows, self._buffer = self._buffer, []
+            if not rows:
+                return 0
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            schema = _schema()
+            table = pa.Table.from_arrays(
+                [pa.array(col, type=schema.field(i).type) for i, col in enumerate(zip(*rows))],
+                schema=schema,
+            )
+            self._seq += 1
+            name = f"events-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{self._seq:06d}.parquet"
+            path = os.path.join(self.root, name)
+            try:
+                pq.write_table(table, path + ".tmp")
+                os.replace(path + ".tmp", path)
+            except OSError as e:
+                log.warning("write failed, keeping %d events for retry: %s", len(rows), e)
+                with self._lock:
+                    self._buffer[:0] = rows
+                return 0
+            self._fold(table, path)
+            return len(rows)
+
+    def _run(self) -> None:
+        while not self._closed:
+            self._wake.wait(self.flush_seconds)
+            self._wake.clear()
+            self.flush()
+
+    def close(self) -> None:
+        self._closed = True
+        self._wake.set()
+        self._writer.join(timeout=self.flush_seconds + 5)
+        self.flush()
+
+    # ---------------- Aggregates ----------------
+    def _fold(self, table, path: str) -> None:
+        cols = table.select(["class_name", "word", "mode", "event", "correct", "attempt", "ms"]).to_pydict()
+        credits = table.column("credit").to_pylist() if "credit" in table.column_names else [None] * table.num_rows
+        with self._agg_lock:
+            if path in self._folded:
+                return
+            self._folded.add(path)
+            for cls, word, mode, event, correct, attempt, ms, credit in zip(*cols.values(), credits):
+                acc = self._agg.get((cls, word, mode))
+                if acc is None:
+                    acc = self._agg[(cls, word, mode)] = [0] * len(AGG_FIELDS)
+                if event == "answer":
+                    acc[0] += 1
+                    acc[1] += correct == 1
+                    acc[2] += attempt > 1
+                    acc[5] += ms
+                    acc[6] += (correct == 1) if credit is None else credit
+                elif event == "audio":
+                    acc[3] += 1
+                elif event == "select":
+                    acc[4] += 1
+
+    def refresh(self) -> int:
+        """Fold segments written since the last call (e.g. by another process).
+
+        A segment that cannot be read is retried on later calls until it is
+        ``GRACE_SECONDS`` old, then skipped for good.
+        """
+        self._scanned = True
+        new = [p for p in sorted(glob.glob(os.path.join(self.root, "*.parquet"))) if p not in self._folded]
+        if new:
+            import pyarrow.parquet as pq
+        for path in new:
+            try:
+                self._fold(pq.read_table(path), path)
+            except Exception as e:
+                try:
+                    age = time.time() - os.path.getmtime(path)
+                except OSError:
+                    age = GRACE_SECONDS  # gone: nothing to retry
+                if age < GRACE_SECONDS:
+                    log.info("segment %s not readable yet, will retry: %s", path, e)
+                    continue
+                log.warning("skipping unreadable segment %s: %s", path, e)
+                with self._agg_lock:
+                    self._folded.add(path)
+        return len(new)
+
+    def aggregates(self) -> "pd.DataFrame":
+        """One row per (class, word, mode) with the running counters."""
+        import pandas as pd
+
+        if not self._scanned:
+            self.refresh()
+        with self._agg_lock:
+            rows = [(*key, *acc) for key, acc in self._agg.items()]
+        return pd.DataFrame(rows, columns=["class_name", "word", "mode", *AGG_FIELDS])
+
+    def read_all(self) -> "pd.DataFrame":
+        """Every written event (full scan; for exports, not for reruns)."""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        paths = sorted(glob.glob(os.path.join(self.root, "*.parquet")))
+        if not paths:
+            return _schema().empty_table().to_pandas()
+        # promote: segments written before a column was added get nulls for it
+        return pa.concat_tables([pq.read_table(p) for p in paths], promote_options="default").to_pandas()
+
+
+_log: Optional[EventLog] = None
+_log_lock = threading.Lock()
+
+
+def get_event_log() -> EventLog:
+    """Process-wide log shared by every session; flushed at exit."""
+    global _log
+    if _log is None:
+        with _log_lock:
+            if _log is None:
+                _log = EventLog()
+                atexit.register(_log.close)
+    return _log
+
+
+def log_event(token: str, page: str, mode: str, set_name: str, word: str, event: str,
+              correct: int = -1, attempt: int = 0, ms: int = 0, response: Optional[str] = None,
+              credit: Optional[float] = None) -> None:
+    """Buffer one event; never blocks on disk."""
+    get_event_log().record(token, page, mode, set_name, word, event, correct, attempt, ms, response, credit)
@@ -0,0 +1,43 @@
+"""The Korean-capable font shared by word clouds, QR labels and PDFs.
+
+Resolved once per process: ``WORDAPP_CLOUD_FONT`` if set, else the first
+font found on the system (NanumGothic from ``packages.txt`` on Streamlit
+Cloud, Noto CJK, Apple SD Gothic Neo, Malgun Gothic). Candidates are
+checked by their file signature only, so pages can ask whether one exists
+without loading PIL.
+"""
+import logging
+import os
+from functools import lru_cache
+from typing import Optional
+
+log = logging.getLogger(__name__)
+
+FONT_CANDIDATES = (
+    "/usr/share/fonts/truetype/nanum/NanumGothic.ttf",
+    "/usr/share/fonts/truetype/nanum/NanumGothicBold.ttf",
+    "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/noto-cjk/NotoSansCJK-Regular.ttc",
+    "/System/Library/Fonts/AppleSDGothicNeo.ttc",
+    "C:/Windows/Fonts/malgun.ttf",
+)
+FONT_SIGNATURES = (b"\x00\x01\x00\x00", b"OTTO", b"true", b"ttcf")  # TrueType, CFF, old Apple, collection
+
+
+def _is_font(path: str) -> bool:
+    try:
+        with open(path, "rb") as f:
+            return f.read(4) in FONT_SIGNATURES
+    except OSError:
+        return False
+
+
+@lru_cache(maxsize=1)
+def font_path() -> Optional[str]:
+    """Korean-capable font file, or None if the system has none."""
+    candidates = [os.environ.get("WORDAPP_CLOUD_FONT", "")] + list(FONT_CANDIDATES)
+    for path in candidates:
+        if path and _is_font(path):
+            return path
+    log.warning("No Korean font found; Hangul will not render")
+    return None
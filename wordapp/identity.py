@@ -0,0 +1,59 @@
+"""Who is using a page: a student code for saved progress and the event log,
+and the teacher/admin codes that unlock the dashboard-style pages."""
+import hmac
+import os
+
+import streamlit as st
+
+from wordapp.progress_store import normalize_token
+
+# Teacher pages stay locked until this is set
+TEACHER_CODE = os.environ.get("WORDAPP_TEACHER_CODE", "")
+ADMIN_CODE = os.environ.get("WORDAPP_ADMIN_CODE") or TEACHER_CODE
+
+
+def student_token() -> str:
+    """Student code from the sidebar, kept in the URL (?student=2-3-15).
+
+    The URL copy survives a sleeping phone or a reconnect, so a reload picks
+    the same code back up without the student typing it again.
+    """
+    url_token = normalize_token(st.query_params.get("student"))
+    token = normalize_token(st.sidebar.text_input(
+        "학생 코드 (반-번호, 예: 2-3-15)",
+        value=url_token,
+        key="student_token_input",
+        help="입력하면 연습 기록이 저장되어 다시 접속해도 이어서 할 수 있어요.",
+    ))
+    if token != url_token:
+        if token:
+            st.query_params["student"] = token
+        else:
+            del st.query_params["student"]
+    return token
+
+
+def _unlocked(expected: str, env_name: str, label: str, state_key: str, input_key: str) -> bool:
+    """Code gate that fails closed: locked when no code is configured."""
+    if not expected:
+        st.warning(f"선생님께 {env_name} 설정을 요청하세요. (Ask your teacher to set {env_name}.)")
+        return False
+    if st.session_state.get(state_key):
+        return True
+    code = st.text_input(label, type="password", key=input_key)
+    if code and hmac.compare_digest(code, expected):
+        st.session_state[state_key] = True
+        return True
+    if code:
+        st.error("코드가 올바르지 않습니다.")
+    return False
+
+
+def teacher_unlocked() -> bool:
+    """True once the configured teacher code was entered; never when none is configured."""
+    return _unlocked(TEACHER_CODE, "WORDAPP_TEACHER_CODE", "교사 코드 (Teacher code)", "teacher_ok", "teacher_code_input")
+
+
+def admin_unlocked() -> bool:
+    """Like teacher_unlocked, for server internals (Metrics); WORDAPP_ADMIN_CODE, else the teacher code."""
+    return _unlocked(ADMIN_CODE, "WORDAPP_ADMIN_CODE", "관리자 코드 (Admin code)", "admin_ok", "admin_code_input")
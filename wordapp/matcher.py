@@ -0,0 +1,180 @@
+"""Single-pass multi-phrase matcher used for cloze masking and highlighting.
+
+All word-bank phrases are expanded once into their accepted surface forms
+(be/have/do forms, -s/-es/-ed/-ing, irregular verbs and plurals, reflexive
+pronouns for "oneself") and stored in one token trie. Scanning a sentence
+walks the trie from each token, so every phrase is located in a single pass
+over the sentence instead of one regex per phrase.
+"""
+import itertools
+import re
+from typing import Dict, List, NamedTuple, Sequence, Set, Tuple
+
+TOKEN_RE = re.compile(r"[A-Za-z0-9]+(?:['’][A-Za-z]+)*")
+
+AUX_FORMS = {
+    "be":   {"am", "is", "are", "was", "were", "be", "being", "been", "i'm", "you're", "he's", "she's", "it's",
+             "we're", "they're", "that's"},
+    "have": {"have", "has", "had", "having"},
+    "do":   {"do", "does", "did", "doing"},
+}
+
+PRONOUN_FORMS = {
+    "oneself": {"myself", "yourself", "himself", "herself", "itself", "oneself", "ourselves", "yourselves",
+                "themselves"},
+    "one's":   {"my", "your", "his", "her", "its", "one's", "our", "their"},
+}
+
+IRREGULAR = {
+    "become": {"became"}, "break": {"broke", "broken"}, "bring": {"brought"}, "buy": {"bought"},
+    "choose": {"chose", "chosen"}, "cut": {"cut"}, "drink": {"drank", "drunk"}, "eat": {"ate", "eaten"},
+    "feel": {"felt"}, "get": {"got", "gotten"}, "give": {"gave", "given"}, "go": {"went", "gone"},
+    "keep": {"kept"}, "leave": {"left"}, "lose": {"lost"}, "make": {"made"}, "meet": {"met"},
+    "put": {"put"}, "run": {"ran"}, "say": {"said"}, "see": {"saw", "seen"}, "sit": {"sat"},
+    "stand": {"stood"}, "swing": {"swung"}, "take": {"took", "taken"}, "teach": {"taught"},
+    "think": {"thought"}, "throw": {"threw", "thrown"}, "wear": {"wore", "worn"}, "win": {"won"},
+    "write": {"wrote", "written"}, "man": {"men"}, "woman": {"women"}, "child": {"children"},
+    "foot": {"feet"}, "tooth": {"teeth"}, "mouse": {"mice"}, "person": {"people"},
+}
+
+_VOWELS = "aeiou"
+
+
+class Match(NamedTuple):
+    phrase_id: int
+    start: int  # character offsets into the scanned text
+    end: int
+    exact: bool  # surface form equals the phrase as written (aux forms count as exact)
+
+
+def _norm(token: str) -> str:
+    return token.lower().replace("’", "'")
+
+
+def inflections(word: str) -> Set[str]:
+    """Regular and irregular inflected forms of a single lowercase word."""
+    w = word
+    forms = {w} | IRREGULAR.get(w, set())
+    if len(w) < 2 or not w.isalpha():
+        return forms
+    # -s / -es
+    if re.search(r"(s|x|z|ch|sh|o)$", w):
+        forms.add(w + "es")
+    elif w[-1] == "y" and w[-2] not in _VOWELS:
+        forms.add(w[:-1] + "ies")
+    elif w.endswith("fe"):
+        forms |= {w + "s", w[:-2] + "ves"}
+    elif w.endswith("f"):
+        forms |= {w + "s", w[:-1] + "ves"}
+    else:
+        forms.add(w + "s")
+    # -ed / -ing
+    if w.endswith("ee"):
+        forms |= {w + "d", w + "ing"}
+    elif w.endswith("ie"):
+        forms |= {w + "d", w[:-2] + "ying"}
+    elif w.endswith("e"):
+        forms |= {w + "d", w[:-1] + "ing"}
+    elif w[-1] == "y" and w[-2] not in _VOWELS:
+        forms |= {w[:-1] + "ied", w + "ing"}
+    else:
+        forms |= {w + "ed", w + "ing"}
+        # consonant doubling for short CVC endings: stop -> stopped, wrap -> wrapping
+        if len(w) >= 3 and w[-1] not in _VOWELS + "wxy" and w[-2] in _VOWELS and w[-3] not in _VOWELS:
+            forms |= {w + w[-1] + "ed", w + w[-1] + "ing"}
+    return forms
+
+
+def expand_phrase(phrase: str) -> List[List[str]]:
+    """Alternatives for one word-bank entry as token lists.
+
+    "be, become(s)" -> [["be"], ["become"], ["becomes"]]
+    """
+    alternatives = []
+    for part in re.split(r"[,/]", phrase):
+        part = part.strip()
+        if not part:
+            continue
+        optional = re.findall(r"\((\w+)\)", part)
+        bare = re.sub(r"\(\w+\)", "", part)
+        variants = [bare]
+        if optional:
+            variants.append(re.sub(r"\((\w+)\)", r"\1", part))
+        for v in variants:
+            tokens = [_norm(t) for t in TOKEN_RE.findall(v)]
+            if tokens and tokens not in alternatives:
+                alternatives.append(tokens)
+    return alternatives
+
+
+def _token_forms(tokens: List[str], pos: int) -> Dict[str, bool]:
+    """Accepted surface forms of tokens[pos] -> whether the form counts as exact."""
+    tok = tokens[pos]
+    if tok in AUX_FORMS and (pos == 0 or len(tokens) == 1):
+        return {f: True for f in AUX_FORMS[tok]}
+    if tok in PRONOUN_FORMS:
+        return {f: True for f in PRONOUN_FORMS[tok]}
+    forms = {tok: True}
+    # Verb phrases inflect their head, noun compounds their last word
+    if pos == 0 or pos == len(tokens) - 1:
+        for f in inflections(tok):
+            forms.setdefault(f, False)
+    return forms
+
+
+class PhraseMatcher:
+    """Token trie over every accepted form of every phrase."""
+
+    def __init__(self, phrases: Sequence[str]):
+        self.phrases = tuple(phrases)
+        self._root: dict = {}
+        for pid, phrase in enumerate(self.phrases):
+            for tokens in expand_phrase(phrase):
+                per_token = [_token_forms(tokens, i) for i in range(len(tokens))]
+                for combo in itertools.product(*[list(f.items()) for f in per_token]):
+                    node = self._root
+                    for form, _ in combo:
+                        node = node.setdefault(form, {})
+                    exact = all(is_exact for _, is_exact in combo)
+                    ends = node.setdefault(None, {})
+                    ends[pid] = ends.get(pid, False) or exact
+
+    def find_all(self, text: str) -> List[Match]:
+        """Every phrase occurrence in text (overlaps allowed), in start order."""
+        toks: List[Tuple[str, int, int]] = [(_norm(m.group()), m.start(), m.end()) for m in TOKEN_RE.finditer(text)]
+        found = []
+        for i in range(len(toks)):
+            node = self._root
+            for j in range(i, len(toks)):
+                node = node.get(toks[j][0])
+                if node is None:
+                    break
+                for pid, exact in node.get(None, {}).items():
+                    found.append(Match(pid, toks[i][1], toks[j][2], exact))
+        return found
+
+    def locate(self, texts: Sequence[str]) -> List[List[Match]]:
+        """find_all over many texts in one pass."""
+        return [self.find_all(t) for t in texts]
+
+
+def pick_spans(matches: Sequence[Match], phrase_id: int) -> List[Tuple[int, int]]:
+    """Non-overlapping spans of one phrase, best match (exact, earliest) first."""
+    own = sorted((m for m in matches if m.phrase_id == phrase_id), key=lambda m: (not m.exact, m.start, -m.end))
+    chosen: List[Tuple[int, int]] = []
+    for m in own:
+        if all(m.end <= s or m.start >= e for s, e in chosen):
+            chosen.append((m.start, m.end))
+    return chosen
+
+
+def replace_spans(text: str, spans: Sequence[Tuple[int, int]], render) -> str:
+    """Rebuild text with each span replaced by render(matched_text)."""
+    out = []
+    pos = 0
+    for s, e in sorted(spans):
+        out.append(text[pos:s])
+        out.append(render(text[s:e]))
+        pos = e
+    out.append(text[pos:])
+    return "".join(out)
@@ -0,0 +1,230 @@
+"""In-process timing of the hot path, for Prometheus and the Metrics page.
+
+Code times a named span; labels can be added while it runs:
+
+    with span("question_build", mode="spelling"):
+        deck = ...
+
+    with span("tts") as s:
+        ...
+        s.label(cache="disk")
+
+Each (name, labels) pair keeps a histogram of durations (fixed
+``BUCKETS_MS``, like a Prometheus histogram) plus count, sum and max.
+Spans in use:
+
+    render          -- one full page run (labels page, run=cold|warm)
+    fragment        -- one rerun of a Practice mode fragment (label mode)
+    data_load       -- load_vocab: registry lookup or snapshot read (label bank)
+    index_build     -- compiling a bank's VocabIndex after a (re)load
+    question_build  -- get_deck (label mode)
+    tts             -- one clip from the audio store (label cache=bundle|disk|miss)
+    tts_backend     -- one synthesis call (labels backend, outcome=ok|error|timeout)
+    csv_fetch       -- background revalidation of the remote CSV
+
+A span that ends in an exception gets an ``error`` label with its type
+(``st.stop``/``st.rerun`` are not errors).
+A daemon thread writes the histograms every ``WRITE_SECONDS`` in the
+Prometheus text format to ``state/metrics.prom`` (``WORDAPP_METRICS_FILE``;
+point node_exporter's textfile collector at it).
+
+``WORDAPP_METRICS=0`` turns all of this off: ``span`` then hands back one
+shared no-op object and ``timed`` returns the function unchanged.
+"""
+import atexit
+import bisect
+import functools
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+log = logging.getLogger(__name__)
+
+# Kept free of wordapp/third-party imports: startup_profile uses it before a page's imports
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENABLED = os.environ.get("WORDAPP_METRICS", "1") != "0"
+METRICS_PATH = os.environ.get("WORDAPP_METRICS_FILE", os.path.join(ROOT_DIR, "state", "metrics.prom"))
+WRITE_SECONDS = float(os.environ.get("WORDAPP_METRICS_WRITE_SECONDS", 15))
+BUCKETS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+PROM_NAME = "wordapp_span_duration_seconds"
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    __slots__ = ("counts", "count", "sum", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)  # last bucket: above the largest bound
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, ms: float) -> None:
+        self.counts[bisect.bisect_left(BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.sum += ms
+        if ms > self.max:
+            self.max = ms
+
+    def quantile(self, q: float) -> float:
+        """Estimate from the buckets (linear within a bucket), in ms."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                lo = BUCKETS_MS[i - 1] if i else 0.0
+                hi = BUCKETS_MS[i] if i < len(BUCKETS_MS) else self.max
+                return min(lo + (hi - lo) * (rank - seen) / n, self.max)
+            seen += n
+        return self.max
+
+
+_hists: Dict[Tuple[str, LabelKey], Histogram] = {}
+_lock = threading.Lock()
+_writer: Optional[threading.Thread] = None
+
+
+def observe(name: str, ms: float, **labels: str) -> None:
+    """Add one duration (ms) to the histogram of (name, labels)."""
+    if not ENABLED:
+        return
+    key = (name, tuple(sorted((k, str(v)) for k, v in labels.items())))
+    with _lock:
+        hist = _hists.get(key)
+        if hist is None:
+            hist = _hists[key] = Histogram()
+            _start_writer()
+        hist.observe(ms)
+
+
+# -------------------------------------------------
+# Spans
+# -------------------------------------------------
+class _Span:
+    __slots__ = ("name", "labels", "start")
+
+    def __init__(self, name: str, labels: dict):
+        self.name = name
+        self.labels = labels
+
+    def label(self, **labels: str) -> None:
+        self.labels.update(labels)
+
+    def __enter__(self) -> "_Span":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        # Streamlit's stop/rerun are BaseExceptions: control flow, not errors
+        if exc_type is not None and issubclass(exc_type, Exception):
+            self.labels["error"] = exc_type.__name__
+        observe(self.name, (time.perf_counter() - self.start) * 1000, **self.labels)
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def label(self, **labels: str) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+def span(name: str, **labels: str):
+    """Context manager timing one span (a shared no-op when metrics are off)."""
+    return _Span(name, labels) if ENABLED else _NOOP
+
+
+def timed(name: str, **labels: str):
+    """Decorator form of span."""
+    def wrap(fn):
+        if not ENABLED:
+            return fn
+
+        @functools.wraps(fn)
+        def inner(*args, **kwargs):
+            with _Span(name, dict(labels)):
+                return fn(*args, **kwargs)
+
+        return inner
+
+    return wrap
+
+
+# -------------------------------------------------
+# Export
+# -------------------------------------------------
+def snapshot() -> List[dict]:
+    """Copy of every histogram: name, labels, count, sum_ms, max_ms, p50_ms, p95_ms, counts."""
+    with _lock:
+        return [
+            {"name": name, "labels": dict(labels), "count": h.count, "sum_ms": h.sum, "max_ms": h.max,
+             "p50_ms": h.quantile(0.5), "p95_ms": h.quantile(0.95), "counts": list(h.counts)}
+            for (name, labels), h in sorted(_hists.items())
+        ]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def prometheus_text() -> str:
+    """All histograms in the Prometheus text exposition format (seconds)."""
+    lines = [f"# HELP {PROM_NAME} Time spent in named spans of the app's hot path.",
+             f"# TYPE {PROM_NAME} histogram"]
+    for rec in snapshot():
+        labels = ",".join(f'{k}="{_escape(v)}"' for k, v in [("span", rec["name"]), *rec["labels"].items()])
+        cumulative = 0
+        for bound, n in zip((*BUCKETS_MS, None), rec["counts"]):
+            cumulative += n
+            le = "+Inf" if bound is None else repr(bound / 1000)
+            lines.append(f'{PROM_NAME}_bucket{{{labels},le="{le}"}} {cumulative}')
+        lines.append(f"{PROM_NAME}_sum{{{labels}}} {rec['sum_ms'] / 1000:.6f}")
+        lines.append(f"{PROM_NAME}_count{{{labels}}} {rec['count']}")
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(path: str = METRICS_PATH) -> None:
+    """Replace the text file atomically, so a scraper never reads half a file."""
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(prometheus_text())
+        os.replace(tmp, path)
+    except OSError as e:
+        log.warning("could not write %s: %s", path, e)
+
+
+def _run() -> None:
+    while True:
+        time.sleep(WRITE_SECONDS)
+        write_prometheus()
+
+
+def _start_writer() -> None:
+    """Start the file writer with the first histogram (caller holds _lock)."""
+    global _writer
+    if _writer is None:
+        _writer = threading.Thread(target=_run, name="wordapp-metrics", daemon=True)
+        _writer.start()
+        atexit.register(write_prometheus)
+
+
+def reset() -> None:
+    """Forget every histogram (the Metrics page's reset button)."""
+    with _lock:
+        _hists.clear()
@@ -0,0 +1,31 @@
+"""Compact per-session practice progress.
+
+Progress in a set is an int bitmask over word positions in that set
+(bit i set = the i-th word of the set is solved); the current question is a
+position and its options a tuple of word ids. Words, sentences and audio
+stay in the shared index/audio store and are looked up when rendering.
+"""
+from typing import List, Sequence
+
+NONE_OF_THE_ABOVE = -1  # option sentinel rendered as "None of the above"
+
+
+def full_mask(n: int) -> int:
+    return (1 << n) - 1
+
+
+def is_set(mask: int, pos: int) -> bool:
+    return (mask >> pos) & 1 == 1
+
+
+def with_bit(mask: int, pos: int) -> int:
+    return mask | (1 << pos)
+
+
+def popcount(mask: int) -> int:
+    return bin(mask).count("1")
+
+
+def option_labels(options: Sequence[int], words: Sequence[str]) -> List[str]:
+    """Radio labels for a tuple of option word ids (words: VocabIndex.words)."""
+    return [words[p] if p != NONE_OF_THE_ABOVE else "None of the above" for p in options]
@@ -0,0 +1,309 @@
+"""Vocabulary pre/post test: seeded per-student forms and cohort grading.
+
+The test follows README.md: 40 multiple-choice items over 20 words already
+covered (group A) and 20 words still to come (group B). Per group:
+
+    form_meaning  -- 8 items: a word, choose its meaning
+    meaning_form  -- 7 items: a meaning, choose the word
+    cloze         -- 5 items: a sentence with the word blanked out (the same
+                     masking as the Practice page), choose the word
+
+A ``Blueprint`` fixes the items (which word, which type, which four options)
+from the bank, the A/B sets and a seed, so the pre- and post-test ask the
+same things. Every student then gets a parallel form: the same items in a
+different order within each section and with the options shuffled, seeded by
+(seed, phase, student code) plus a server secret, so a form can be
+regenerated from the code alone and nothing per student has to be stored,
+but nobody without the secret can rebuild the forms from this source code.
+The secret is ``WORDAPP_TEST_SECRET``, else the teacher code.
+
+Responses come back as a CSV with a ``student`` column (2-3-15) and one
+column per question number (``1`` .. ``40`` or ``q1`` .. ``q40``) holding
+the letter circled (A-D, or 1-4). ``grade_responses`` regenerates every
+listed student's answer key and grades the whole cohort with array
+operations, giving per-student, per-item and per-class tables.
+"""
+import hashlib
+import os
+import re
+import zlib
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from wordapp.distractors import get_engine
+from wordapp.progress_store import class_of, normalize_token
+from wordapp.vocab_index import VocabIndex, bank_cache
+from wordapp.worksheets import cloze_text, submit_forms, zip_files
+
+GROUPS = ("A", "B")
+KINDS = {"form_meaning": 8, "meaning_form": 7, "cloze": 5}  # items per group
+SECTIONS = {
+    "form_meaning": "단어의 알맞은 뜻을 고르세요.",
+    "meaning_form": "뜻에 알맞은 단어를 고르세요.",
+    "cloze": "빈칸에 알맞은 단어를 고르세요.",
+}
+PHASES = ("pre", "post")
+OPTIONS = 4
+LETTERS = "ABCD"
+WORDS_PER_GROUP = sum(KINDS.values())
+
+_SECRET = os.environ.get("WORDAPP_TEST_SECRET") or os.environ.get("WORDAPP_TEACHER_CODE", "")
+SECRET = int.from_bytes(hashlib.sha256(_SECRET.encode("utf-8")).digest()[:8], "little")
+
+# README.md: 13 classes, 28-29 students each
+DEFAULT_ROSTER = {f"2-{c}": 29 if c <= 8 else 28 for c in range(1, 14)}
+
+
+class Blueprint(NamedTuple):
+    """The test's items in canonical order (A then B; by section within a group)."""
+    seed: int
+    words: Tuple[int, ...]  # word id per item
+    groups: Tuple[str, ...]
+    kinds: Tuple[str, ...]
+    options: Tuple[Tuple[int, ...], ...]  # word ids per item, the answer first
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+
+class Results(NamedTuple):
+    students: pd.DataFrame
+    items: pd.DataFrame
+    classes: pd.DataFrame
+
+
+# -------------------------------------------------
+# Blueprint
+# -------------------------------------------------
+def _distractors(index: VocabIndex, word_id: int, rng: np.random.Generator) -> Tuple[int, ...]:
+    """OPTIONS - 1 plausible wrong options with distinct words and meanings."""
+    target = index[word_id]
+    seen_words, seen_meanings = {target.answer}, {target.meaning}
+    picked: List[int] = []
+    ranked = list(get_engine(index).top(word_id, 8, "bank"))
+    rest = [int(i) for i in rng.permutation(len(index)) if i not in ranked]
+    for i in ranked + rest:
+        e = index[i]
+        if e.answer in seen_words or e.meaning in seen_meanings:
+            continue
+        picked.append(i)
+        seen_words.add(e.answer)
+        seen_meanings.add(e.meaning)
+        if len(picked) == OPTIONS - 1:
+            return tuple(picked)
+    raise ValueError("The bank has too few distinct words for four options")
+
+
+_blueprints: Dict[str, tuple] = {}
+MAX_BLUEPRINTS = 8  # per bank
+
+
+def build_blueprint(index: VocabIndex, a_sets: Tuple[str, ...], b_sets: Tuple[str, ...], seed: int) -> Blueprint:
+    """Pick WORDS_PER_GROUP words from each group's sets and lay out the items (cached per bank)."""
+    cache = bank_cache(_blueprints, index)
+    key = (a_sets, b_sets, seed)
+    bp = cache.get(key)
+    if bp is None:
+        bp = _make_blueprint(index, a_sets, b_sets, seed)
+        if len(cache) >= MAX_BLUEPRINTS:
+            cache.pop(next(iter(cache)), None)
+        cache[key] = bp
+    return bp
+
+
+def _make_blueprint(index: VocabIndex, a_sets: Tuple[str, ...], b_sets: Tuple[str, ...], seed: int) -> Blueprint:
+    words, groups, kinds, options = [], [], [], []
+    unmatched = set(index.unmatched)
+    seen = set()
+    for g, (group, sets) in enumerate(zip(GROUPS, (a_sets, b_sets))):
+        rng = np.random.default_rng([SECRET, seed, g])
+        pool = []
+        for s in sets:
+            for i in index.set_ids[s]:
+                if index[i].answer not in seen:  # a word repeated across sets (or groups) counts once
+                    seen.add(index[i].answer)
+                    pool.append(i)
+        if len(pool) < WORDS_PER_GROUP:
+            raise ValueError(f"Group {group} needs {WORDS_PER_GROUP} different words; its sets have {len(pool)}")
+        pool = [pool[i] for i in rng.permutation(len(pool))]
+        # cloze needs the word found in its sentence
+        cloze = [i for i in pool if i not in unmatched][:KINDS["cloze"]]
+        if len(cloze) < KINDS["cloze"]:
+            raise ValueError(f"Group {group} has too few words with a usable example sentence")
+        matching = [i for i in pool if i not in cloze][:WORDS_PER_GROUP - len(cloze)]
+        for kind, ids in (("form_meaning", matching[:KINDS["form_meaning"]]),
+                          ("meaning_form", matching[KINDS["form_meaning"]:]), ("cloze", cloze)):
+            for i in ids:
+                words.append(i)
+                groups.append(group)
+                kinds.append(kind)
+                options.append((i, *_distractors(index, i, rng)))
+    return Blueprint(seed, tuple(words), tuple(groups), tuple(kinds), tuple(options))
+
+
+def item_table(index: VocabIndex, bp: Blueprint) -> pd.DataFrame:
+    """One row per item: number, group, kind, word and options."""
+    return pd.DataFrame({
+        "item": np.arange(1, len(bp) + 1),
+        "group": bp.groups,
+        "kind": bp.kinds,
+        "word": [index.words[i] for i in bp.words],
+        "options": [" / ".join(index.words[i] for i in opts) for opts in bp.options],
+    })
+
+
+# -------------------------------------------------
+# Per-student forms
+# -------------------------------------------------
+def forms(bp: Blueprint, tokens: Sequence[str], phase: str) -> Tuple[np.ndarray, np.ndarray]:
+    """order (n, items): the item at each question number;
+    perm (n, items, OPTIONS): the canonical option shown at each letter."""
+    p = PHASES.index(phase)
+    kinds = np.asarray(bp.kinds)
+    sections = [np.flatnonzero(kinds == k) for k in KINDS]
+    order = np.empty((len(tokens), len(bp)), dtype=np.int16)
+    perm = np.empty((len(tokens), len(bp), OPTIONS), dtype=np.int8)
+    base = np.tile(np.arange(OPTIONS, dtype=np.int8), (len(bp), 1))
+    for s, token in enumerate(tokens):
+        rng = np.random.default_rng([SECRET, bp.seed, p, zlib.crc32(token.encode("utf-8"))])
+        order[s] = np.concatenate([rng.permutation(ids) for ids in sections])
+        perm[s] = rng.permuted(base, axis=1)
+    return order, perm
+
+
+def answer_keys(bp: Blueprint, tokens: Sequence[str], phase: str) -> pd.DataFrame:
+    """Correct letter per student (rows) and question number (columns 1..40)."""
+    order, perm = forms(bp, tokens, phase)
+    key = np.argmin(perm[np.arange(len(tokens))[:, None], order], axis=2)  # the letter showing option 0
+    out = pd.DataFrame(np.asarray(list(LETTERS))[key], columns=[str(i) for i in range(1, len(bp) + 1)])
+    out.insert(0, "student", list(tokens))
+    return out
+
+
+def response_template(tokens: Sequence[str], n_items: int) -> pd.DataFrame:
+    """Empty response sheet: one row per student, one column per question."""
+    out = pd.DataFrame("", index=range(len(tokens)), columns=[str(i) for i in range(1, n_items + 1)])
+    out.insert(0, "student", list(tokens))
+    return out
+
+
+def parse_roster(text: str) -> Dict[str, int]:
+    """'2-1: 29' per line (or '2-1 29', '2-1,29') -> {'2-1': 29}."""
+    roster = {}
+    for line in text.splitlines():
+        m = re.match(r"\s*([^\s:,]+)\s*[:,\s]\s*(\d+)\s*$", line)
+        if m:
+            roster[normalize_token(m.group(1))] = int(m.group(2))
+    return roster
+
+
+def roster_tokens(roster: Dict[str, int]) -> List[str]:
+    return [f"{c}-{n}" for c, size in roster.items() for n in range(1, size + 1)]
+
+
+def _form_items(index: VocabIndex, bp: Blueprint, order: np.ndarray, perm: np.ndarray) -> list:
+    items = []
+    for item in order:
+        entry = index[bp.words[item]]
+        shown = [index[bp.options[item][k]] for k in perm[item]]
+        kind = bp.kinds[item]
+        if kind == "form_meaning":
+            prompt, labels = entry.word, [e.meaning for e in shown]
+        elif kind == "meaning_form":
+            prompt, labels = entry.meaning, [e.word for e in shown]
+        else:
+            prompt, labels = cloze_text(entry), [e.word for e in shown]
+        items.append((SECTIONS[kind], prompt, labels))
+    return items
+
+
+def forms_pack_path(index: VocabIndex, bp: Blueprint, roster: Dict[str, int], phase: str, dataset: str) -> str:
+    """Zip with one PDF per class, every student's form on its own pages (classes render in parallel)."""
+    label = "Pre-test" if phase == "pre" else "Post-test"
+    members = []
+    for class_name, size in roster.items():
+        tokens = [f"{class_name}-{n}" for n in range(1, size + 1)]
+        order, perm = forms(bp, tokens, phase)
+        docs = [(f"{label}  ·  {t}", _form_items(index, bp, order[s], perm[s])) for s, t in enumerate(tokens)]
+        options = {"dataset": dataset, "blueprint": bp._asdict(), "phase": phase, "tokens": tokens}
+        path, future = submit_forms(options, f"{class_name} - Vocabulary {label}", docs)
+        members.append((f"{phase}-{class_name}.pdf", path, future))
+    return zip_files(members)
+
+
+# -------------------------------------------------
+# Grading
+# -------------------------------------------------
+_CODES = {**{c: i for i, c in enumerate(LETTERS)}, **{str(i + 1): i for i in range(OPTIONS)}}
+
+
+def _response_columns(df: pd.DataFrame, n_items: int) -> List[str]:
+    by_number = {}
+    for c in df.columns:
+        m = re.fullmatch(r"[qQ]?(\d+)", str(c).strip())
+        if m:
+            by_number[int(m.group(1))] = c
+    missing = [n for n in range(1, n_items + 1) if n not in by_number]
+    if missing:
+        raise ValueError(f"Response file has no column for question(s): {', '.join(map(str, missing[:5]))}")
+    return [by_number[n] for n in range(1, n_items + 1)]
+
+
+def grade_responses(bp: Blueprint, responses: pd.DataFrame, phase: str, index: VocabIndex) -> Results:
+    """Grade every row of a response sheet (student, 1..40) in one pass."""
+    if "student" not in responses.columns:
+        raise ValueError("Response file needs a 'student' column (e.g. 2-3-15)")
+    n_items = len(bp)
+    responses = responses.assign(student=responses["student"].astype(str).map(normalize_token))
+    responses = responses[responses["student"] != ""].drop_duplicates("student", keep="last")
+    tokens = responses["student"].tolist()
+    cols = _response_columns(responses, n_items)
+
+    # letters -> 0..3, anything else (blank, two circles) -> -1
+    cells = responses[cols].astype("string").stack(future_stack=True).str.strip().str.upper()
+    chosen = cells.map(_CODES).fillna(-1).to_numpy(dtype=np.int8).reshape(len(tokens), n_items)
+
+    order, perm = forms(bp, tokens, phase)
+    rows = np.arange(len(tokens))[:, None]
+    shown = perm[rows, order]  # (n, questions, letters)
+    canonical = np.where(chosen >= 0, np.take_along_axis(shown, np.maximum(chosen, 0)[:, :, None], 2)[:, :, 0], -1)
+    # back from question numbers to blueprint items
+    by_item = np.empty_like(canonical)
+    by_item[rows, order] = canonical
+    correct = (by_item == 0).astype(np.int16)
+
+    groups, kinds = np.asarray(bp.groups), np.asarray(bp.kinds)
+    students = pd.DataFrame({"student": tokens, "class_name": [class_of(t) for t in tokens]})
+    students["answered"] = (by_item >= 0).sum(axis=1)
+    students["score"] = correct.sum(axis=1)
+    for g in GROUPS:
+        students[g] = correct[:, groups == g].sum(axis=1)
+    for k in KINDS:
+        students[k] = correct[:, kinds == k].sum(axis=1)
+    students["pct"] = (students["score"] / n_items).round(3)
+
+    # item statistics: difficulty p, corrected item-total correlation, most chosen wrong option
+    total = correct.sum(axis=1, keepdims=True)
+    rest = (total - correct).astype(np.float64)
+    x = correct - correct.mean(axis=0)
+    r = rest - rest.mean(axis=0)
+    denom = np.sqrt((x ** 2).sum(axis=0) * (r ** 2).sum(axis=0))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        discrimination = np.where(denom > 0, (x * r).sum(axis=0) / denom, np.nan)
+    wrong = by_item > 0
+    counts = np.zeros((n_items, OPTIONS), dtype=np.int64)
+    np.add.at(counts, (np.broadcast_to(np.arange(n_items), by_item.shape)[wrong], by_item[wrong]), 1)
+    top = counts[:, 1:].argmax(axis=1) + 1
+    items = item_table(index, bp).drop(columns="options")
+    items["p"] = correct.mean(axis=0).round(3) if len(tokens) else np.nan
+    items["omitted"] = (by_item < 0).mean(axis=0).round(3) if len(tokens) else np.nan
+    items["discrimination"] = np.round(discrimination, 3)
+    items["top_distractor"] = [index.words[bp.options[i][k]] if counts[i, k] else "" for i, k in enumerate(top)]
+
+    classes = students.groupby("class_name").agg(
+        students=("student", "size"), mean=("score", "mean"), sd=("score", "std"),
+        A=("A", "mean"), B=("B", "mean"), pct=("pct", "mean"),
+    ).round(2)
+    return Results(students, items, classes)
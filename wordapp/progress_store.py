@@ -0,0 +1,168 @@
+"""Durable Practice progress keyed by a student token.
+
+Progress is one row per (token, set, mode) holding the solved bitmask, in a
+local SQLite database in WAL mode. Saves are write-behind: ``save()`` only
+records the latest value in memory (repeated saves of the same row coalesce)
+and a background thread writes everything pending in one transaction every
+``FLUSH_SECONDS``, so a class answering at once never waits on the disk.
+Resuming a session is one indexed read of the token's rows.
+
+A token is the student's class and number, e.g. ``2-3-15`` (class 2-3,
+student 15).
+"""
+import atexit
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from wordapp.audio_store import ROOT_DIR
+
+log = logging.getLogger(__name__)
+DEFAULT_DB_PATH = os.environ.get("WORDAPP_PROGRESS_DB", os.path.join(ROOT_DIR, "state", "progress.sqlite3"))
+FLUSH_SECONDS = float(os.environ.get("WORDAPP_PROGRESS_FLUSH_SECONDS", 0.5))
+
+TOKEN_RE = re.compile(r"[^0-9A-Za-z가-힣_-]+")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS progress (
+    token      TEXT    NOT NULL,
+    set_name   TEXT    NOT NULL,
+    mode       TEXT    NOT NULL,
+    solved     INTEGER NOT NULL,
+    updated_at REAL    NOT NULL,
+    PRIMARY KEY (token, set_name, mode)
+) WITHOUT ROWID
+"""
+
+UPSERT = """
+INSERT INTO progress (token, set_name, mode, solved, updated_at) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (token, set_name, mode) DO UPDATE SET solved = excluded.solved, updated_at = excluded.updated_at
+"""
+
+Key = Tuple[str, str]  # (set_name, mode)
+
+
+def normalize_token(raw: Optional[str]) -> str:
+    """'2-3-15 ', '2-3 15' -> '2-3-15'; empty when nothing usable is left."""
+    token = TOKEN_RE.sub("-", (raw or "").strip()).strip("-")
+    return token[:40]
+
+
+def class_of(token: str) -> str:
+    """Class part of a token: '2-3-15' -> '2-3' (the token itself if it has no number)."""
+    head, sep, _ = token.rpartition("-")
+    return head if sep and head else token
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+class ProgressStore:
+    """SQLite progress table with a coalescing write-behind queue."""
+
+    def __init__(self, path: str = DEFAULT_DB_PATH, flush_seconds: float = FLUSH_SECONDS):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.flush_seconds = flush_seconds
+        # Separate reader and writer connections: with WAL, resumes are not
+        # blocked by a flush in progress
+        self._write = _connect(path)
+        self._write.execute(SCHEMA)
+        self._write.commit()
+        self._write_lock = threading.Lock()
+        self._read = _connect(path)
+        self._read_lock = threading.Lock()
+        self._pending: Dict[Tuple[str, str, str], Tuple[int, float]] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()  # cuts the batching pause short on close
+        self._closed = False
+        self.writes = 0  # rows written
+        self.flushes = 0  # transactions
+        self._writer = threading.Thread(target=self._run, name="wordapp-progress", daemon=True)
+        self._writer.start()
+
+    # ---------------- Reads ----------------
+    def load(self, token: str) -> Dict[Key, int]:
+        """Every saved (set, mode) -> solved bitmask for token, pending saves included."""
+        with self._read_lock:
+            rows = self._read.execute(
+                "SELECT set_name, mode, solved FROM progress WHERE token = ?", (token,)
+            ).fetchall()
+        progress = {(s, m): solved for s, m, solved in rows}
+        with self._lock:
+            for (t, s, m), (solved, _) in self._pending.items():
+                if t == token:
+                    progress[(s, m)] = solved
+        return progress
+
+    # ---------------- Writes ----------------
+    def save(self, token: str, set_name: str, mode: str, solved: int) -> None:
+        """Queue the latest bitmask for (token, set, mode); returns immediately."""
+        with self._lock:
+            self._pending[(token, set_name, mode)] = (solved, time.time())
+        self._wake.set()
+
+    def flush(self) -> int:
+        """Write everything pending in one transaction; returns rows written."""
+        with self._lock:
+            batch, self._pending = self._pending, {}
+        if not batch:
+            return 0
+        rows = [(t, s, m, solved, ts) for (t, s, m), (solved, ts) in batch.items()]
+        try:
+            with self._write_lock, self._write:
+                self._write.executemany(UPSERT, rows)
+        except sqlite3.Error as e:
+            log.warning("flush failed, will retry: %s", e)
+            with self._lock:
+                for key, value in batch.items():
+                    self._pending.setdefault(key, value)
+            return 0
+        self.writes += len(rows)
+        self.flushes += 1
+        return len(rows)
+
+    def _run(self) -> None:
+        while not self._closed:
+            self._wake.wait()
+            # Let a burst of answers accumulate, then write it as one batch
+            self._stop.wait(self.flush_seconds)
+            self._wake.clear()
+            if not self._closed:
+                self.flush()
+
+    def close(self) -> None:
+        """Stop the writer and write what is still pending."""
+        self._closed = True
+        self._stop.set()
+        self._wake.set()
+        self._writer.join(timeout=self.flush_seconds + 5)
+        self.flush()
+        with self._write_lock:
+            self._write.close()
+        with self._read_lock:
+            self._read.close()
+
+
+_store: Optional[ProgressStore] = None
+_store_lock = threading.Lock()
+
+
+def get_progress_store() -> ProgressStore:
+    """Process-wide store shared by every session; flushed at exit."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ProgressStore()
+                atexit.register(_store.close)
+    return _store
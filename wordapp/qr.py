@@ -0,0 +1,158 @@
+"""QR codes for the Class apps page: crisp PNG/SVG and printable sheets.
+
+The module size is chosen for the target pixel size up front (a whole
+number of pixels per module, quiet zone included), so the code is drawn
+once at its final size with sharp edges instead of being drawn at
+``box_size=10`` and resized. Results are cached by
+(data, size, error-correction level, format).
+
+A sheet lays many codes out on A4 pages with a label under each (e.g. one
+link per class) and is returned as one PDF, ready to print.
+"""
+import io
+from functools import lru_cache
+from typing import List, Sequence, Tuple
+
+import qrcode
+from PIL import Image, ImageDraw, ImageFont
+
+EC_LEVELS = {
+    "L": qrcode.constants.ERROR_CORRECT_L,  # ~7% damage
+    "M": qrcode.constants.ERROR_CORRECT_M,  # ~15%
+    "Q": qrcode.constants.ERROR_CORRECT_Q,  # ~25%
+    "H": qrcode.constants.ERROR_CORRECT_H,  # ~30%
+}
+QUIET_ZONE = 4  # modules of white border required around the code
+
+# A4 at 200 dpi
+SHEET_DPI = 200
+SHEET_SIZE = (1654, 2339)
+SHEET_MARGIN = 100
+MIN_SHEET_CODE = 300  # ~3.8 cm printed
+CELL_GAP = 40  # white space between neighbouring codes
+# Widest grid whose cells still hold a MIN_SHEET_CODE code (4 on A4)
+MAX_SHEET_COLS = (SHEET_SIZE[0] - 2 * SHEET_MARGIN) // (MIN_SHEET_CODE + CELL_GAP)
+LABEL_H = 60
+
+
+@lru_cache(maxsize=256)
+def qr_matrix(data: str, ec: str = "L") -> Tuple[Tuple[bool, ...], ...]:
+    """Dark/light modules of the smallest QR version that fits data (no border)."""
+    qr = qrcode.QRCode(version=None, error_correction=EC_LEVELS[ec], border=0)
+    qr.add_data(data)
+    qr.make(fit=True)
+    return tuple(tuple(row) for row in qr.get_matrix())
+
+
+def module_size(modules: int, size: int) -> int:
+    """Pixels per module so the code plus quiet zone fits in size pixels."""
+    return max(1, size // (modules + 2 * QUIET_ZONE))
+
+
+def qr_image(data: str, size: int = 600, ec: str = "L") -> Image.Image:
+    """size x size image; the code is centered, drawn at a whole pixels-per-module."""
+    matrix = qr_matrix(data, ec)
+    n = len(matrix)
+    box = module_size(n, size)
+    # One pixel per module, then an exact integer upscale (no blurring)
+    small = Image.frombytes("L", (n, n), bytes(0 if dark else 255 for row in matrix for dark in row))
+    code = small.resize((n * box, n * box), Image.NEAREST)
+    img = Image.new("L", (size, size), 255)
+    offset = (size - n * box) // 2
+    img.paste(code, (offset, offset))
+    return img
+
+
+@lru_cache(maxsize=128)
+def qr_png(data: str, size: int = 600, ec: str = "L") -> bytes:
+    buf = io.BytesIO()
+    qr_image(data, size, ec).save(buf, format="PNG", optimize=True)
+    return buf.getvalue()
+
+
+@lru_cache(maxsize=128)
+def qr_svg(data: str, size: int = 600, ec: str = "L") -> bytes:
+    """Vector QR: one path in module units, scaled to size pixels."""
+    matrix = qr_matrix(data, ec)
+    total = len(matrix) + 2 * QUIET_ZONE
+    path = "".join(
+        f"M{x + QUIET_ZONE} {y + QUIET_ZONE}h1v1h-1z"
+        for y, row in enumerate(matrix) for x, dark in enumerate(row) if dark
+    )
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{size}" height="{size}" '
+        f'viewBox="0 0 {total} {total}" shape-rendering="crispEdges">'
+        f'<rect width="{total}" height="{total}" fill="#fff"/><path d="{path}" fill="#000"/></svg>'
+    ).encode("utf-8")
+
+
+# -------------------------------------------------
+# Printable sheets
+# -------------------------------------------------
+def parse_links(text: str) -> List[Tuple[str, str]]:
+    """Lines of 'label, url' (or just 'url') -> [(label, url)]."""
+    items = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        label, sep, url = line.partition(",")
+        if not sep or "://" in label:  # no label (commas inside a URL stay put)
+            label, url = line, line
+        items.append((label.strip() or url.strip(), url.strip()))
+    return items
+
+
+@lru_cache(maxsize=1)
+def _label_font(size: int = 36) -> ImageFont.ImageFont:
+    from wordapp.fonts import font_path  # Korean-capable font, resolved once
+
+    path = font_path()
+    return ImageFont.truetype(path, size) if path else ImageFont.load_default(size)
+
+
+def sheet_layout(n_items: int, cols: int) -> Tuple[int, List[Tuple[int, int]]]:
+    """(code size, top-left corner of each code on a page) for n_items codes in cols columns.
+
+    Codes shrink so everything fits on one page, down to MIN_SHEET_CODE
+    pixels (beyond that the sheet gets more pages), but never past their
+    cell: past MAX_SHEET_COLS a code is smaller than MIN_SHEET_CODE rather
+    than overlapping its neighbour.
+    """
+    width, height = SHEET_SIZE
+    cell_w = (width - 2 * SHEET_MARGIN) // cols
+    avail_h = height - 2 * SHEET_MARGIN
+    rows_needed = max(1, -(-n_items // cols))
+    code = min(cell_w - CELL_GAP, max(MIN_SHEET_CODE, avail_h // rows_needed - LABEL_H))
+    rows = max(1, avail_h // (code + LABEL_H))
+    return code, [(SHEET_MARGIN + c * cell_w + (cell_w - code) // 2, SHEET_MARGIN + r * (code + LABEL_H))
+                  for r in range(rows) for c in range(cols)]
+
+
+def qr_sheet_pages(items: Sequence[Tuple[str, str]], cols: int = 3, ec: str = "M") -> List[Image.Image]:
+    """A4 pages with a grid of labelled codes."""
+    font = _label_font()
+    code, slots = sheet_layout(len(items), cols)
+    per_page = len(slots)
+    pages = []
+    for start in range(0, len(items), per_page):
+        page = Image.new("L", SHEET_SIZE, 255)
+        draw = ImageDraw.Draw(page)
+        for (label, url), (x, y) in zip(items[start:start + per_page], slots):
+            page.paste(qr_image(url, code, ec), (x, y))
+            draw.text((x + code // 2, y + code + 8), label, fill=0, font=font, anchor="mt")
+        pages.append(page)
+    return pages
+
+
+def qr_sheet_pdf(items: Sequence[Tuple[str, str]], cols: int = 3, ec: str = "M") -> bytes:
+    """All pages of the sheet as one printable PDF."""
+    if not items:
+        raise ValueError("No links to put on the sheet.")
+    return pages_pdf(qr_sheet_pages(items, cols, ec))
+
+
+def pages_pdf(pages: Sequence[Image.Image]) -> bytes:
+    buf = io.BytesIO()
+    pages[0].save(buf, format="PDF", resolution=SHEET_DPI, save_all=True, append_images=pages[1:])
+    return buf.getvalue()
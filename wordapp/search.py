@@ -0,0 +1,159 @@
+"""Word bank search for the Wordlist page.
+
+Built once per vocabulary index over Word, Meaning, Sentence and
+Translation:
+
+- a sorted token list for prefix lookups (bisect), with Korean tokens
+  stored as jamo so a half-typed syllable still matches ("모ㄷ" -> "모두");
+- a sorted list of Korean tokens' initial consonants for chosung queries
+  ("ㅁㅈ" -> "문제");
+- a trigram -> entries map for matches inside a token ("point" in
+  "disappointed").
+
+Every term of a query must match. Results are ranked by where and how each
+term matched (Word > Meaning > Sentence/Translation; exact token > prefix >
+substring) and returned one page at a time.
+"""
+import bisect
+import re
+import threading
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+from wordapp.vocab_index import VocabIndex, bank_cache, get_index
+
+# Hangul syllables: 0xAC00 + (initial * 21 + medial) * 28 + final
+_INITIALS = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_MEDIALS = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+_FINALS = " ㄱㄲㄳㄴㄵㄶㄷㄹㄺㄻㄼㄽㄾㄿㅀㅁㅂㅄㅅㅆㅇㅈㅊㅋㅌㅍㅎ"
+_CHOSUNG_ONLY = re.compile(r"^[ㄱ-ㅎ]+$")
+TOKEN_RE = re.compile(r"[0-9a-z가-힣ㄱ-ㅣ']+")
+
+FIELDS = ("word", "meaning", "sentence", "translation")
+FIELD_WEIGHT = {"word": 8, "meaning": 4, "sentence": 1, "translation": 1}
+MATCH_WEIGHT = {"exact": 3, "prefix": 2, "substring": 1}
+
+
+def to_jamo(text: str) -> str:
+    """Split Hangul syllables into their letters: '문제' -> 'ㅁㅜㄴㅈㅔ'."""
+    out = []
+    for ch in text:
+        code = ord(ch) - 0xAC00
+        if 0 <= code < 11172:
+            out.append(_INITIALS[code // 588])
+            out.append(_MEDIALS[(code % 588) // 28])
+            if code % 28:
+                out.append(_FINALS[code % 28])
+        else:
+            out.append(ch)
+    return "".join(out)
+
+
+def to_chosung(text: str) -> str:
+    """Initial consonant of each Hangul syllable: '문제' -> 'ㅁㅈ'."""
+    return "".join(
+        _INITIALS[(ord(ch) - 0xAC00) // 588] if 0 <= ord(ch) - 0xAC00 < 11172 else ch for ch in text
+    )
+
+
+def tokens(text: str) -> List[str]:
+    return TOKEN_RE.findall(text.lower())
+
+
+def _trigrams(s: str) -> Set[str]:
+    return {s[i:i + 3] for i in range(len(s) - 2)}
+
+
+class Hit(NamedTuple):
+    word_id: int
+    score: int
+
+
+class SearchIndex:
+    """Prefix, chosung and trigram lookups over one VocabIndex."""
+
+    def __init__(self, index: VocabIndex):
+        self.index = index
+        prefix: List[Tuple[str, int, str, str]] = []  # (jamo key, id, field, token)
+        chosung: List[Tuple[str, int, str]] = []
+        self._grams: Dict[str, Set[Tuple[int, str]]] = {}
+        self._text: Dict[Tuple[int, str], str] = {}  # (id, field) -> jamo text
+        for e in index.entries:
+            for field in FIELDS:
+                value = getattr(e, field)
+                toks = tokens(value)
+                jamo_text = " ".join(to_jamo(t) for t in toks)
+                self._text[(e.id, field)] = jamo_text
+                for g in _trigrams(jamo_text):
+                    self._grams.setdefault(g, set()).add((e.id, field))
+                for t in toks:
+                    prefix.append((to_jamo(t), e.id, field, t))
+                    cho = to_chosung(t)
+                    if cho != t:
+                        chosung.append((cho, e.id, field))
+        prefix.sort()
+        chosung.sort()
+        self._prefix = prefix
+        self._prefix_keys = [p[0] for p in prefix]
+        self._chosung = chosung
+        self._chosung_keys = [c[0] for c in chosung]
+
+    # ---------------- one term ----------------
+    def _term(self, term: str) -> Dict[int, int]:
+        """word id -> best score for one query term."""
+        scores: Dict[int, int] = {}
+
+        def add(word_id: int, field: str, kind: str) -> None:
+            s = FIELD_WEIGHT[field] * MATCH_WEIGHT[kind]
+            if s > scores.get(word_id, 0):
+                scores[word_id] = s
+
+        if _CHOSUNG_ONLY.match(term):
+            lo = bisect.bisect_left(self._chosung_keys, term)
+            hi = bisect.bisect_left(self._chosung_keys, term + "￿")
+            for key, word_id, field in self._chosung[lo:hi]:
+                add(word_id, field, "exact" if key == term else "prefix")
+        key = to_jamo(term)
+        lo = bisect.bisect_left(self._prefix_keys, key)
+        hi = bisect.bisect_left(self._prefix_keys, key + "￿")
+        for tok_key, word_id, field, _ in self._prefix[lo:hi]:
+            add(word_id, field, "exact" if tok_key == key else "prefix")
+        if len(key) >= 3:
+            grams = _trigrams(key)
+            candidates = set.intersection(*(self._grams.get(g, set()) for g in grams))
+            for word_id, field in candidates:
+                if key in self._text[(word_id, field)]:
+                    add(word_id, field, "substring")
+        return scores
+
+    # ---------------- query ----------------
+    def search(self, query: str, page: int = 0, per_page: int = 10) -> Tuple[List[Hit], int]:
+        """One page of ranked hits and the total number of hits."""
+        terms = tokens(query)
+        if not terms:
+            return [], 0
+        total: Dict[int, int] = {}
+        for i, term in enumerate(terms):
+            scores = self._term(term)
+            if i == 0:
+                total = scores
+            else:
+                total = {w: total[w] + s for w, s in scores.items() if w in total}
+            if not total:
+                return [], 0
+        ranked = sorted(total.items(), key=lambda kv: (-kv[1], kv[0]))
+        start = page * per_page
+        return [Hit(w, s) for w, s in ranked[start:start + per_page]], len(ranked)
+
+
+_searches: Dict[str, tuple] = {}
+_lock = threading.Lock()
+
+
+def get_search_index(bank: Optional[str] = None) -> SearchIndex:
+    """Search index for one bank's vocabulary; rebuilt only when the data reloads."""
+    index = get_index(bank)
+    with _lock:
+        cached = bank_cache(_searches, index)
+        if "search" not in cached:
+            cached["search"] = SearchIndex(index)
+        return cached["search"]
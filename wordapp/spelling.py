@@ -0,0 +1,107 @@
+"""Fuzzy spelling grading for Practice 3 (listen and spell).
+
+An answer is compared with the target after ``normalize_answer`` (case,
+spaces and punctuation ignored, as before) and scored by the normalized
+edit distance, with an adjacent swap counted as one edit:
+
+    correct  -- same letters; spacing differences are flagged "word_boundary"
+    partial  -- normalized distance <= threshold: credit = 1 - distance
+    wrong    -- anything further away: credit 0
+
+Each answer also gets one error class, so a near miss can say what went
+wrong and a teacher can see which kinds of mistakes a class makes:
+
+    exact, word_boundary ("throwaway"), doubling ("ocasion", "untill"),
+    transposition ("recieve"), omission ("recive"), insertion ("gooad"),
+    substitution ("agrea"), blank, other (more than one edit)
+
+``grade_batch`` grades any number of (answer, target) pairs in one
+vectorized pass; ``regrade_events`` does that for every spelling answer in
+the research event log.
+"""
+import os
+import re
+from typing import NamedTuple, Sequence
+
+import numpy as np
+import pandas as pd
+
+from wordapp.edit_distance import levenshtein
+
+_RUNS = re.compile(r"(.)\1+")
+PARTIAL_THRESHOLD = float(os.environ.get("WORDAPP_SPELLING_THRESHOLD", 0.25))
+
+ERROR_TYPES = ("exact", "word_boundary", "doubling", "transposition", "omission", "insertion", "substitution",
+               "blank", "other")
+FEEDBACK = {
+    "word_boundary": "띄어쓰기를 확인하세요.",
+    "doubling": "겹글자(예: ll, ss, cc)를 확인하세요.",
+    "transposition": "두 글자의 순서가 바뀌었어요.",
+    "omission": "빠진 글자가 하나 있어요.",
+    "insertion": "필요 없는 글자가 하나 들어갔어요.",
+    "substitution": "한 글자가 달라요.",
+    "other": "여러 글자가 달라요.",
+    "blank": "답을 입력하세요.",
+}
+
+
+class Grade(NamedTuple):
+    correct: bool
+    credit: float  # 1.0 correct, (0, 1) partial, 0.0 wrong
+    distance: float  # normalized edit distance, 0.0 .. 1.0
+    error: str  # one of ERROR_TYPES
+
+
+def _letters(s: pd.Series) -> pd.Series:
+    return s.str.lower().str.replace(r"[^a-z0-9]+", "", regex=True)
+
+
+def _spaced(s: pd.Series) -> pd.Series:
+    return s.str.lower().str.replace(r"[^a-z0-9 ]+", "", regex=True).str.split().str.join(" ")
+
+
+def grade_batch(answers: Sequence[str], targets: Sequence[str], threshold: float = PARTIAL_THRESHOLD) -> pd.DataFrame:
+    """One row per (answer, target): correct, credit, distance, error."""
+    a = pd.Series(list(answers), dtype=object).fillna("").astype(str)
+    t = pd.Series(list(targets), dtype=object).fillna("").astype(str)
+    a_norm, t_norm = _letters(a), _letters(t)
+    la = a_norm.str.len().to_numpy()
+    lt = t_norm.str.len().to_numpy()
+    osa = levenshtein(a_norm.tolist(), t_norm.tolist(), transpositions=True)
+    lev = levenshtein(a_norm.tolist(), t_norm.tolist())
+    distance = osa / np.maximum(np.maximum(la, lt), 1)
+
+    exact = (a_norm == t_norm).to_numpy() & (la > 0)
+    # "occasion" and "ocasion" both collapse to "ocasion" (backreferences need re, not Arrow)
+    collapse = lambda s: _RUNS.sub(r"\1", s)  # noqa: E731
+    doubling = ~exact & (a_norm.map(collapse) == t_norm.map(collapse)).to_numpy()
+    one = osa == 1
+    error = np.select(
+        [exact & (_spaced(a) != _spaced(t)).to_numpy(), exact, la == 0, doubling,
+         one & (lev == 2), one & (la < lt), one & (la > lt), one],
+        ["word_boundary", "exact", "blank", "doubling", "transposition", "omission", "insertion", "substitution"],
+        default="other",
+    )
+    credit = np.where(exact, 1.0, np.where((la > 0) & (distance <= threshold), 1.0 - distance, 0.0))
+    return pd.DataFrame({
+        "answer": a, "target": t, "correct": exact, "credit": credit.round(3),
+        "distance": distance.round(3), "error": error,
+    })
+
+
+def grade(answer: str, target: str, threshold: float = PARTIAL_THRESHOLD) -> Grade:
+    """Grade one answer (the page's Check button)."""
+    row = grade_batch([answer], [target], threshold).iloc[0]
+    return Grade(bool(row.correct), float(row.credit), float(row.distance), str(row.error))
+
+
+def regrade_events(events: pd.DataFrame, threshold: float = PARTIAL_THRESHOLD) -> pd.DataFrame:
+    """Spelling answers from the event log with their grades (answers logged before
+    responses were recorded have no response and are left out)."""
+    if "response" not in events.columns:
+        return pd.DataFrame(columns=["class_name", "token", "word", "response", *Grade._fields])
+    rows = events[(events["event"] == "answer") & (events["mode"] == "spelling") & events["response"].notna()]
+    graded = grade_batch(rows["response"].tolist(), rows["word"].tolist(), threshold)
+    graded.index = rows.index
+    return pd.concat([rows[["class_name", "token", "word", "response"]],
+                      graded[["correct", "credit", "distance", "error"]]], axis=1)
@@ -0,0 +1,110 @@
+"""Cold-start profile of each page: import time and first-render time.
+
+Each page calls ``page_profile(name)`` before its own imports, ``.imported()``
+after them and ``.rendered()`` at the end. Only the first run of a page in a
+process is recorded -- that is the run that pays for loading pandas,
+wordcloud, etc. -- and appended as one JSON line to
+``state/startup.jsonl``, so a cold-start regression after a deploy shows up
+as a jump between lines.
+
+Every run, first or not, is also timed as the ``render`` span of
+``wordapp.metrics`` (run=cold for the first, warm after).
+
+    python bench/startup.py     # cold-start every page in a fresh process
+"""
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Dict, List, Optional
+
+from wordapp.metrics import ENABLED as METRICS_ENABLED, observe
+
+log = logging.getLogger(__name__)
+
+# Kept free of wordapp/third-party imports so it can run before a page's own imports
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROFILE_PATH = os.environ.get("WORDAPP_STARTUP_PROFILE", os.path.join(ROOT_DIR, "state", "startup.jsonl"))
+HEAVY_MODULES = ("pandas", "numpy", "pyarrow", "PIL", "qrcode", "wordcloud", "matplotlib", "gtts")
+
+_seen: Dict[str, bool] = {}
+_records: List[dict] = []
+_lock = threading.Lock()
+
+
+class _PageProfile:
+    __slots__ = ("page", "start", "import_ms", "loaded_before")
+
+    def __init__(self, page: str):
+        self.page = page
+        self.start = time.perf_counter()
+        self.import_ms = None
+        self.loaded_before = [m for m in HEAVY_MODULES if m in sys.modules]
+
+    def imported(self) -> None:
+        self.import_ms = (time.perf_counter() - self.start) * 1000
+
+    def rendered(self) -> None:
+        observe("render", (time.perf_counter() - self.start) * 1000, page=self.page, run="cold")
+        record = {
+            "ts": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "pid": os.getpid(),
+            "page": self.page,
+            "import_ms": round(self.import_ms or 0.0, 1),
+            "render_ms": round((time.perf_counter() - self.start) * 1000, 1),
+            # heavy modules this page was the first to load
+            "loaded": [m for m in HEAVY_MODULES if m in sys.modules and m not in self.loaded_before],
+        }
+        with _lock:
+            _records.append(record)
+        try:
+            os.makedirs(os.path.dirname(PROFILE_PATH), exist_ok=True)
+            with open(PROFILE_PATH, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        except OSError as e:
+            log.warning("could not write %s: %s", PROFILE_PATH, e)
+
+
+class _Rerun:
+    """Later runs: only the render span."""
+    __slots__ = ("page", "start")
+
+    def __init__(self, page: str):
+        self.page = page
+        self.start = time.perf_counter()
+
+    def imported(self) -> None:
+        pass
+
+    def rendered(self) -> None:
+        observe("render", (time.perf_counter() - self.start) * 1000, page=self.page, run="warm")
+
+
+class _Noop:
+    __slots__ = ()
+
+    def imported(self) -> None:
+        pass
+
+    def rendered(self) -> None:
+        pass
+
+
+_NOOP = _Noop()
+
+
+def page_profile(page: str):
+    """Profiler for this page's first run in the process; a render timer afterwards."""
+    with _lock:
+        if _seen.get(page):
+            return _Rerun(page) if METRICS_ENABLED else _NOOP
+        _seen[page] = True
+    return _PageProfile(page)
+
+
+def records(page: Optional[str] = None) -> List[dict]:
+    """First-run records of this process."""
+    with _lock:
+        return [r for r in _records if page is None or r["page"] == page]
@@ -0,0 +1,240 @@
+"""TTS backends behind one call signature, with timeouts and failover.
+
+Every backend is ``synthesize(text, lang, tld, slow) -> bytes`` (MP3):
+
+    GTTSBackend    -- Google TTS over the network (best voice)
+    EspeakBackend  -- espeak-ng on this machine, encoded with lame (offline,
+                      robotic but instant); see packages.txt
+    StubBackend    -- deterministic fake clips for tests and benchmarks
+
+``FailoverTTS`` puts a circuit breaker in front of the primary backend.
+Each call gets ``TTS_TIMEOUT`` seconds; a failed or timed-out call is
+answered by the local engine instead. When the error rate or the p95
+latency of the recent calls crosses its threshold the breaker opens and
+every call goes straight to the local engine for ``COOLDOWN_SECONDS``;
+then one probe call is let through to see whether the primary recovered.
+A student's page therefore never waits on Google longer than the timeout.
+
+Clips from the local engine are ``Clip`` objects with ``degraded=True``;
+the audio store keeps them apart from good clips, so a word is synthesized
+with the primary voice again once it is back.
+"""
+import logging
+import os
+import shutil
+import subprocess
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from typing import Optional
+
+from wordapp.metrics import observe
+
+log = logging.getLogger(__name__)
+TTS_TIMEOUT = float(os.environ.get("WORDAPP_TTS_TIMEOUT", 8))
+WINDOW = 50  # recent primary calls the breaker looks at
+MIN_CALLS = 10  # ... before it may open
+MAX_ERROR_RATE = 0.3
+MAX_P95_SECONDS = float(os.environ.get("WORDAPP_TTS_MAX_P95", 5))
+COOLDOWN_SECONDS = 30
+
+
+class TTSError(RuntimeError):
+    """Synthesis failed (backend error, timeout, or no backend available)."""
+
+
+class Clip(bytes):
+    """MP3 bytes tagged with the backend that produced them."""
+
+    backend = ""
+    degraded = False
+
+    @classmethod
+    def of(cls, data: bytes, backend: str, degraded: bool = False) -> "Clip":
+        clip = cls(data)
+        clip.backend = backend
+        clip.degraded = degraded
+        return clip
+
+
+# -------------------------------------------------
+# Backends
+# -------------------------------------------------
+class GTTSBackend:
+    name = "gtts"
+
+    def __init__(self, timeout: float = TTS_TIMEOUT):
+        self.timeout = timeout
+
+    def synthesize(self, text: str, lang: str = "en", tld: str = "com", slow: bool = False) -> bytes:
+        import io
+
+        from gtts import gTTS
+
+        buf = io.BytesIO()
+        gTTS(text=text, lang=lang, tld=tld or "com", slow=slow, timeout=self.timeout).write_to_fp(buf)
+        return buf.getvalue()
+
+
+# gTTS language (and English accent) -> espeak-ng voice
+ESPEAK_VOICES = {
+    ("en", "com"): "en-us", ("en", "co.uk"): "en-gb", "ko": "ko", "ja": "ja", "fr": "fr", "es": "es",
+    "ru": "ru", "zh-CN": "cmn",
+}
+
+
+class EspeakBackend:
+    name = "espeak"
+
+    def __init__(self, timeout: float = TTS_TIMEOUT):
+        self.timeout = timeout
+        self.espeak = shutil.which("espeak-ng") or shutil.which("espeak")
+        self.lame = shutil.which("lame")
+
+    @property
+    def available(self) -> bool:
+        return bool(self.espeak and self.lame)
+
+    def synthesize(self, text: str, lang: str = "en", tld: str = "com", slow: bool = False) -> bytes:
+        if not self.available:
+            raise TTSError("espeak-ng and lame are needed for offline speech")
+        voice = ESPEAK_VOICES.get((lang, tld or "com")) or ESPEAK_VOICES.get(lang, lang)
+        try:
+            wav = subprocess.run(
+                [self.espeak, "-v", voice, "-s", "120" if slow else "160", "--stdout", text],
+                capture_output=True, check=True, timeout=self.timeout,
+            ).stdout
+            return subprocess.run(
+                [self.lame, "--quiet", "-V", "6", "-", "-"],
+                input=wav, capture_output=True, check=True, timeout=self.timeout,
+            ).stdout
+        except (subprocess.SubprocessError, OSError) as e:
+            raise TTSError(f"espeak failed: {e}") from e
+
+
+class StubBackend:
+    """Deterministic fake MP3: the text repeated to just over 100 bytes (far smaller than a gTTS clip)."""
+
+    name = "stub"
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+
+    def synthesize(self, text: str, lang: str = "en", tld: str = "com", slow: bool = False) -> bytes:
+        if self.delay:
+            time.sleep(self.delay)
+        return b"ID3" + (text.encode("utf-8") * (1 + 100 // max(len(text), 1)))[: 100 * len(text)]
+
+
+# -------------------------------------------------
+# Circuit breaker
+# -------------------------------------------------
+class FailoverTTS:
+    """Primary backend with per-call timeouts, a circuit breaker and a local fallback."""
+
+    def __init__(self, primary, fallback=None, timeout: float = TTS_TIMEOUT, workers: int = 8):
+        self.primary = primary
+        self.fallback = fallback
+        self.timeout = timeout
+        # The primary runs on its own threads so a hung request only costs
+        # the caller `timeout` seconds
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tts-primary")
+        self._lock = threading.Lock()
+        self._recent: deque = deque(maxlen=WINDOW)  # (seconds, ok)
+        self._opened_at: Optional[float] = None
+        self._probing = False
+        self.primary_calls = 0
+        self.fallback_calls = 0
+        self.timeouts = 0
+        self.trips = 0
+
+    # ---------------- state ----------------
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            return "half-open" if time.monotonic() - self._opened_at >= COOLDOWN_SECONDS else "open"
+
+    def _allow_primary(self) -> bool:
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at >= COOLDOWN_SECONDS and not self._probing:
+                self._probing = True  # one probe at a time
+                return True
+            return False
+
+    def _record(self, seconds: float, ok: bool) -> None:
+        with self._lock:
+            if self._probing:
+                self._probing = False
+                if ok:
+                    self._opened_at = None
+                    self._recent.clear()
+                else:
+                    self._opened_at = time.monotonic()
+                return
+            self._recent.append((seconds, ok))
+            if self._opened_at is None and len(self._recent) >= MIN_CALLS and self._tripped():
+                self._opened_at = time.monotonic()
+                self.trips += 1
+                log.warning("%s circuit open; using %s for %ss", self.primary.name,
+                            self.fallback.name if self.fallback else "no fallback", COOLDOWN_SECONDS)
+
+    def _tripped(self) -> bool:
+        errors = sum(1 for _, ok in self._recent if not ok)
+        if errors / len(self._recent) > MAX_ERROR_RATE:
+            return True
+        latencies = sorted(s for s, _ in self._recent)
+        return latencies[int(0.95 * (len(latencies) - 1))] > MAX_P95_SECONDS
+
+    # ---------------- calls ----------------
+    def __call__(self, text: str, lang: str = "en", tld: str = "com", slow: bool = False) -> bytes:
+        return self.synthesize(text, lang, tld, slow)
+
+    def synthesize(self, text: str, lang: str = "en", tld: str = "com", slow: bool = False) -> bytes:
+        error: Optional[Exception] = None
+        if self._allow_primary():
+            self.primary_calls += 1
+            start = time.monotonic()
+            future = self._pool.submit(self.primary.synthesize, text, lang, tld, slow)
+            try:
+                data = future.result(timeout=self.timeout)
+                self._record(time.monotonic() - start, True)
+                observe("tts_backend", (time.monotonic() - start) * 1000, backend=self.primary.name, outcome="ok")
+                return Clip.of(data, self.primary.name)
+            except FutureTimeout:
+                self.timeouts += 1
+                error = TTSError(f"{self.primary.name} timed out after {self.timeout:.0f}s")
+                outcome = "timeout"
+            except Exception as e:
+                error = e
+                outcome = "error"
+            self._record(time.monotonic() - start, False)
+            observe("tts_backend", (time.monotonic() - start) * 1000, backend=self.primary.name, outcome=outcome)
+        if self.fallback is None:
+            raise error or TTSError(f"{self.primary.name} is unavailable (circuit open)")
+        self.fallback_calls += 1
+        start = time.monotonic()
+        try:
+            data = self.fallback.synthesize(text, lang, tld, slow)
+            observe("tts_backend", (time.monotonic() - start) * 1000, backend=self.fallback.name, outcome="ok")
+            return Clip.of(data, self.fallback.name, degraded=True)
+        except Exception as e:
+            raise TTSError(f"{self.primary.name} failed ({error or 'circuit open'}); fallback failed ({e})") from e
+
+
+def default_tts():
+    """Backend chosen by WORDAPP_TTS_BACKEND: 'gtts' (default), 'espeak' or 'stub'."""
+    choice = os.environ.get("WORDAPP_TTS_BACKEND", "gtts")
+    if choice == "stub":
+        return StubBackend().synthesize
+    local = EspeakBackend()
+    if choice == "espeak":
+        return local.synthesize
+    if not local.available:
+        log.warning("espeak-ng/lame not found; gTTS failures will not fail over")
+    return FailoverTTS(GTTSBackend(), local if local.available else None)
@@ -0,0 +1,181 @@
+"""Immutable, precompiled vocabulary index for the quiz hot path.
+
+The shared DataFrame from ``wordapp.data`` is compiled once into tuples of
+``WordEntry`` records with the masked/highlighted HTML and normalized answer
+already computed, so a Start or Check click is a couple of dict lookups
+instead of DataFrame filtering and regex work. Target spans come from one
+``PhraseMatcher`` pass over all sentences; rows whose word is not found in
+their own sentence are listed in ``VocabIndex.unmatched``.
+"""
+import logging
+import re
+import threading
+from typing import Dict, NamedTuple, Optional, Tuple
+
+import pandas as pd
+
+from wordapp.banks import DEFAULT_BANK, get_registry
+from wordapp.data import load_vocab
+from wordapp.matcher import PhraseMatcher, pick_spans, replace_spans
+from wordapp.metrics import span
+
+# -------------------------------------------------
+# Text utilities
+# -------------------------------------------------
+log = logging.getLogger(__name__)
+BLANK_HTML = "<span style='border-bottom:2px solid #222;'>&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;</span>"
+
+
+def highlight_html(text: str, color="orange") -> str:
+    return f"<span style='color:{color}; font-weight:bold'>{text}</span>"
+
+
+def normalize_answer(s: str) -> str:
+    """Lowercase and remove spaces/punctuation for robust matching."""
+    return re.sub(r"[^a-z0-9]+", "", s.lower())
+
+
+def set_sort_key(val) -> float:
+    """Order set names by their numeric part: set1, set2, ..., set10."""
+    m = re.search(r"\d+", str(val))
+    return int(m.group()) if m else float("inf")
+
+
+# -------------------------------------------------
+# Index
+# -------------------------------------------------
+class WordEntry(NamedTuple):
+    id: int
+    set_name: str
+    word: str
+    meaning: str
+    sentence: str
+    translation: str
+    masked_html: str
+    highlighted_html: str
+    answer: str  # normalize_answer(word)
+    hint: str = ""  # "single word", "idiom", ...
+
+
+class VocabIndex:
+    """Read-only lookup tables over one vocabulary bank."""
+
+    __slots__ = ("entries", "unmatched", "bank", "words", "set_names", "set_ids", "set_words", "set_labels",
+                 "_by_set_word", "_by_word", "__weakref__")
+
+    def __init__(self, entries: Tuple[WordEntry, ...], unmatched: Tuple[int, ...] = (), bank: str = ""):
+        self.entries = entries
+        self.bank = bank  # registry name; keys the caches derived from this index
+        self.unmatched = unmatched  # ids whose word was not found in its sentence
+        self.words: Tuple[str, ...] = tuple(e.word for e in entries)  # by id
+        set_ids: Dict[str, list] = {}
+        for e in entries:
+            set_ids.setdefault(e.set_name, []).append(e.id)
+        self.set_names: Tuple[str, ...] = tuple(sorted(set_ids, key=set_sort_key))
+        self.set_ids: Dict[str, Tuple[int, ...]] = {s: tuple(set_ids[s]) for s in self.set_names}
+        self.set_words: Dict[str, Tuple[str, ...]] = {
+            s: tuple(entries[i].word for i in ids) for s, ids in self.set_ids.items()
+        }
+        # Dropdown labels showing all words in each set
+        self.set_labels: Tuple[str, ...] = tuple(f"{s}: {', '.join(self.set_words[s])}" for s in self.set_names)
+        self._by_set_word = {(e.set_name, e.word): e.id for e in entries}
+        self._by_word: Dict[str, int] = {}
+        for e in entries:
+            self._by_word.setdefault(e.word, e.id)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __getitem__(self, word_id: int) -> WordEntry:
+        return self.entries[word_id]
+
+    def lookup(self, word: str, set_name: Optional[str] = None) -> WordEntry:
+        """Entry for word, preferring the given set when a word repeats."""
+        word_id = self._by_set_word.get((set_name, word))
+        if word_id is None:
+            word_id = self._by_word[word]
+        return self.entries[word_id]
+
+    def set_entries(self, set_name: str) -> Tuple[WordEntry, ...]:
+        return tuple(self.entries[i] for i in self.set_ids[set_name])
+
+
+def build_index(df: pd.DataFrame, bank: str = "") -> VocabIndex:
+    """Compile the vocabulary DataFrame (Set, Word, Meaning, Sentence, Translation[, Hint])."""
+    if "Hint" not in df.columns:
+        df = df.assign(Hint="")
+    rows = [
+        row for row in df[["Set", "Word", "Meaning", "Sentence", "Translation", "Hint"]].itertuples(index=False)
+        if not (pd.isna(row.Set) or pd.isna(row.Word))
+    ]
+    words = [str(row.Word).strip() for row in rows]
+    sentences = [str(row.Sentence).strip() for row in rows]
+    matches = PhraseMatcher(words).locate(sentences)
+
+    entries = []
+    unmatched = []
+    for i, row in enumerate(rows):
+        sentence = sentences[i]
+        spans = pick_spans(matches[i], i)
+        if spans:
+            masked = replace_spans(sentence, spans[:1], lambda _: BLANK_HTML)
+            highlighted = replace_spans(sentence, spans, highlight_html)
+        else:
+            unmatched.append(i)
+            masked = highlighted = sentence
+        entries.append(WordEntry(
+            id=i,
+            set_name=str(row.Set),
+            word=words[i],
+            meaning=str(row.Meaning),
+            sentence=sentence,
+            translation=str(row.Translation),
+            masked_html=masked,
+            highlighted_html=highlighted,
+            answer=normalize_answer(words[i]),
+            hint="" if pd.isna(row.Hint) else str(row.Hint),
+        ))
+    for i in unmatched:
+        log.warning("%s: '%s' not found in sentence: %s", entries[i].set_name, words[i], sentences[i])
+    return VocabIndex(tuple(entries), tuple(unmatched), bank)
+
+
+_derived_lock = threading.Lock()
+
+
+def _bank_slot(store: Dict[str, tuple], bank: str, source) -> dict:
+    """Dict kept in store under bank while source (its data) is the same object.
+
+    A reloaded bank starts an empty dict, and banks the registry dropped are
+    pruned, so nothing cached here keeps an evicted bank alive.
+    """
+    with _derived_lock:
+        cached = store.get(bank)
+        if cached is None or cached[0] is not source:
+            cached = (source, {})
+            store[bank] = cached
+            resident = set(get_registry().resident())
+            for other in [k for k in store if k not in resident and k != bank]:
+                del store[other]
+        return cached[1]
+
+
+def bank_cache(store: Dict[str, tuple], index: VocabIndex) -> dict:
+    """Dict for values derived from index (distractor matrices, decks, ...), under its bank's name."""
+    return _bank_slot(store, index.bank, index)
+
+
+_indexes: Dict[str, tuple] = {}
+_lock = threading.Lock()
+
+
+def get_index(bank: Optional[str] = None) -> VocabIndex:
+    """Index for one bank (default: the main word list); rebuilt only when its data reloads."""
+    name = bank or DEFAULT_BANK
+    df = load_vocab(name)
+    with _lock:
+        cached = _bank_slot(_indexes, name, df)
+        if "index" not in cached:
+            with span("index_build", bank=name):
+                cached["index"] = build_index(df, name)
+        return cached["index"]
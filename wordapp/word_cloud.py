@@ -0,0 +1,172 @@
+"""Cached word cloud rendering for the Class apps page.
+
+A cloud is rendered straight to PNG bytes (no matplotlib round trip) and
+cached by a hash of the text and every parameter, in memory and under
+``.cache/wordcloud``, so the same reading passage pasted in five classes is
+rendered once. The layout uses a fixed random state, so a cached image is
+exactly what a fresh render would give. The disk cache is bounded by
+``WORDAPP_CLOUD_CACHE_BYTES`` and pruned like the PDF cache
+(``wordapp.disk_cache``). Renders run in parallel; only requests for the
+same picture wait for each other.
+
+The font is the Korean-capable one from ``wordapp.fonts``, else
+wordcloud's bundled font (Latin only).
+
+Modes:
+    "text"  -- plain word frequencies of the text
+    "vocab" -- as "text", plus vocabulary words found in the text (any
+               inflection, multi-word phrases kept whole) counted
+               ``VOCAB_BOOST`` times extra, so the set's words stand out
+"""
+import hashlib
+import io
+import logging
+import os
+import re
+import tempfile
+import threading
+from collections import Counter, OrderedDict
+from functools import lru_cache
+from typing import Dict, Optional
+
+from wordapp import disk_cache
+from wordapp.audio_store import ROOT_DIR
+from wordapp.fonts import font_path
+
+log = logging.getLogger(__name__)
+CACHE_DIR = os.path.join(ROOT_DIR, ".cache", "wordcloud")
+MAX_MEMORY_BYTES = 32 * 1024 * 1024
+MAX_DISK_BYTES = int(os.environ.get("WORDAPP_CLOUD_CACHE_BYTES", 50 * 1024 * 1024))
+VOCAB_BOOST = 3
+RANDOM_STATE = 42
+
+WORD_RE = re.compile(r"\w[\w']+")
+
+
+def vocab_frequencies(text: str, boost: int = VOCAB_BOOST) -> Dict[str, float]:
+    """Counts of vocabulary phrases in text, weighted by boost."""
+    words = _vocab_words()
+    counts: Counter = Counter()
+    for m in _vocab_matcher(words).find_all(text):
+        counts[words[m.phrase_id]] += boost
+    return dict(counts)
+
+
+def _vocab_words() -> tuple:
+    from wordapp.vocab_index import get_index
+
+    return tuple(e.word for e in get_index().entries)
+
+
+@lru_cache(maxsize=4)
+def _vocab_matcher(words: tuple):
+    from wordapp.matcher import PhraseMatcher
+
+    return PhraseMatcher(words)
+
+
+@lru_cache(maxsize=4)
+def _vocab_digest(words: tuple) -> str:
+    return hashlib.sha256("\n".join(words).encode("utf-8")).hexdigest()
+
+
+def cloud_key(text: str, mode: str, width: int, height: int, background: str, max_words: int) -> str:
+    """Cache key over everything that changes the picture (vocab mode: the word list too)."""
+    parts = [text.strip(), mode, str(width), str(height), background, str(max_words), font_path() or ""]
+    if mode == "vocab":
+        parts.append(_vocab_digest(_vocab_words()))
+    return hashlib.sha256("\x00".join(parts).encode("utf-8")).hexdigest()
+
+
+def _render(text: str, mode: str, width: int, height: int, background: str, max_words: int) -> bytes:
+    from wordcloud import WordCloud
+
+    wc = WordCloud(
+        width=width, height=height, background_color=background, max_words=max_words,
+        font_path=font_path(), random_state=RANDOM_STATE, regexp=WORD_RE.pattern,
+    )
+    if mode == "vocab":
+        freqs = wc.process_text(text)
+        for phrase, count in vocab_frequencies(text).items():
+            freqs[phrase] = freqs.get(phrase, 0) + count
+        wc.generate_from_frequencies(freqs)
+    elif mode == "text":
+        wc.generate(text)
+    else:
+        raise ValueError(f"Unknown word cloud mode: {mode}")
+    buf = io.BytesIO()
+    wc.to_image().save(buf, format="PNG", optimize=True)
+    return buf.getvalue()
+
+
+_memory: "OrderedDict[str, bytes]" = OrderedDict()
+_memory_bytes = 0
+_lock = threading.Lock()  # guards _memory and _inflight
+_inflight: Dict[str, threading.Lock] = {}
+
+
+def _remember(key: str, png: bytes) -> None:
+    """Add to the in-memory LRU (caller holds _lock)."""
+    global _memory_bytes
+    _memory[key] = png
+    _memory_bytes += len(png)
+    while _memory_bytes > MAX_MEMORY_BYTES and len(_memory) > 1:
+        _, old = _memory.popitem(last=False)
+        _memory_bytes -= len(old)
+
+
+def wordcloud_png(text: str, mode: str = "text", width: int = 800, height: int = 400,
+                  background: str = "white", max_words: int = 200) -> bytes:
+    """PNG bytes of the cloud, rendered once per distinct text and parameters."""
+    key = cloud_key(text, mode, width, height, background, max_words)
+    png = _cached(key)
+    if png is not None:
+        return png
+    # Single-flight per picture: a second request for the same passage waits
+    # and then finds it cached; other passages render alongside
+    with _lock:
+        gate = _inflight.setdefault(key, threading.Lock())
+    with gate:
+        try:
+            png = _cached(key)
+            if png is None:
+                png = _render(text, mode, width, height, background, max_words)
+                _store(key, png)
+        finally:
+            with _lock:
+                _inflight.pop(key, None)
+    return png
+
+
+def _cached(key: str) -> Optional[bytes]:
+    """PNG from memory or disk, or None."""
+    with _lock:
+        png = _memory.get(key)
+        if png is not None:
+            _memory.move_to_end(key)
+            return png
+    path = os.path.join(CACHE_DIR, f"{key}.png")
+    try:
+        with open(path, "rb") as f:
+            png = f.read()
+    except FileNotFoundError:
+        return None
+    disk_cache.touch(path)
+    with _lock:
+        _remember(key, png)
+    return png
+
+
+def _store(key: str, png: bytes) -> None:
+    path = os.path.join(CACHE_DIR, f"{key}.png")
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(png)
+        os.replace(tmp, path)
+    except OSError as e:
+        log.warning("could not cache %s: %s", key, e)
+    with _lock:
+        _remember(key, png)
+    disk_cache.prune(CACHE_DIR, MAX_DISK_BYTES, (".png",))
@@ -0,0 +1,358 @@
+"""Printable PDFs built from the live word list.
+
+Kinds (one PDF per set):
+    "wordlist" -- Word, Meaning, Sentence, Translation as a table
+    "cloze"    -- each Sentence with its word blanked out, plus a word bank
+    "answers"  -- answer key for the cloze worksheet of the same seed
+
+Documents are rendered with fpdf2 in a small process pool (rendering is
+pure Python, so threads would queue on the GIL) and written straight to
+``.cache/pdf/<key>.pdf``, where the key is a hash of the dataset, the kind,
+the set and the options. The first request for a document renders it once;
+every later download is a file read. A class pack is a zip assembled on
+disk from the cached per-set files, so the render workers never hold the
+whole pack. Serving it does: ``st.download_button`` keeps its data in
+memory (a path or open file would be read whole as well), so pages hand
+it a callable that reads the file in a ``with`` block on a click, and the
+Streamlit process holds one pack per download until the browser has it.
+
+The cache is bounded by total bytes (``WORDAPP_PDF_CACHE_BYTES``) and
+pruned after every write by ``wordapp.disk_cache``: least recently used
+files go first, and files used in the last minute are kept, so a pack being
+zipped never loses a member.
+
+Test forms for the pre/post test (``wordapp.pretest``) are drawn here too:
+one PDF per class with each student's form starting on a new page.
+
+The body font is the Korean-capable font from ``wordapp.fonts``. Without
+one every meaning and translation would print as blanks, so rendering
+raises ``MissingFontError`` instead; pages check ``hangul_font_available``
+first and say what to install.
+"""
+import hashlib
+import json
+import logging
+import os
+import random
+import tempfile
+import threading
+import zipfile
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Optional, Sequence, Tuple
+
+from wordapp import disk_cache
+
+log = logging.getLogger(__name__)
+
+# Kept free of pandas/PIL imports: pool workers import this module to render
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.path.join(ROOT_DIR, ".cache", "pdf")
+PDF_WORKERS = int(os.environ.get("WORDAPP_PDF_WORKERS", 2))
+MAX_BYTES = int(os.environ.get("WORDAPP_PDF_CACHE_BYTES", 100 * 1024 * 1024))
+LAYOUT_VERSION = 1  # bump when the templates change, so cached files are redrawn
+
+KINDS = {"wordlist": "Word list", "cloze": "Cloze worksheet", "answers": "Answer key"}
+BLANK = "_" * 12
+
+Row = Tuple[str, str, str, str, str]  # word, meaning, sentence, translation, cloze
+
+
+# -------------------------------------------------
+# Rendering (runs in a pool worker)
+# -------------------------------------------------
+def _new_pdf(font: str, title: str):
+    from fpdf import FPDF
+
+    pdf = FPDF(format="A4")
+    pdf.set_margins(15, 15, 15)
+    pdf.set_auto_page_break(True, margin=15)
+    pdf.add_font("body", "", font, collection_font_number=0)
+    pdf.set_title(title)
+    pdf.add_page()
+    pdf.set_font("body", size=15)
+    pdf.cell(0, 9, title, new_x="LMARGIN", new_y="NEXT")
+    pdf.set_font("body", size=10)
+    return pdf
+
+
+def _name_line(pdf) -> None:
+    pdf.cell(0, 8, "Class: ________    No.: ______    Name: ____________________", new_x="LMARGIN", new_y="NEXT")
+    pdf.ln(2)
+
+
+def _wordlist(pdf, rows: Sequence[Row]) -> None:
+    from fpdf.fonts import FontFace
+
+    pdf.ln(2)
+    heading = FontFace(emphasis="", fill_color=(230, 230, 230))  # one face only: no bold
+    with pdf.table(col_widths=(28, 24, 66, 62), line_height=5.5, text_align="LEFT", headings_style=heading) as table:
+        table.row(("Word", "Meaning", "Sentence", "Translation"))
+        for word, meaning, sentence, translation, _ in rows:
+            table.row((word, meaning, sentence, translation))
+
+
+def _cloze(pdf, rows: Sequence[Row], bank: Sequence[str], hints: bool) -> None:
+    _name_line(pdf)
+    pdf.multi_cell(0, 6, "Word bank:  " + "   /   ".join(bank), border=1, padding=2, new_x="LMARGIN", new_y="NEXT")
+    pdf.ln(4)
+    for n, (_, _, _, translation, cloze) in enumerate(rows, 1):
+        pdf.multi_cell(0, 6, f"{n}. {cloze}", new_x="LMARGIN", new_y="NEXT")
+        if hints:
+            pdf.set_x(pdf.l_margin + 5)
+            pdf.multi_cell(0, 5, translation, new_x="LMARGIN", new_y="NEXT")
+        pdf.ln(2)
+
+
+def _answers(pdf, rows: Sequence[Row]) -> None:
+    pdf.ln(2)
+    for n, (word, meaning, sentence, _, _) in enumerate(rows, 1):
+        pdf.multi_cell(0, 6, f"{n}. {word} ({meaning})", new_x="LMARGIN", new_y="NEXT")
+        pdf.set_x(pdf.l_margin + 5)
+        pdf.multi_cell(0, 5, sentence, new_x="LMARGIN", new_y="NEXT")
+        pdf.ln(1)
+
+
+def render_pdf(kind: str, title: str, rows: Sequence[Row], font: str, path: str,
+               bank: Sequence[str] = (), hints: bool = False) -> str:
+    """Draw one document and write it to path atomically."""
+    pdf = _new_pdf(font, title)
+    if kind == "wordlist":
+        _wordlist(pdf, rows)
+    elif kind == "cloze":
+        _cloze(pdf, rows, bank, hints)
+    elif kind == "answers":
+        _answers(pdf, rows)
+    else:
+        raise ValueError(f"Unknown worksheet kind: {kind}")
+    return _write(pdf, path)
+
+
+def render_forms(title: str, forms: Sequence[Tuple[str, Sequence[Tuple[str, str, Sequence[str]]]]], font: str,
+                 path: str) -> str:
+    """One multiple-choice form per (heading, items); items are (section, prompt, options)."""
+    pdf = _new_pdf(font, title)
+    pdf.set_fill_color(230, 230, 230)  # section headings
+    for n_form, (heading, items) in enumerate(forms):
+        if n_form:
+            pdf.add_page()
+        pdf.set_font("body", size=12)
+        pdf.cell(0, 8, heading, new_x="LMARGIN", new_y="NEXT")
+        pdf.set_font("body", size=10)
+        _name_line(pdf)
+        section = None
+        for n, (item_section, prompt, options) in enumerate(items, 1):
+            if item_section != section:
+                section = item_section
+                pdf.ln(2)
+                pdf.multi_cell(0, 6, section, fill=True, new_x="LMARGIN", new_y="NEXT")
+                pdf.ln(1)
+            pdf.multi_cell(0, 6, f"{n}. {prompt}", new_x="LMARGIN", new_y="NEXT")
+            pdf.set_x(pdf.l_margin + 5)
+            pdf.multi_cell(0, 5, "    ".join(f"{'ABCD'[k]}) {o}" for k, o in enumerate(options)),
+                           new_x="LMARGIN", new_y="NEXT")
+            pdf.ln(1)
+    return _write(pdf, path)
+
+
+def _write(pdf, path: str) -> str:
+    """Write path atomically."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        pdf.output(f)
+    os.replace(tmp, path)
+    return path
+
+
+# -------------------------------------------------
+# Dataset -> rows, cache keys
+# -------------------------------------------------
+def cloze_text(entry) -> str:
+    """Plain-text sentence with the entry's word blanked out."""
+    from wordapp.vocab_index import BLANK_HTML
+
+    return entry.masked_html.replace(BLANK_HTML, BLANK)
+
+
+def _digest(index) -> str:
+    h = hashlib.sha256()
+    for e in index.entries:
+        h.update("\x1f".join((e.set_name, e.word, e.meaning, e.sentence, e.translation)).encode("utf-8"))
+        h.update(b"\x1e")
+    return h.hexdigest()
+
+
+_digests: Dict[str, tuple] = {}
+
+
+def dataset_digest(index) -> str:
+    """sha256 of the vocabulary contents; computed once per loaded index of each bank."""
+    from wordapp.vocab_index import bank_cache
+
+    cached = bank_cache(_digests, index)
+    if "digest" not in cached:
+        cached["digest"] = _digest(index)
+    return cached["digest"]
+
+
+class MissingFontError(RuntimeError):
+    """No Hangul-capable font on this host."""
+
+
+def hangul_font_available() -> bool:
+    from wordapp.fonts import font_path
+
+    return font_path() is not None
+
+
+def _font() -> str:
+    from wordapp.fonts import font_path
+
+    path = font_path()
+    if path is None:
+        raise MissingFontError("No Hangul-capable font found: install fonts-nanum or set WORDAPP_CLOUD_FONT.")
+    return path
+
+
+def _job(index, kind: str, set_name: str, seed: int, hints: bool) -> Tuple[str, dict]:
+    """(cache path, render_pdf kwargs) for one document."""
+    entries = list(index.set_entries(set_name))
+    if kind != "wordlist":
+        # cloze and answers share the order, so the numbers line up
+        random.Random(seed).shuffle(entries)
+    rows = [(e.word, e.meaning, e.sentence, e.translation, cloze_text(e)) for e in entries]
+    bank = sorted((e.word for e in entries), key=str.lower) if kind == "cloze" else ()
+    font = _font()
+    options = {"kind": kind, "set": set_name, "seed": seed if kind != "wordlist" else 0,
+               "hints": hints and kind == "cloze", "font": os.path.basename(font), "v": LAYOUT_VERSION}
+    key = hashlib.sha256((dataset_digest(index) + json.dumps(options, sort_keys=True)).encode()).hexdigest()[:32]
+    title = f"{set_name} - {KINDS[kind]}"
+    return os.path.join(CACHE_DIR, f"{key}.pdf"), dict(
+        kind=kind, title=title, rows=rows, font=font, bank=bank, hints=options["hints"],
+    )
+
+
+# -------------------------------------------------
+# Pool + single-flight
+# -------------------------------------------------
+_pool: Optional[ProcessPoolExecutor] = None
+_inflight: Dict[str, Future] = {}
+_lock = threading.Lock()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        import multiprocessing
+
+        # spawn: the server process is multi-threaded, so don't fork it
+        _pool = ProcessPoolExecutor(max_workers=PDF_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+    return _pool
+
+
+def _submit(path: str, kwargs: dict, fn=render_pdf) -> Future:
+    """Future for the file at path, rendering it with fn unless cached or already rendering."""
+    global _pool
+    with _lock:
+        future = _inflight.get(path)
+        if future is not None:
+            return future
+        if disk_cache.touch(path):
+            future = Future()
+            future.set_result(path)
+            return future
+        try:
+            future = _get_pool().submit(fn, path=path, **kwargs)
+        except BrokenProcessPool:
+            log.warning("worker pool broke; restarting it")
+            _pool = None
+            future = _get_pool().submit(fn, path=path, **kwargs)
+        _inflight[path] = future
+
+    def _done(_):
+        with _lock:
+            _inflight.pop(path, None)
+        prune()
+
+    future.add_done_callback(_done)
+    return future
+
+
+def worksheet_path(kind: str, set_name: str, seed: int = 0, hints: bool = False, index=None) -> str:
+    """Cached PDF of one document for one set (rendered on first request)."""
+    if index is None:
+        from wordapp.vocab_index import get_index
+
+        index = get_index()
+    return _submit(*_job(index, kind, set_name, seed, hints)).result()
+
+
+def submit_forms(options: dict, title: str, forms) -> Tuple[str, Future]:
+    """(cache path, future) for a render_forms document; options must identify its contents."""
+    font = _font()
+    options = dict(options, font=os.path.basename(font), v=LAYOUT_VERSION)
+    key = hashlib.sha256(json.dumps(options, sort_keys=True).encode()).hexdigest()[:32]
+    path = os.path.join(CACHE_DIR, f"forms-{key}.pdf")
+    return path, _submit(path, dict(title=title, forms=forms, font=font), render_forms)
+
+
+def pack_path(kinds: Sequence[str], set_names: Optional[Sequence[str]] = None, seed: int = 0,
+              hints: bool = False, index=None) -> str:
+    """Zip of every (set, kind) document; the PDFs render in parallel."""
+    if index is None:
+        from wordapp.vocab_index import get_index
+
+        index = get_index()
+    set_names = list(set_names or index.set_names)
+    jobs = [(s, k, *_job(index, k, s, seed, hints)) for s in set_names for k in kinds]
+    return zip_files([(f"{s}-{k}.pdf", path, _submit(path, kwargs)) for s, k, path, kwargs in jobs])
+
+
+def zip_files(members: Sequence[Tuple[str, str, Future]]) -> str:
+    """Cached zip of (name in zip, cache path, future rendering it) members."""
+    key = hashlib.sha256("|".join(path for _, path, _ in members).encode()).hexdigest()[:32]
+    zip_path = os.path.join(CACHE_DIR, f"pack-{key}.zip")
+    if disk_cache.touch(zip_path):
+        return zip_path
+    for _, _, future in members:
+        future.result()
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+    with os.fdopen(fd, "wb") as f, zipfile.ZipFile(f, "w", zipfile.ZIP_STORED) as zf:
+        for arcname, path, _ in members:
+            zf.write(path, arcname)  # copied from disk in chunks
+    os.replace(tmp, zip_path)
+    prune()
+    return zip_path
+
+
+# -------------------------------------------------
+# Reading and eviction
+# -------------------------------------------------
+def read_cached(path: str) -> bytes:
+    """Bytes of a cached file, for st.download_button(data=lambda: ...)."""
+    disk_cache.touch(path)
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def prune(max_bytes: int = MAX_BYTES) -> None:
+    """Delete least recently used PDFs/zips until the cache fits in max_bytes."""
+    disk_cache.prune(CACHE_DIR, max_bytes, (".pdf", ".zip"))
+
+
+def worksheet_bytes(kind: str, set_name: str, seed: int = 0, hints: bool = False,
+                    bank: Optional[str] = None) -> bytes:
+    """One document's bytes (rendered on first request)."""
+    from wordapp.vocab_index import get_index
+
+    return read_cached(worksheet_path(kind, set_name, seed, hints, get_index(bank)))
+
+
+def pack_bytes(kinds: Sequence[str], set_names: Optional[Sequence[str]] = None, seed: int = 0, hints: bool = False,
+               bank: Optional[str] = None) -> bytes:
+    """The whole zip in memory: download_button cannot stream a file."""
+    from wordapp.vocab_index import get_index
+
+    return read_cached(pack_path(kinds, set_names, seed, hints, get_index(bank)))